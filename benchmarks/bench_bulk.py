@@ -0,0 +1,38 @@
+"""
+Creating many instances: calling the constructor for every dict or row vs. the batch
+constructors from_dicts and from_rows.
+
+Run with:
+    python -m benchmarks.bench_bulk
+"""
+import timeit
+
+from typedpy import Structure, Integer, String, Float, Boolean
+
+
+class Record(Structure):
+    _required = ['id', 'name']
+    id = Integer
+    name = String
+    price = Float
+    active = Boolean
+
+
+def run(count=100000):
+    rows = [(i, 'record{}'.format(i), i * 1.5, i % 2 == 0) for i in range(count)]
+    columns = list(Record._fields)
+    dicts = [dict(zip(columns, row)) for row in rows]
+    timings = [
+        ('dicts: one by one', lambda: [Record(**d) for d in dicts]),
+        ('dicts: from_dicts', lambda: Record.from_dicts(dicts)),
+        ('rows: one by one', lambda: [Record(**dict(zip(columns, row))) for row in rows]),
+        ('rows: from_rows', lambda: Record.from_rows(rows)),
+    ]
+    for title, func in timings:
+        assert func() == [Record(**d) for d in dicts]
+        elapsed = min(timeit.repeat(func, number=1, repeat=7))
+        print('{:<20} {:6.2f} us per instance'.format(title, elapsed / count * 1e6))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,53 @@
+"""
+Cost of rejecting invalid values: assignment, which raises an exception, vs.
+Field.check, which returns a ValidationFailure.
+
+Run with:
+    python -m benchmarks.bench_check
+"""
+import timeit
+
+from typedpy import Structure, Integer, String, Array, AnyOf, NotField, PositiveInt
+
+
+class Record(Structure):
+    _required = []
+    quantity = Integer(minimum=0, maximum=100)
+    code = String(maxLength=8, pattern='[A-Z]+$')
+    counts = Array[PositiveInt]
+    key = AnyOf[Integer(maximum=10), String(maxLength=3)]
+    other = NotField[String]
+
+
+CASES = [
+    ('Integer', 'quantity', 500),
+    ('String', 'code', 'abc'),
+    ('Array', 'counts', [1, 2, 3, 0]),
+    ('AnyOf', 'key', 20),
+    ('NotField', 'other', 'x'),
+]
+
+
+def run(number=100000):
+    record = Record()
+    for title, name, value in CASES:
+        field = getattr(Record, name)
+
+        def assign():
+            try:
+                setattr(record, name, value)
+            except (TypeError, ValueError):
+                pass
+
+        def check():
+            field.check(value)
+
+        before = timeit.timeit(assign, number=number)
+        after = timeit.timeit(check, number=number)
+        print('{:<10} assignment: {:6.2f} us/value   check: {:6.2f} us/value'
+              '   speedup: {:.2f}x'.format(title, before / number * 1e6, after / number * 1e6,
+                                           before / after))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,50 @@
+"""
+Memory per instance of a 12-field structure, in the regular mode, in which every instance
+has a __dict__, vs. the compact mode, in which the fields are stored in slots.
+Also, the time of creating an instance and of reading a field in both modes.
+
+Run with:
+    python -m benchmarks.bench_compact
+"""
+import timeit
+import tracemalloc
+
+from typedpy import Structure, Integer, String, Float, Boolean
+
+
+def fields():
+    types = [Integer, String, Float, Boolean]
+    return [('f{}'.format(i), types[i % 4]()) for i in range(12)]
+
+
+Regular = type('Regular', (Structure,), dict(fields()))
+
+Compact = type('Compact', (Structure,), dict([('_compact', True)] + fields()))
+
+VALUES = [1, 'abc', 2.5, True]
+
+KWARGS = dict(('f{}'.format(i), VALUES[i % 4]) for i in range(12))
+
+
+def bytes_per_instance(cls, count=100000):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [cls(**KWARGS) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list that holds the instances is not part of their cost
+    return (after - before) / len(instances) - 8
+
+
+def run(number=100000):
+    for cls in (Regular, Compact):
+        instance = cls(**KWARGS)
+        create = timeit.timeit(lambda: cls(**KWARGS), number=number)
+        read = timeit.timeit(lambda: instance.f5, number=number)
+        print('{:<8} bytes per instance: {:6.0f}   create: {:6.2f} us   read a field: '
+              '{:5.3f} us'.format(cls.__name__, bytes_per_instance(cls),
+                                  create / number * 1e6, read / number * 1e6))
+
+
+if __name__ == '__main__':
+    run()
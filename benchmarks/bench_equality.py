@@ -0,0 +1,59 @@
+"""
+Cost of comparing structures: the field-wise __eq__ vs. comparing their str(), which is
+how structures used to be compared. Also, the peak memory of both for a structure with a
+large array.
+
+Run with:
+    python -m benchmarks.bench_equality
+"""
+import timeit
+import tracemalloc
+
+from typedpy import Structure, Integer, String, Float, Array
+
+
+class Leaf(Structure):
+    id = Integer
+    name = String
+    price = Float
+
+
+class Node(Structure):
+    _required = []
+    leaf = Leaf
+    values = Array[Float]
+    children = Array[Leaf]
+
+
+def make(count):
+    return Node(leaf=Leaf(id=1, name='leaf', price=1.5),
+                values=[i * 0.5 for i in range(count)],
+                children=[Leaf(id=i, name='leaf{}'.format(i), price=i * 1.5)
+                          for i in range(count // 10)])
+
+
+def str_eq(first, second):
+    return str(first) == str(second)
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run():
+    for count, number in [(10, 20000), (100000, 5)]:
+        first, second = make(count), make(count)
+        assert first == second and str_eq(first, second)
+        before = timeit.timeit(lambda: str_eq(first, second), number=number) / number
+        after = timeit.timeit(lambda: first == second, number=number) / number
+        print('{:>6} values   str(): {:10.2f} us {:7.2f}MB   field-wise: {:10.2f} us {:7.2f}MB'
+              .format(count, before * 1e6, peak_memory(lambda: str_eq(first, second)) / 1e6,
+                      after * 1e6, peak_memory(lambda: first == second) / 1e6))
+
+
+if __name__ == '__main__':
+    run()
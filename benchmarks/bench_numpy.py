@@ -0,0 +1,33 @@
+"""
+Time of assigning a numerical array to a field, as a list vs. as a NumPy array, which is
+validated with vectorized operations and is not copied. Requires NumPy.
+
+Run with:
+    python -m benchmarks.bench_numpy
+"""
+import timeit
+
+import numpy
+
+from typedpy import Structure, Integer, Float, Array
+
+
+class Series(Structure):
+    counts = Array(items=Integer(minimum=0, maximum=10 ** 6), uniqueItems=True)
+    values = Array(items=Float(minimum=0.0, maximum=1.0))
+
+
+def run(count=100000):
+    counts = numpy.arange(count)
+    values = numpy.linspace(0.0, 1.0, count)
+    count_list, value_list = counts.tolist(), values.tolist()
+    before = min(timeit.repeat(lambda: Series(counts=count_list, values=value_list),
+                               number=5, repeat=3))
+    after = min(timeit.repeat(lambda: Series(counts=counts, values=values),
+                              number=5, repeat=3))
+    print('{} elements   lists: {:6.2f}ms   NumPy arrays: {:6.2f}ms'.format(
+        count, before / 5 * 1e3, after / 5 * 1e3))
+
+
+if __name__ == '__main__':
+    run()
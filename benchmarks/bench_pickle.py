@@ -0,0 +1,48 @@
+"""
+Size and time of pickling structures: the compact format, which holds the values of the
+fields in the order of declaration, and is restored without validation, vs. the default
+format, which holds the __dict__ of every instance, and is restored by assigning it.
+
+Run with:
+    python -m benchmarks.bench_pickle
+"""
+import pickle
+import timeit
+
+from typedpy import Structure, Integer, String, Float, Boolean, Array, Map
+
+
+class Record(Structure):
+    _required = ['id', 'name']
+    id = Integer
+    name = String
+    price = Float
+    active = Boolean
+    tags = Array[String]
+    counts = Map[String, Integer]
+
+
+class DefaultRecord(Record):
+    __reduce__ = object.__reduce__
+
+
+def make(cls, count):
+    return [cls(id=i, name='record{}'.format(i), price=i * 1.5, active=True,
+                tags=['a', 'b'], counts={'x': i}) for i in range(count)]
+
+
+def run(count=10000, number=5):
+    print('{} records'.format(count))
+    for title, records in [('default', make(DefaultRecord, count)),
+                           ('compact', make(Record, count))]:
+        payload = pickle.dumps(records, pickle.HIGHEST_PROTOCOL)
+        dumps = min(timeit.repeat(lambda: pickle.dumps(records, pickle.HIGHEST_PROTOCOL),
+                                  number=number, repeat=3)) / number
+        loads = min(timeit.repeat(lambda: pickle.loads(payload), number=number,
+                                  repeat=3)) / number
+        print('{:<8} size: {:9d} bytes   dumps: {:7.2f} ms   loads: {:7.2f} ms'.format(
+            title, len(payload), dumps * 1e3, loads * 1e3))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,104 @@
+"""
+Cost of serializing deep and wide structures: the per-class serialization plan vs.
+the generic walk that inspects the type of every value.
+Also, time and peak memory of writing JSON with serialize_to_json vs.
+json.dump(serialize(...)).
+
+Run with:
+    python -m benchmarks.bench_serialize
+"""
+import io
+import json
+import timeit
+import tracemalloc
+
+from typedpy import Structure, Integer, String, Float, Boolean, Array, Map, serialize, \
+    serialize_to_json
+
+
+class Leaf(Structure):
+    id = Integer
+    name = String
+    price = Float
+    active = Boolean
+
+
+class Node(Structure):
+    _required = []
+    leaf = Leaf
+    children = Array[Leaf]
+    tags = Map[String, Integer]
+
+
+Wide = type('Wide', (Structure,), dict(
+    [('_required', [])] +
+    [('f{}'.format(i), [Integer, String, Float][i % 3]()) for i in range(50)]))
+
+
+def generic_serialize_val(val):
+    if isinstance(val, (int, str, bool, float)) or val is None:
+        return val
+    if isinstance(val, list):
+        return [generic_serialize_val(i) for i in val]
+    return generic_serialize(val)
+
+
+def generic_serialize(structure):
+    items = structure.items() if isinstance(structure, dict) else structure.__dict__.items()
+    return dict([(key, generic_serialize_val(val)) for key, val in items if val is not None])
+
+
+def make_deep():
+    leaves = [Leaf(id=i, name='leaf{}'.format(i), price=i * 1.5, active=i % 2 == 0)
+              for i in range(20)]
+    return Node(leaf=leaves[0], children=leaves, tags=dict(('t{}'.format(i), i)
+                                                          for i in range(20)))
+
+
+def make_wide():
+    values = [1, 'abc', 2.5]
+    return Wide(**dict(('f{}'.format(i), values[i % 3]) for i in range(50)))
+
+
+def run(number=5000):
+    for title, instance in [('deep', make_deep()), ('wide', make_wide())]:
+        assert serialize(instance) == generic_serialize(instance)
+        before = timeit.timeit(lambda: generic_serialize(instance), number=number)
+        after = timeit.timeit(lambda: serialize(instance), number=number)
+        print('{:<6} generic: {:7.2f} us   plan: {:7.2f} us   speedup: {:.2f}x'.format(
+            title, before / number * 1e6, after / number * 1e6, before / after))
+
+
+class NullFile(io.TextIOBase):
+    def write(self, s):
+        return len(s)
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run_json(number=5000):
+    big = Node(children=[Leaf(id=i, name='leaf{}'.format(i), price=i * 1.5, active=True)
+                         for i in range(100000)])
+    for title, instance, times in [('deep', make_deep(), number), ('wide', make_wide(), number),
+                                   ('big', big, 5)]:
+        before = min(timeit.repeat(lambda: json.dumps(serialize(instance)), number=times,
+                                   repeat=3)) / times
+        after = min(timeit.repeat(lambda: serialize_to_json(instance), number=times,
+                                  repeat=3)) / times
+        print('{:<6} dumps(serialize): {:9.2f} us   serialize_to_json: {:9.2f} us'.format(
+            title, before * 1e6, after * 1e6))
+    print('big    peak memory writing to a file: json.dump(serialize): {:.1f}MB'
+          '   serialize_to_json: {:.1f}MB'.format(
+              peak_memory(lambda: json.dump(serialize(big), NullFile())) / 1e6,
+              peak_memory(lambda: serialize_to_json(big, NullFile())) / 1e6))
+
+
+if __name__ == '__main__':
+    run()
+    run_json()
@@ -0,0 +1,55 @@
+"""
+Memory and aggregation time of a StructureArray vs. a list of instances of a flat structure.
+
+Run with:
+    python -m benchmarks.bench_structure_array
+"""
+import timeit
+import tracemalloc
+
+from typedpy import Structure, Integer, Float, Boolean, Enum, StructureArray
+
+
+class Trade(Structure):
+    id = Integer
+    price = Float
+    size = Integer
+    active = Boolean
+    side = Enum(values=['buy', 'sell'])
+
+
+def make_dicts(count):
+    return [dict(id=i, price=i * 0.5, size=i % 100, active=i % 2 == 0,
+                 side=['buy', 'sell'][i % 2]) for i in range(count)]
+
+
+def allocated(func):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def column_sum(column):
+    # a NumPy column is summed with a vectorized reduction. The builtin sum() would box
+    # every element, and would be no faster than going over the instances.
+    return column.sum() if hasattr(column, 'sum') else sum(column)
+
+
+def run(count=200000):
+    dicts = make_dicts(count)
+    instances, list_bytes = allocated(lambda: Trade.from_dicts(dicts))
+    trades, array_bytes = allocated(lambda: StructureArray[Trade](dicts))
+    assert trades.to_structures() == instances
+    print('bytes per element   list of instances: {:6.1f}   StructureArray: {:6.1f}'.format(
+        list_bytes / count, array_bytes / count))
+    before = min(timeit.repeat(lambda: sum(trade.size for trade in instances), number=5))
+    after = min(timeit.repeat(lambda: column_sum(trades.column('size')), number=5))
+    print('sum of a column     list of instances: {:6.2f}ms   StructureArray: {:6.2f}ms'.format(
+        before / 5 * 1e3, after / 5 * 1e3))
+
+
+if __name__ == '__main__':
+    run()
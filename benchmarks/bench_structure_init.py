@@ -0,0 +1,47 @@
+"""
+Per-instance cost of constructing small structures: the generated constructor vs.
+the generic constructor that binds the arguments using the signature of the class.
+
+Run with:
+    python -m benchmarks.bench_structure_init
+"""
+import timeit
+
+from typedpy import Structure, Integer, String, Float, Boolean
+
+
+class Message(Structure):
+    _required = ['id', 'name']
+    id = Integer
+    name = String
+    price = Float
+    active = Boolean
+
+
+class ExtendedMessage(Message):
+    quantity = Integer(minimum=0)
+
+
+def generic_init(cls, **kwargs):
+    instance = cls.__new__(cls)
+    Structure.__init__(instance, **kwargs)
+    return instance
+
+
+def run(number=100000):
+    kwargs = dict(id=1, name='abc', price=1.5, active=True)
+    extended_kwargs = dict(kwargs, quantity=3)
+    cases = [
+        ('Message', Message, kwargs),
+        ('ExtendedMessage', ExtendedMessage, extended_kwargs),
+    ]
+    for title, cls, args in cases:
+        before = timeit.timeit(lambda: generic_init(cls, **args), number=number)
+        after = timeit.timeit(lambda: cls(**args), number=number)
+        print('{:<16} generic: {:6.2f} us/instance   generated: {:6.2f} us/instance'
+              '   speedup: {:.2f}x'.format(title, before / number * 1e6, after / number * 1e6,
+                                           before / after))
+
+
+if __name__ == '__main__':
+    run()
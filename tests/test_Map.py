@@ -187,3 +187,57 @@ def test_invalid_key_type():
         class Foo(Structure):
             a = Map[Map, Integer]
     assert "Key field of type <class 'dict'> is not hashable" in str(excinfo.value)
+
+
+def test_setitem_keeps_same_dict():
+    e = Example(e={})
+    content = e.e
+    for i in range(1000):
+        e.e[str(i)] = i
+    assert e.e is content
+    assert len(e.e) == 1000
+
+
+def test_update_err_keeps_content():
+    e = Example(a={1: 'a', 2: 'b', 3: 'c'})
+    with raises(TypeError) as excinfo:
+        e.a.update({4: 'd', 5: 6})
+    assert "a_value: Expected a string" in str(excinfo.value)
+    assert e.a == {1: 'a', 2: 'b', 3: 'c'}
+
+
+def test_update_max_items_err():
+    e = Example(a={1: 'a', 2: 'b', 3: 'c'})
+    e.a.update({1: 'x', 4: 'd'})
+    with raises(ValueError) as excinfo:
+        e.a.update({5: 'e', 6: 'f'})
+    assert "a: Expected length of at most 5" in str(excinfo.value)
+    assert e.a == {1: 'x', 2: 'b', 3: 'c', 4: 'd'}
+
+
+def test_delete_min_items_err():
+    e = Example(a={1: 'a', 2: 'b', 3: 'c'})
+    for update in (lambda a: a.__delitem__(1), lambda a: a.pop(1), lambda a: a.popitem(),
+                   lambda a: a.clear()):
+        with raises(ValueError) as excinfo:
+            update(e.a)
+        assert "a: Expected length of at least 3" in str(excinfo.value)
+    assert list(e.a.items()) == [(1, 'a'), (2, 'b'), (3, 'c')]
+
+
+def test_pop_and_setdefault():
+    e = Example(e={'x': 1, 'y': 2})
+    assert e.e.pop('x') == 1
+    assert e.e.pop('x', 5) == 5
+    assert e.e.popitem() == ('y', 2)
+    assert e.e.setdefault('z', 3) == 3
+    with raises(TypeError) as excinfo:
+        e.e.setdefault('w', 'a')
+    assert "e_value: Expected a number" in str(excinfo.value)
+    assert e.e == {'z': 3}
+
+
+def test_delete_missing_key_err():
+    e = Example(e={'x': 1})
+    with raises(KeyError):
+        del e.e['y']
@@ -90,3 +90,93 @@ def test_invalid_type():
         class Foo(Structure):
             a = Set[Map]
     assert "Set element of type <class 'dict'> is not hashable" in str(excinfo.value)
+
+
+def test_add_keeps_same_set():
+    e = Example(f=set())
+    content = e.f
+    for i in range(1000):
+        e.f.add(i)
+    assert e.f is content
+    assert e.f == set(range(1000))
+
+
+def test_add_err():
+    e = Example(f={1, 2})
+    with raises(TypeError) as excinfo:
+        e.f.add('x')
+    assert "f: Expected <class 'int'>" in str(excinfo.value)
+    assert e.f == {1, 2}
+
+
+def test_update_max_items_err():
+    e = Example(b={1, 2, 3})
+    e.b.update([3, 4])
+    with raises(ValueError) as excinfo:
+        e.b |= {5, 6}
+    assert "b: Expected length of at most 5" in str(excinfo.value)
+    assert e.b == {1, 2, 3, 4}
+
+
+def test_update_item_err():
+    e = Example(b={1, 2, 3})
+    with raises(ValueError) as excinfo:
+        e.b.update({4, 50})
+    assert "b: Expected a maxmimum of 10" in str(excinfo.value)
+    assert e.b == {1, 2, 3}
+
+
+def test_remove_min_items_err():
+    e = Example(b={1, 2, 3})
+    for update in (lambda b: b.remove(1), lambda b: b.discard(1), lambda b: b.pop(),
+                   lambda b: b.clear(), lambda b: b.intersection_update({1})):
+        with raises(ValueError) as excinfo:
+            update(e.b)
+        assert "b: Expected length of at least 3" in str(excinfo.value)
+    e.b.discard(7)
+    assert e.b == {1, 2, 3}
+
+
+def test_remove_missing_err():
+    e = Example(f={1})
+    with raises(KeyError):
+        e.f.remove(2)
+
+
+def test_symmetric_difference_update():
+    e = Example(f={1, 2})
+    e.f ^= {2, 3}
+    assert e.f == {1, 3}
+    with raises(TypeError):
+        e.f ^= {'a'}
+    assert e.f == {1, 3}
+
+
+def test_frozenset_is_kept():
+    content = frozenset([1, 2, 3])
+    e = Example(f=content)
+    assert e.f is content
+
+
+def test_frozenset_is_validated():
+    with raises(ValueError) as excinfo:
+        Example(b=frozenset([1, 2, 30]))
+    assert "b: Expected a maxmimum of 10" in str(excinfo.value)
+    with raises(ValueError) as excinfo:
+        Example(b=frozenset([1, 2]))
+    assert "b: Expected length of at least 3" in str(excinfo.value)
+
+
+def test_nested_set_update_is_validated():
+    class Foo(Structure):
+        a = Map[String, Set[Integer]]
+
+    foo = Foo(a={'x': {1}})
+    foo.a['x'].add(2)
+    with raises(TypeError):
+        foo.a['x'].add('y')
+    assert foo.a == {'x': {1, 2}}
+
+
+def test_str():
+    assert str(Example(f={1})) == '<Instance of Example. Properties: f = {1}>'
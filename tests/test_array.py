@@ -188,3 +188,191 @@ def test_array_of_array_type_err2():
 def test_array_of_array_valid():
     assert  Example(h = [[1,2], [3,4]]).h[1] == [3,4]
 
+
+
+class UniqueExample(Structure):
+    _required = []
+    a = Array(uniqueItems=True)
+
+
+def _legacy_has_duplicates(values):
+    unique = []
+    for x in values:
+        if x not in unique:
+            unique.append(x)
+    return len(unique) < len(values)
+
+
+def test_unique_items_numeric_equality_err():
+    for values in ([1, 1.0], [True, 1], [0, False], [2.0, 3, 2]):
+        with raises(ValueError) as excinfo:
+            UniqueExample(a=values)
+        assert "a: Expected unique items" in str(excinfo.value)
+
+
+def test_unique_items_unhashable_duplicates_err():
+    for values in ([[1, 2], [1, 2]], [{'x': [1]}, {'x': [1]}], [{1, 2}, {2, 1}],
+                   [Foo(s='a'), Foo(s='a')], [[1, {'a': 1}], [1.0, {'a': True}]]):
+        with raises(ValueError) as excinfo:
+            UniqueExample(a=values)
+        assert "a: Expected unique items" in str(excinfo.value)
+
+
+def test_unique_items_unhashable_valid():
+    values = [[1, 2], [2, 1], (1, 2), {'x': 1}, {'x': 2}, {1, 2}, Foo(s='a'), Foo(s='b'), 'x']
+    assert UniqueExample(a=values).a == values
+
+
+def test_unique_items_matches_equality_semantics():
+    from collections import OrderedDict
+    samples = [
+        [1, 'a', [1], (1,), {1}, frozenset([1]), {'a': 1}],
+        [OrderedDict([('a', 1), ('b', 2)]), {'b': 2, 'a': 1}],
+        [OrderedDict([('a', 1), ('b', 2)]), OrderedDict([('b', 2), ('a', 1)])],
+        [[OrderedDict([('a', 1)])], [{'a': 1}]],
+        [float('nan'), float('nan')],
+        [(1, [2]), (1, [2.0])],
+        [[1, 2], [1, 2, 3]],
+    ]
+    for values in samples:
+        expected_err = _legacy_has_duplicates(values)
+        if expected_err:
+            with raises(ValueError):
+                UniqueExample(a=values)
+        else:
+            UniqueExample(a=values)
+
+
+def test_unique_items_large_array():
+    values = list(range(50000))
+    assert len(UniqueExample(a=values).a) == 50000
+    with raises(ValueError):
+        UniqueExample(a=values + [49999.0])
+
+
+def test_unique_items_after_mutating_an_element():
+    example = UniqueExample(a=[[1], [2]])
+    example.a.append([3])
+    example.a[0].append(5)
+    example.a.append([1])
+    with raises(ValueError):
+        example.a.append([1, 5])
+    foos = UniqueExample(a=[Foo(s='a'), Foo(s='b')])
+    foos.a.append(Foo(s='x'))
+    foos.a[0].s = 'c'
+    foos.a.append(Foo(s='a'))
+    with raises(ValueError):
+        foos.a.append(Foo(s='c'))
+    assert foos.a == [Foo(s='c'), Foo(s='b'), Foo(s='x'), Foo(s='a')]
+
+
+class Mutated(Structure):
+    _required = []
+    u = Array(items=Integer, uniqueItems=True, maxItems=5)
+    p = Array(items=[Integer, String])
+    w = Array(uniqueItems=True)
+
+
+def test_append_keeps_same_list():
+    e = Example(f=[])
+    content = e.f
+    for i in range(1000):
+        e.f.append(i)
+    assert e.f is content
+    assert e.f == list(range(1000))
+
+
+def test_append_unique_err():
+    m = Mutated(u=[1, 2])
+    with raises(ValueError) as excinfo:
+        m.u.append(2.0)
+    assert "u: Expected unique items" in str(excinfo.value)
+    assert m.u == [1, 2]
+
+
+def test_extend_with_duplicates_err():
+    m = Mutated(u=[1, 2])
+    with raises(ValueError) as excinfo:
+        m.u.extend([3, 3])
+    assert "u: Expected unique items" in str(excinfo.value)
+    assert m.u == [1, 2]
+
+
+def test_setitem_unique():
+    m = Mutated(u=[1, 2, 3])
+    m.u[0] = 1
+    m.u[0] = 4
+    with raises(ValueError):
+        m.u[1] = 3
+    m.u.append(1)
+    assert m.u == [4, 2, 3, 1]
+
+
+def test_remove_then_append_unique():
+    m = Mutated(u=[1, 2, 3])
+    m.u.remove(2)
+    m.u.append(2)
+    del m.u[0]
+    m.u.insert(0, 1)
+    assert m.u == [1, 3, 2]
+
+
+def test_unique_items_unhashable_append():
+    m = Mutated(w=[[1], {'a': 1}])
+    with raises(ValueError):
+        m.w.append([1])
+    m.w.append([2])
+    assert m.w == [[1], {'a': 1}, [2]]
+
+
+def test_extend_max_items_err():
+    m = Mutated(u=[1, 2, 3])
+    with raises(ValueError) as excinfo:
+        m.u.extend([4, 5, 6])
+    assert "u: Expected length of at most 5" in str(excinfo.value)
+    assert m.u == [1, 2, 3]
+
+
+def test_slice_assignment_err():
+    e = Example(b=[1, 2, 3])
+    with raises(TypeError) as excinfo:
+        e.b[1:2] = [4, 'x']
+    assert "b_2: Expected a number" in str(excinfo.value)
+    assert e.b == [1, 2, 3]
+    e.b[1:2] = [4, 5]
+    assert e.b == [1, 4, 5, 3]
+
+
+def test_clear_min_items_err():
+    e = Example(b=[1, 2, 3])
+    with raises(ValueError) as excinfo:
+        e.b.clear()
+    assert "b: Expected length of at least 3" in str(excinfo.value)
+    assert e.b == [1, 2, 3]
+
+
+def test_positional_items_update():
+    m = Mutated(p=[1, 'a'])
+    m.p.append(3.5)
+    with raises(TypeError) as excinfo:
+        m.p[1] = 2
+    assert "p_1: Expected a string" in str(excinfo.value)
+    with raises(TypeError) as excinfo:
+        m.p.insert(0, 'b')
+    assert "p_0: Expected <class 'int'>" in str(excinfo.value)
+    assert m.p == [1, 'a', 3.5]
+
+
+def test_sort_of_positional_items_err():
+    m = Mutated(p=[5, 'a', 3])
+    with raises(TypeError):
+        m.p.sort(key=str)
+    assert m.p == [5, 'a', 3]
+
+
+def test_sort_and_reverse():
+    e = Example(f=[3, 1, 2])
+    e.f.sort()
+    assert e.f == [1, 2, 3]
+    e.f.reverse()
+    assert e.f == [3, 2, 1]
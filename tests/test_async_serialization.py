@@ -0,0 +1,174 @@
+import asyncio
+
+from pytest import raises
+
+from typedpy import Structure, Integer, String, Array, Map, StructureReference, \
+    adeserialize, adeserialize_stream, RejectedItem
+
+
+class Bar(Structure):
+    x = Integer
+
+
+class Foo(Structure):
+    a = Integer
+    b = String
+    c = Array[Integer]
+    bars = Array[Bar]
+    m = Map[String, Bar]
+    emb = StructureReference(y=Integer)
+    _required = ['a']
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def collect(generator):
+    return [item async for item in generator]
+
+
+def stream_reader(content, loop):
+    reader = asyncio.StreamReader(loop=loop)
+    reader.feed_data(content)
+    reader.feed_eof()
+    return reader
+
+
+async def chunked(content, size):
+    for i in range(0, len(content), size):
+        await asyncio.sleep(0)
+        yield content[i:i + size]
+
+
+def test_adeserialize_dict_and_json():
+    source = {'a': 1, 'c': list(range(25)), 'bars': [{'x': i} for i in range(25)],
+              'm': dict(('k{}'.format(i), {'x': i}) for i in range(25)), 'emb': {'y': 2}}
+    foo = run(adeserialize(Foo, source, slice_size=10))
+    assert foo.c == list(range(25))
+    assert foo.bars[24] == Bar(x=24)
+    assert foo.m['k3'] == Bar(x=3)
+    assert foo.emb.y == 2
+    assert run(adeserialize(Foo, b'{"a": 1, "c": [1, 2]}')) == Foo(a=1, c=[1, 2])
+
+
+def test_adeserialize_reports_element_index():
+    with raises(TypeError) as excinfo:
+        run(adeserialize(Foo, {'a': 1, 'c': list(range(25)) + ['bad']}, slice_size=10))
+    assert "c_25: Expected <class 'int'>" in str(excinfo.value)
+
+
+def test_adeserialize_yields_between_slices():
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0)
+        before = len(ticks)
+        foo = await adeserialize(Foo, {'a': 1, 'c': list(range(100))}, slice_size=10)
+        task.cancel()
+        return foo, len(ticks) - before
+
+    foo, ticked = run(main())
+    assert len(foo.c) == 100
+    assert ticked >= 9
+
+
+def test_adeserialize_validates_map_in_slices():
+    validated = []
+    progress = []
+
+    class Counted(Integer):
+        def _validate(self, value, name):
+            validated.append(value)
+            return super()._validate(value, name)
+
+    class Counts(Structure):
+        m = Map[String, Counted]
+
+    async def ticker():
+        while True:
+            progress.append(len(validated))
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0)
+        counts = await adeserialize(
+            Counts, {'m': dict(('k{}'.format(i), i) for i in range(100))}, slice_size=10)
+        task.cancel()
+        return counts
+
+    counts = run(main())
+    assert counts.m['k99'] == 99
+    # every entry is validated once, in slices between which other tasks run
+    assert len(validated) == 100
+    assert any(0 < done < 100 for done in progress)
+    entries = [('k{}'.format(i), i) for i in range(25)] + [('bad', 'x')]
+    with raises(TypeError) as excinfo:
+        run(adeserialize(Counts, {'m': dict(entries)}, slice_size=10))
+    assert "m_value: Expected <class 'int'>" in str(excinfo.value)
+
+
+def test_adeserialize_utf8_bom():
+    bom = '\ufeff'.encode('utf-8')
+    assert run(adeserialize(Foo, bom + b'{"a": 1}')) == Foo(a=1)
+    for content in (b'[{"a": 1}, {"a": 2}]', b'{"a": 1}\n{"a": 2}\n'):
+        foos = run(collect(adeserialize_stream(Foo, chunked(bom + content, 2))))
+        assert [foo.a for foo in foos] == [1, 2]
+
+
+def test_adeserialize_stream_lines_from_stream_reader():
+    async def main():
+        reader = stream_reader(b'{"a": 1, "b": "x"}\n\n{"a": 2}', asyncio.get_event_loop())
+        return await collect(adeserialize_stream(Foo, reader, chunk_size=5))
+
+    assert [foo.a for foo in run(main())] == [1, 2]
+
+
+def test_adeserialize_stream_lines_in_a_single_read():
+    async def main():
+        reader = stream_reader(b'{"a": 1}\n{"a": 2}\n{"a": 3}', asyncio.get_event_loop())
+        return await collect(adeserialize_stream(Foo, reader))
+
+    assert [foo.a for foo in run(main())] == [1, 2, 3]
+
+
+def test_adeserialize_stream_array_in_chunks():
+    content = ' [{"a": 1, "b": "éé"}, {"a": 2}, {"a": 3}] '.encode('utf-8')
+    for size in (1, 2, 7, 100):
+        foos = run(collect(adeserialize_stream(Foo, chunked(content, size))))
+        assert [foo.a for foo in foos] == [1, 2, 3]
+        assert foos[0].b == 'éé'
+
+
+def test_adeserialize_stream_errors():
+    content = '[{"a": 1}, {"a": "bad"}, {"a": 3}]'
+    with raises(TypeError) as excinfo:
+        run(collect(adeserialize_stream(Foo, chunked(content, 4))))
+    assert "element 1: a: Expected <class 'int'>" in str(excinfo.value)
+
+    rejected = []
+    foos = run(collect(adeserialize_stream(Foo, chunked(content, 4), errors='collect',
+                                           rejected=rejected)))
+    assert [foo.a for foo in foos] == [1, 3]
+    assert rejected[0].position == 1
+    assert isinstance(rejected[0], RejectedItem)
+
+    lines = '{"a": 1}\nnot json\n{"a": 3}\n'
+    foos = run(collect(adeserialize_stream(Foo, chunked(lines, 3), errors='skip')))
+    assert [foo.a for foo in foos] == [1, 3]
+
+
+def test_adeserialize_stream_invalid_policy():
+    with raises(ValueError):
+        adeserialize_stream(Foo, chunked('', 1), errors='ignore')
@@ -0,0 +1,138 @@
+import types
+
+from pytest import raises
+
+from typedpy import Structure, ImmutableStructure, Integer, String, Array, RejectedItem
+
+
+class Foo(Structure):
+    _required = ['a']
+    a = Integer
+    b = String
+    c = Array[Integer]
+
+
+class Strict(ImmutableStructure):
+    _additionalProperties = False
+    a = Integer
+    b = String
+
+
+class Bar(Foo):
+    d = Integer
+
+
+class Custom(Structure):
+    a = Integer
+
+    def __init__(self, a):
+        super().__init__(a=a * 2)
+
+
+def test_from_dicts():
+    foos = Foo.from_dicts([{'a': 1}, {'a': 2, 'b': 'x', 'c': [1], 'extra': 5}])
+    assert foos == [Foo(a=1), Foo(a=2, b='x', c=[1], extra=5)]
+    with raises(TypeError):
+        foos[1].c.append('x')
+
+
+def test_from_dicts_errors():
+    dicts = [{'a': 1}, {'b': 'x'}, {'a': 'bad'}, 'not a dict', {'a': 4}]
+    with raises(TypeError) as excinfo:
+        Foo.from_dicts(dicts)
+    assert "row 1: missing a required argument: 'a'" in str(excinfo.value)
+
+    assert Foo.from_dicts(dicts, errors='skip') == [Foo(a=1), Foo(a=4)]
+
+    rejected = []
+    Foo.from_dicts(dicts, errors='collect', rejected=rejected)
+    assert [item.position for item in rejected] == [1, 2, 3]
+    assert isinstance(rejected[1], RejectedItem)
+    assert "a: Expected <class 'int'>" in str(rejected[1].error)
+
+
+def test_from_dicts_no_additional_properties():
+    assert Strict.from_dicts([{'a': 1, 'b': 'x'}]) == [Strict(a=1, b='x')]
+    with raises(TypeError) as excinfo:
+        Strict.from_dicts([{'a': 1, 'b': 'x', 'c': 2}])
+    assert "row 0: got an unexpected keyword argument 'c'" in str(excinfo.value)
+
+
+def test_from_dicts_lazy():
+    foos = Foo.from_dicts(iter([{'a': 1}, {'a': 'bad'}]), lazy=True)
+    assert isinstance(foos, types.GeneratorType)
+    assert next(foos) == Foo(a=1)
+    with raises(TypeError):
+        next(foos)
+
+
+def test_from_rows():
+    foos = Foo.from_rows([(1, 'x', [1]), (2, None, None)])
+    assert foos == [Foo(a=1, b='x', c=[1]), Foo(a=2)]
+    assert Foo.from_rows([('x', 1)], columns=['b', 'a']) == [Foo(a=1, b='x')]
+    assert Bar.from_rows([(1, None, None, 4)]) == [Bar(a=1, d=4)]
+    assert Foo.from_rows([(1, 5)], columns=['a', 'extra']) == [Foo(a=1, extra=5)]
+    assert Strict.from_rows([(1, 'x')]) == [Strict(a=1, b='x')]
+
+
+def test_from_rows_errors():
+    rows = [(1,), (None,), ('bad',), (1, 2), (4,)]
+    rejected = []
+    foos = Foo.from_rows(rows, columns=['a'], errors='collect', rejected=rejected)
+    assert foos == [Foo(a=1), Foo(a=4)]
+    assert [item.position for item in rejected] == [1, 2, 3]
+    assert "Expected 1 values, got 2" in str(rejected[2].error)
+
+
+def test_from_rows_checks_columns_once():
+    with raises(TypeError) as excinfo:
+        Foo.from_rows([], columns=['b'])
+    assert "columns: missing a required argument: 'a'" in str(excinfo.value)
+    with raises(TypeError) as excinfo:
+        Strict.from_rows([], columns=['a', 'b', 'c'])
+    assert "columns: got an unexpected keyword argument 'c'" in str(excinfo.value)
+
+
+def test_from_rows_duplicate_columns():
+    with raises(TypeError) as excinfo:
+        Foo.from_rows([(1, 2)], columns=['a', 'a'])
+    assert "columns: got multiple values for argument 'a'" in str(excinfo.value)
+
+
+def test_from_rows_empty_columns():
+    class Optional(Structure):
+        _required = []
+        a = Integer
+
+    assert Optional.from_rows([()], columns=[]) == [Optional()]
+    with raises(TypeError) as excinfo:
+        Optional.from_rows([(1,)], columns=[])
+    assert "Expected 0 values, got 1" in str(excinfo.value)
+
+
+def test_batch_constructor_is_cached():
+    class Cached(Structure):
+        a = Integer(minimum=0)
+
+    Cached.from_dicts([{'a': 1}])
+    Cached.from_rows([(1,)], columns=['a'])
+    constructors = Cached.__dict__['_batch_constructors']
+    assert set(constructors) == {'generation', None, ('a',)}
+    construct_all = constructors[None]
+    Cached.from_dicts([{'a': 2}])
+    assert Cached.__dict__['_batch_constructors'][None] is construct_all
+    Cached.a.minimum = 5
+    assert Cached.from_dicts([{'a': 1}], errors='skip') == []
+    assert Cached.__dict__['_batch_constructors'][None] is not construct_all
+
+
+def test_custom_constructor_is_called():
+    assert Custom.from_dicts([{'a': 1}]) == [Custom(a=1)]
+    assert Custom.from_rows([(1,)])[0].a == 2
+
+
+def test_invalid_error_policy():
+    with raises(ValueError):
+        Foo.from_dicts([], errors='ignore')
+    with raises(TypeError):
+        Foo.from_rows([], errors='collect')
@@ -0,0 +1,70 @@
+from pytest import raises
+
+from typedpy import Structure, Field, Array, Map, Integer, String, Float, PositiveInt, Boolean, \
+    AnyOf, OneOf, AllOf, NotField, Enum, ValidationFailure
+
+
+class Even(Field):
+    def __set__(self, instance, value):
+        if value % 2 > 0:
+            raise ValueError('{}: Must be even'.format(self._name))
+        super().__set__(instance, value)
+
+
+class Example(Structure):
+    i = Integer(minimum=0, maximum=10)
+    s = String(maxLength=3)
+    p = PositiveInt
+    b = Boolean
+    arr = Array(items=Integer(maximum=5), maxItems=3)
+    any = AnyOf[Integer(maximum=3), String]
+    one = OneOf[Integer, Float, Integer(minimum=5)]
+    all = AllOf[Integer, PositiveInt]
+    no = NotField[String]
+    even = Even
+    enum = Enum[1, 2]
+
+
+def test_valid_values():
+    for field, value in [('i', 5), ('s', 'abc'), ('p', 1), ('b', True), ('arr', [1, 2]),
+                         ('any', 'x'), ('one', 1), ('all', 3), ('no', 2), ('even', 4),
+                         ('enum', 2)]:
+        assert getattr(Example, field).check(value) is None
+
+
+def test_failure_matches_assignment_error():
+    invalid = [('i', 11), ('i', 'a'), ('s', 'abcd'), ('s', 3), ('p', 0), ('b', 1),
+               ('arr', [1, 2, 3, 4]), ('arr', [1, 6]), ('arr', 'x'), ('any', 4),
+               ('one', 6), ('all', -1), ('no', 'a'), ('even', 3), ('enum', 3)]
+    for field, value in invalid:
+        failure = getattr(Example, field).check(value)
+        assert isinstance(failure, ValidationFailure)
+        with raises(failure.error_type) as excinfo:
+            setattr(Example(i=1, s='a', p=1, b=True, arr=[], any=1, one=1, all=1, no=1,
+                            even=2, enum=1), field, value)
+        assert str(excinfo.value) == failure.message
+
+
+def test_failure_message():
+    failure = Example.arr.check([1, 7])
+    assert failure.error_type is ValueError
+    assert failure.message == "arr_1: Expected a maxmimum of 5"
+    assert isinstance(failure.exception(), ValueError)
+    assert repr(failure) == "<ValidationFailure ValueError: arr_1: Expected a maxmimum of 5>"
+
+
+def test_failure_with_name():
+    assert str(Example.i.check(-1, name='x')) == "x: Expected a minimum of 0"
+
+
+def test_check_reflects_updated_properties():
+    field = Integer(maximum=10)
+    assert field.check(8) is None
+    field.maximum = 5
+    assert field.check(8) is not None
+
+
+def test_check_of_map():
+    field = Map[String, Integer]
+    assert field.check({'a': 1}) is None
+    assert field.check({'a': 'b'}).error_type is TypeError
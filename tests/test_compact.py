@@ -0,0 +1,135 @@
+import pickle
+
+from pytest import raises
+
+from typedpy import Structure, ImmutableStructure, Integer, String, Array, Map, \
+    serialize, deserialize_structure, structure_to_schema
+
+
+class Foo(Structure):
+    _compact = True
+    _required = ['a']
+    a = Integer(minimum=0)
+    b = String
+    c = Array[Integer]
+    m = Map[String, Integer]
+
+
+class Bar(Foo):
+    d = Integer
+
+
+class Strict(ImmutableStructure):
+    _compact = True
+    _additionalProperties = False
+    x = Integer
+
+
+def test_compact_stores_fields_in_slots():
+    foo = Foo(a=1, b='x', extra=2)
+    assert Foo.__slots__ == ('a', 'b', 'c', 'm', '_typedpy_overflow')
+    # the real __dict__ of the instance is never used
+    assert Structure.__dict__['__dict__'].__get__(foo) == {}
+    assert foo.a == 1
+    assert foo.b == 'x'
+    assert isinstance(foo.c, Array)
+
+
+def test_compact_validation():
+    foo = Foo(a=1, c=[1])
+    with raises(ValueError) as excinfo:
+        foo.a = -1
+    assert "a: Expected a minimum of 0" in str(excinfo.value)
+    foo.c.append(2)
+    with raises(TypeError) as excinfo:
+        foo.c.append('x')
+    assert "c_2: Expected <class 'int'>" in str(excinfo.value)
+    assert foo.c == [1, 2]
+
+
+def test_compact_additional_properties():
+    foo = Foo(a=1, extra=5)
+    foo.more = 'y'
+    assert foo.extra == 5
+    assert serialize(foo) == {'a': 1, 'extra': 5, 'more': 'y'}
+    with raises(AttributeError):
+        getattr(foo, 'missing')
+
+
+class Limited(Structure):
+    _compact = True
+    _required = []
+    a = Integer
+    limit = 5
+
+
+def test_compact_property_named_as_class_attribute():
+    limited = Limited(a=1, limit=7)
+    assert limited.limit == 7
+    assert vars(limited) == {'a': 1, 'limit': 7}
+    assert pickle.loads(pickle.dumps(limited)).limit == 7
+    del limited['limit']
+    assert limited.limit == 5
+    assert vars(limited) == {'a': 1}
+
+
+def test_compact_str_eq_and_delete():
+    foo = Foo(a=1, b='x', extra=2)
+    assert str(foo) == "<Instance of Foo. Properties: a = 1, b = 'x', extra = 2>"
+    assert foo == Foo(a=1, b='x', extra=2)
+    del foo['b']
+    assert foo == Foo(a=1, extra=2)
+    with raises(ValueError):
+        del foo['a']
+
+
+def test_compact_immutable():
+    strict = Strict(x=1)
+    with raises(ValueError) as excinfo:
+        strict.x = 2
+    assert "Structure is immutable" in str(excinfo.value)
+    with raises(AttributeError):
+        strict.y = 2
+    with raises(TypeError):
+        Strict(x=1, y=2)
+
+
+def test_compact_inheritance():
+    bar = Bar(a=1, d=2, extra=3)
+    assert Bar.__slots__ == ('d',)
+    assert serialize(bar) == {'a': 1, 'd': 2, 'extra': 3}
+    with raises(TypeError):
+        Bar(a=1, d='x')
+
+
+def test_regular_base_classes_keep_dict():
+    assert Structure(a=1).a == 1
+    assert ImmutableStructure(a=1).a == 1
+
+
+def test_compact_requires_compact_bases():
+    class Regular(Structure):
+        a = Integer
+
+    with raises(TypeError) as excinfo:
+        class Compact(Regular):
+            _compact = True
+    assert "cannot derive from Regular, which is not compact" in str(excinfo.value)
+
+
+def test_compact_serialization_and_pickle():
+    foo = deserialize_structure(Foo, {'a': 1, 'c': [1, 2], 'm': {'k': 3}, 'extra': 4})
+    assert serialize(foo) == {'a': 1, 'c': [1, 2], 'm': {'k': 3}, 'extra': 4}
+    restored = pickle.loads(pickle.dumps(foo))
+    assert restored == foo
+    with raises(TypeError):
+        restored.c.append('x')
+
+
+def test_compact_schema():
+    class Simple(Structure):
+        _compact = True
+        a = Integer(minimum=0)
+
+    schema, _ = structure_to_schema(Simple, {})
+    assert schema['a'] == {'type': 'integer', 'minimum': 0}
@@ -0,0 +1,102 @@
+from datetime import date, datetime, timedelta, timezone
+
+from pytest import raises
+
+from typedpy import Structure, DateString, DateTimeString, TimestampField, AnyOf, Integer, \
+    serialize, deserialize_structure
+
+
+class Example(Structure):
+    _required = []
+    d = DateString
+    parsed_d = DateString(keep_parsed=True)
+    dt = DateTimeString
+    parsed_dt = DateTimeString(keep_parsed=True)
+    ts = TimestampField
+    parsed_ts = TimestampField(keep_parsed=True)
+
+
+def test_date_string_same_as_strptime():
+    samples = ['2017-08-09', '2017-8-9', '2017-08-3', '2016-02-29', '2017-02-29', '2017-13-01',
+               '2017-00-10', '2017-08-00', '0000-01-01', '17-08-03', '2017-08-03 ', '20170803',
+               '2017-08-32', '2017-08- 3']
+    for sample in samples:
+        try:
+            datetime.strptime(sample, '%Y-%m-%d')
+        except ValueError as ex:
+            with raises(ValueError) as excinfo:
+                Example(d=sample)
+            assert "d: {}".format(ex.args[0]) == str(excinfo.value)
+        else:
+            assert Example(d=sample).d == sample
+
+
+def test_date_string_keep_parsed():
+    e = Example(parsed_d='2017-08-09')
+    assert e.parsed_d == date(2017, 8, 9)
+    e.parsed_d = date(2018, 1, 1)
+    assert e.parsed_d == date(2018, 1, 1)
+    with raises(TypeError):
+        Example(d=date(2018, 1, 1))
+
+
+def test_datetime_string_valid():
+    for sample in ['2017-08-09T13:45', '2017-08-09 13:45:10', '2017-08-09T13:45:10.5Z',
+                   '2017-08-09T13:45:10.123456+02:00', '2017-08-09T13:45:10-0330']:
+        assert Example(dt=sample).dt == sample
+
+
+def test_datetime_string_err():
+    for sample in ['2017-08-09', '2017-08-09T25:00', '2017-02-30T10:00', '2017-08-09T13:45+2',
+                   '2017-08-09T13:45:10.1234567', '2017-08-09T13:45+24:00']:
+        with raises(ValueError) as excinfo:
+            Example(dt=sample)
+        assert str(excinfo.value).startswith("dt: ")
+    with raises(TypeError):
+        Example(dt=5)
+
+
+def test_datetime_string_keep_parsed():
+    e = Example(parsed_dt='2017-08-09T13:45:10.25-03:30')
+    assert e.parsed_dt == datetime(2017, 8, 9, 13, 45, 10, 250000,
+                                   timezone(-timedelta(hours=3, minutes=30)))
+    assert Example(parsed_dt='2017-08-09T13:45Z').parsed_dt.tzinfo is timezone.utc
+
+
+def test_timestamp():
+    assert Example(ts=1500000000).ts == 1500000000
+    assert Example(parsed_ts=1500000000.5).parsed_ts == \
+        datetime(2017, 7, 14, 2, 40, 0, 500000, timezone.utc)
+    for value in (True, '1500000000', None):
+        with raises(TypeError) as excinfo:
+            Example(ts=value)
+        assert "ts: Expected a timestamp" == str(excinfo.value)
+    for value in (1e20, float('nan')):
+        with raises(ValueError) as excinfo:
+            Example(ts=value)
+        assert "ts: Timestamp is out of range" == str(excinfo.value)
+
+
+def test_timestamp_keep_parsed_naive_datetime_err():
+    with raises(ValueError) as excinfo:
+        Example(parsed_ts=datetime(2017, 1, 1))
+    assert "parsed_ts: Expected a timezone-aware datetime" == str(excinfo.value)
+
+
+def test_timestamp_in_anyof():
+    class Foo(Structure):
+        a = AnyOf[TimestampField(keep_parsed=True), Integer]
+
+    assert Foo(a=datetime(2017, 1, 1, tzinfo=timezone.utc)).a.year == 2017
+
+
+def test_serialization_round_trip():
+    e = Example(d='2017-08-09', parsed_d='2017-08-09', parsed_dt='2017-08-09T13:45:00+00:00',
+                parsed_ts=1500000000)
+    serialized = serialize(e)
+    assert serialized == {'d': '2017-08-09', 'parsed_d': '2017-08-09',
+                          'parsed_dt': '2017-08-09T13:45:00+00:00', 'parsed_ts': 1500000000.0}
+    deserialized = deserialize_structure(Example, serialized)
+    assert deserialized.parsed_d == e.parsed_d
+    assert deserialized.parsed_dt == e.parsed_dt
+    assert deserialized.parsed_ts == e.parsed_ts
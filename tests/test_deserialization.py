@@ -2,7 +2,7 @@ from pytest import raises
 
 from typedpy import Structure, Array, Number, String, Integer, \
     StructureReference, AllOf, deserialize_structure, Enum, \
-    Float, TypedField, Map, create_typed_field, AnyOf, Set
+    Float, TypedField, Map, create_typed_field, AnyOf, Set, Tuple
 
 
 class SimpleStruct(Structure):
@@ -216,3 +216,42 @@ def test_unsupported_type_err():
     with raises(NotImplementedError) as excinfo:
          deserialize_structure(Foo, source)
     assert "cannot deserialize field 'bar' of type WrappedBar" in str(excinfo.value)
+
+
+def test_set_deserialization():
+    class Foo(Structure):
+        a = Set[Integer]
+
+    foo = deserialize_structure(Foo, {'a': [1, 2, 2]})
+    assert foo.a == {1, 2}
+    with raises(TypeError) as excinfo:
+        deserialize_structure(Foo, {'a': [1, 'x']})
+    assert "a: Expected <class 'int'>" in str(excinfo.value)
+
+
+def test_tuple_deserialization():
+    class Foo(Structure):
+        t = Tuple[Integer, SimpleStruct]
+
+    foo = deserialize_structure(Foo, {'t': [1, {'name': 'abc'}]})
+    assert foo.t[0] == 1
+    assert foo.t[1].name == 'abc'
+    with raises(ValueError) as excinfo:
+        deserialize_structure(Foo, {'t': [1]})
+    assert "t: Expected a tuple of length 2" in str(excinfo.value)
+
+
+def test_inherited_fields_deserialization():
+    class Base(Structure):
+        simple = SimpleStruct
+        numbers = Array[Integer]
+
+    class Foo(Base):
+        s = String
+        _required = []
+
+    foo = deserialize_structure(Foo, {'simple': {'name': 'abc'}, 'numbers': [1, 2], 's': 'x',
+                                      'other': [3]})
+    assert foo.simple.name == 'abc'
+    assert foo.numbers == [1, 2]
+    assert foo.other == [3]
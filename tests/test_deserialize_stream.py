@@ -0,0 +1,163 @@
+import bz2
+import gzip
+import io
+import lzma
+
+from pytest import raises
+
+from typedpy import Structure, Integer, String, Array, deserialize_stream, \
+    deserialize_json_array, RejectedItem, serialization
+from typedpy.serialization import _JsonArrayParser
+
+
+class Foo(Structure):
+    a = Integer
+    b = String
+    c = Array[Integer]
+    _required = ['a']
+
+
+LINES = '{"a": 1, "b": "x"}\n\n{"a": "bad"}\n{"a": 3, "c": [1, 2]}\nnot json\n'
+
+
+def test_deserialize_stream_text():
+    foos = deserialize_stream(Foo, io.StringIO('{"a": 1, "b": "x"}\n{"a": 2}\n'))
+    assert [foo.a for foo in foos] == [1, 2]
+
+
+def test_deserialize_stream_is_lazy():
+    foos = deserialize_stream(Foo, io.StringIO('{"a": 1}\n{"a": "bad"}\n'))
+    assert next(foos).a == 1
+    with raises(TypeError):
+        next(foos)
+
+
+def test_deserialize_stream_leaves_the_stream_open():
+    for compress in (lambda content: content, gzip.compress):
+        source = io.BytesIO(compress(b'{"a": 1}\n'))
+        assert [foo.a for foo in deserialize_stream(Foo, source)] == [1]
+        assert not source.closed
+        source = io.BytesIO(compress(b'[{"a": 1}]'))
+        assert [foo.a for foo in deserialize_json_array(Foo, source)] == [1]
+        assert not source.closed
+
+
+def test_deserialize_stream_utf8_bom():
+    source = io.BytesIO('\ufeff{"a": 1}\n{"a": 2}\n'.encode('utf-8'))
+    assert [foo.a for foo in deserialize_stream(Foo, source)] == [1, 2]
+
+
+def test_deserialize_stream_compressed():
+    for compress in (lambda content: content, gzip.compress, bz2.compress, lzma.compress):
+        source = io.BytesIO(compress('{"a": 1}\n{"a": 2, "c": [3]}\n'.encode('utf-8')))
+        foos = list(deserialize_stream(Foo, source))
+        assert [foo.a for foo in foos] == [1, 2]
+        assert foos[1].c == [3]
+
+
+def test_deserialize_stream_file_name(tmpdir):
+    path = tmpdir.join('foos.jsonl.gz')
+    with gzip.open(str(path), 'wt') as f:
+        for i in range(1000):
+            f.write('{{"a": {}}}\n'.format(i))
+    assert sum(foo.a for foo in deserialize_stream(Foo, str(path))) == 499500
+
+
+def test_deserialize_stream_raise_err():
+    with raises(TypeError) as excinfo:
+        list(deserialize_stream(Foo, io.StringIO(LINES)))
+    assert "line 3: a: Expected <class 'int'>" in str(excinfo.value)
+
+
+def test_deserialize_stream_skip():
+    foos = deserialize_stream(Foo, io.StringIO(LINES), errors='skip')
+    assert [foo.a for foo in foos] == [1, 3]
+
+
+def test_deserialize_stream_collect():
+    rejected = []
+    foos = deserialize_stream(Foo, io.BytesIO(LINES.encode('utf-8')), errors='collect',
+                              rejected=rejected)
+    assert [foo.a for foo in foos] == [1, 3]
+    assert [(item.position, item.source) for item in rejected] == \
+           [(3, '{"a": "bad"}\n'), (5, 'not json\n')]
+    assert isinstance(rejected[0], RejectedItem)
+    assert isinstance(rejected[1].error, ValueError)
+
+
+def test_deserialize_stream_invalid_policy_err():
+    with raises(ValueError) as excinfo:
+        deserialize_stream(Foo, io.StringIO(LINES), errors='ignore')
+    assert "errors: Expected one of raise, skip, collect" in str(excinfo.value)
+    with raises(TypeError) as excinfo:
+        deserialize_stream(Foo, io.StringIO(LINES), errors='collect')
+    assert "rejected: Expected a list" in str(excinfo.value)
+
+
+ARRAY = ' [{"a": 12345, "b": "x\\u00e9y"}, {"a": 2, "b": "é"},\n {"a": "bad"}, {"a": 4}] \n'
+
+
+def test_deserialize_json_array():
+    for chunk_size in (1, 2, 5, 65536):
+        foos = list(deserialize_json_array(Foo, io.BytesIO(ARRAY.encode('utf-8')),
+                                           errors='skip', chunk_size=chunk_size))
+        assert [foo.a for foo in foos] == [12345, 2, 4]
+        assert [foo.b for foo in foos[:2]] == ['xéy', 'é']
+
+
+def test_deserialize_json_array_compressed_file(tmpdir):
+    path = tmpdir.join('foos.json.bz2')
+    with bz2.open(str(path), 'wt') as f:
+        f.write('[' + ', '.join('{{"a": {}}}'.format(i) for i in range(1000)) + ']')
+    assert sum(foo.a for foo in deserialize_json_array(Foo, str(path), chunk_size=100)) == 499500
+
+
+def test_deserialize_json_array_empty():
+    assert list(deserialize_json_array(Foo, io.StringIO(' [ ] '))) == []
+
+
+def test_deserialize_json_array_collect():
+    rejected = []
+    foos = deserialize_json_array(Foo, io.StringIO(ARRAY), errors='collect', rejected=rejected)
+    assert [foo.a for foo in foos] == [12345, 2, 4]
+    assert [(item.position, item.source) for item in rejected] == [(2, {'a': 'bad'})]
+
+
+def test_deserialize_json_array_raise_err():
+    with raises(TypeError) as excinfo:
+        list(deserialize_json_array(Foo, io.StringIO(ARRAY)))
+    assert "element 2: a: Expected <class 'int'>" in str(excinfo.value)
+
+
+def test_deserialize_json_array_invalid_json_err():
+    for content, message in [('{"a": 1}', "Expected '[' in JSON array, got '{'"),
+                             ('[{"a": 1}', "Expected ',' or ']' in JSON array, got end of input"),
+                             ('[{"a": 1}] []', "Expected end of input after the JSON array"),
+                             ('[{"a": 1}, {"a": ]', "Expecting value")]:
+        with raises(ValueError) as excinfo:
+            list(deserialize_json_array(Foo, io.StringIO(content), errors='skip', chunk_size=3))
+        assert message in str(excinfo.value)
+
+
+def test_deserialize_json_array_invalid_element_fails_early():
+    def chunks():
+        yield '[{"a": 1}, {"a": x}, '
+        for _ in range(1000):
+            yield '{"a": 1}, ' * 1000
+
+    parser = _JsonArrayParser()
+    elements = []
+    with raises(ValueError) as excinfo:
+        for chunk in chunks():
+            parser.feed(chunk)
+            elements.extend(parser.elements())
+    assert "Expecting value" in str(excinfo.value)
+    assert elements == [{'a': 1}]
+
+
+def test_deserialize_json_array_lookahead_is_capped(monkeypatch):
+    monkeypatch.setattr(serialization, '_MAX_LOOKAHEAD', 100)
+    content = '[{"a": 1, "b": "' + 'x' * 1000
+    with raises(ValueError) as excinfo:
+        list(deserialize_json_array(Foo, io.StringIO(content), chunk_size=10))
+    assert "JSON array element is longer than 100 characters" in str(excinfo.value)
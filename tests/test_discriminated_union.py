@@ -0,0 +1,126 @@
+from pytest import raises
+
+from typedpy import Structure, DiscriminatedUnion, Integer, String, Array, \
+    deserialize_structure, serialize, structure_to_schema
+
+
+class Click(Structure):
+    x = Integer
+    y = Integer
+
+
+class View(Structure):
+    page = String
+
+
+class Tagged(Structure):
+    type = String
+    count = Integer
+
+
+class Example(Structure):
+    _required = []
+    event = DiscriminatedUnion(discriminator='type',
+                               mapping={'click': Click, 'view': View, 'tagged': Tagged})
+    events = Array[DiscriminatedUnion(discriminator='type',
+                                      mapping={'click': Click, 'view': View})]
+
+
+def test_dict_is_converted_to_selected_class():
+    e = Example(event={'type': 'click', 'x': 1, 'y': 2})
+    assert e.event == Click(x=1, y=2)
+    assert 'type' not in e.event.__dict__
+
+
+def test_discriminator_is_kept_if_declared():
+    e = Example(event={'type': 'tagged', 'count': 3})
+    assert e.event == Tagged(type='tagged', count=3)
+
+
+def test_instance_is_accepted():
+    view = View(page='home')
+    assert Example(event=view).event is view
+
+
+def test_instance_of_other_class_err():
+    class Other(Structure):
+        a = Integer
+
+    with raises(TypeError) as excinfo:
+        Example(event=Other(a=1))
+    assert "event: Expected a dict or one of Click, Tagged, View" in str(excinfo.value)
+
+
+def test_instance_with_wrong_discriminator_err():
+    with raises(ValueError) as excinfo:
+        Example(event=Tagged(type='click', count=3))
+    assert "event: Unknown value of type: click" in str(excinfo.value)
+
+
+def test_missing_discriminator_err():
+    with raises(ValueError) as excinfo:
+        Example(event={'x': 1, 'y': 2})
+    assert "event: Missing discriminator 'type'" in str(excinfo.value)
+
+
+def test_unknown_discriminator_err():
+    for tag in ('scroll', ['click']):
+        with raises(ValueError) as excinfo:
+            Example(event={'type': tag})
+        assert "event: Unknown value of type" in str(excinfo.value)
+
+
+def test_selected_class_is_validated():
+    with raises(TypeError) as excinfo:
+        Example(events=[{'type': 'view', 'page': 'a'}, {'type': 'click', 'x': 'a', 'y': 1}])
+    assert "x: Expected <class 'int'>" in str(excinfo.value)
+
+
+def test_invalid_definitions_err():
+    with raises(TypeError):
+        DiscriminatedUnion(discriminator='type', mapping={'a': int})
+    with raises(TypeError):
+        DiscriminatedUnion(discriminator='type', mapping={})
+    with raises(TypeError):
+        DiscriminatedUnion(mapping={'a': Click})
+
+
+def test_deserialization():
+    data = {
+        'event': {'type': 'click', 'x': 1, 'y': 2},
+        'events': [{'type': 'view', 'page': 'a'}, {'type': 'click', 'x': 3, 'y': 4}]
+    }
+    e = deserialize_structure(Example, data)
+    assert e.event == Click(x=1, y=2)
+    assert e.events == [View(page='a'), Click(x=3, y=4)]
+
+
+def test_serialization_adds_discriminator():
+    e = Example(event=Click(x=1, y=2), events=[View(page='a')])
+    assert serialize(e) == {
+        'event': {'type': 'click', 'x': 1, 'y': 2},
+        'events': [{'type': 'view', 'page': 'a'}]
+    }
+    deserialized = deserialize_structure(Example, serialize(e))
+    assert deserialized.event == e.event
+    assert deserialized.events[0] == e.events[0]
+
+
+def test_str():
+    assert str(Example.events.items) == \
+        "<DiscriminatedUnion. Properties: discriminator = 'type', mapping = {click: Click, view: View}>"
+
+
+def test_schema():
+    class Foo(Structure):
+        event = DiscriminatedUnion(discriminator='type', mapping={'click': Click, 'view': View})
+
+    schema, definitions = structure_to_schema(Foo, {})
+    assert schema['event'] == {
+        'oneOf': [{'$ref': '#/definitions/Click'}, {'$ref': '#/definitions/View'}],
+        'discriminator': {
+            'propertyName': 'type',
+            'mapping': {'click': '#/definitions/Click', 'view': '#/definitions/View'}
+        }
+    }
+    assert set(definitions) == {'Click', 'View'}
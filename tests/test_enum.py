@@ -37,3 +37,42 @@ def test_within_erray_err():
 
 
 
+
+
+def test_large_enum_err_message_is_truncated():
+    class A(Structure):
+        code = Enum(values=['c{}'.format(i) for i in range(5000)])
+
+    assert A(code='c4999').code == 'c4999'
+    with raises(ValueError) as excinfo:
+        A(code='x')
+    assert "code: Must be one of ['c0', 'c1', 'c2', 'c3', 'c4', 'c5', 'c6', 'c7', 'c8', 'c9', ...] " \
+           "(5000 values)" == str(excinfo.value)
+
+
+def test_unhashable_values():
+    class A(Structure):
+        e = Enum(values=[1, [1, 2], {'a': 1}, {3}])
+
+    for val in (1, 1.0, True, [1, 2], {'a': 1}, {3}, frozenset([3])):
+        A(e=val)
+    for val in (2, [2], {'a': 2}, (1, 2)):
+        with raises(ValueError):
+            A(e=val)
+
+
+def test_reassigned_values():
+    class A(Structure):
+        e = Enum[1, 2]
+
+    A(e=1)
+    A.e.values = [3]
+    A(e=3)
+    with raises(ValueError):
+        A(e=1)
+
+
+def test_check():
+    field = Enum(values=set(range(1000)))
+    assert field.check(999) is None
+    assert field.check(1000).error_type is ValueError
@@ -0,0 +1,97 @@
+from pytest import raises
+
+from typedpy import Structure, ImmutableStructure, Integer, String, Array, Map, Set, Tuple
+
+
+class Point(ImmutableStructure):
+    x = Integer
+    y = Integer
+
+
+class Foo(Structure):
+    _required = []
+    a = Array[Integer]
+    s = String
+    points = Array[Point]
+
+
+class SameStr(Structure):
+    _required = []
+    a = Array[Integer]
+    s = String
+    points = Array[Point]
+
+
+class Bounded(Structure):
+    _str_max_items = 2
+    _required = []
+    a = Array[Integer]
+    t = Tuple(items=[Integer])
+    st = Set[Integer]
+    m = Map[String, Array[Integer]]
+    foo = Foo
+
+
+def test_eq_field_wise():
+    assert Foo(a=[1, 2], s='x') == Foo(a=[1, 2], s='x')
+    assert Foo(a=[1, 2], s='x') != Foo(a=[1, 3], s='x')
+    assert Foo(a=[1, 2]) != Foo(a=[1, 2], s='x')
+    assert Foo(points=[Point(x=1, y=2)]) == Foo(points=[Point(x=1, y=2)])
+
+
+def test_eq_checks_class():
+    assert Foo(s='x') != SameStr(s='x')
+    assert Foo(s='x') != "<Instance of Foo. Properties: s = 'x'>"
+    assert not Foo(s='x') == 1
+
+
+def test_immutable_hash():
+    assert hash(Point(x=1, y=2)) == hash(Point(x=1, y=2))
+    assert {Point(x=1, y=2): 'a'}[Point(x=1, y=2)] == 'a'
+    assert len({Point(x=1, y=2), Point(x=1, y=2), Point(x=2, y=1)}) == 2
+    point = Point(x=1, y=2)
+    hash(point)
+    assert point.__dict__ == {'x': 1, 'y': 2}
+
+
+def test_immutable_hash_after_adding_a_field():
+    class B(ImmutableStructure):
+        _required = []
+        x = Integer
+        y = Integer
+
+    b = B(x=1)
+    hash(b)
+    b.y = 3
+    assert b == B(x=1, y=3)
+    assert hash(b) == hash(B(x=1, y=3))
+    assert {B(x=1, y=3): 'a'}[b] == 'a'
+
+
+def test_mutable_is_not_hashable():
+    with raises(TypeError):
+        hash(Foo(s='x'))
+
+
+def test_unique_items_of_structures():
+    class Unique(Structure):
+        foos = Array(items=Foo, uniqueItems=True)
+
+    Unique(foos=[Foo(a=[1]), Foo(a=[2])])
+    with raises(ValueError):
+        Unique(foos=[Foo(a=[1]), Foo(a=[1])])
+
+
+def test_str_max_items():
+    bounded = Bounded(a=list(range(10)), t=(1,), st={3}, m={'a': [1, 2, 3], 'b': [], 'c': []},
+                      foo=Foo(a=[1, 2, 3, 4], points=[Point(x=1, y=2)]))
+    assert str(bounded) == \
+        "<Instance of Bounded. Properties: a = [0, 1, ... 8 more], " \
+        "foo = <Instance of Foo. Properties: a = [1, 2, ... 2 more], " \
+        "points = [<Instance of Point. Properties: x = 1, y = 2>]>, " \
+        "m = {'a': [1, 2, ... 1 more], 'b': [], ... 1 more}, st = {3}, t = (1,)>"
+
+
+def test_repr_in_collections():
+    assert str(Foo(points=[Point(x=1, y=2)])) == \
+        "<Instance of Foo. Properties: points = [<Instance of Point. Properties: x = 1, y = 2>]>"
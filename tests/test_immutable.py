@@ -1,5 +1,5 @@
 from pytest import raises
-from typedpy import String , Number, Structure, ImmutableField, ImmutableStructure, Array, Map
+from typedpy import String , Number, Structure, ImmutableField, ImmutableStructure, Array, Map, Set
 
 class ImmutableString(String, ImmutableField): pass
 
@@ -57,3 +57,32 @@ def test_immutable_structure_map_updates_err():
     with raises(ValueError) as excinfo:
         b.m['c'] = 1
     assert "Structure is immutable" in str(excinfo.value)
+
+
+def test_immutable_structure_array_inplace_updates_err():
+    b = B(z = [3,1,2])
+    for update in (lambda z: z.append(4), lambda z: z.sort(), lambda z: z.clear(),
+                   lambda z: z.__delitem__(0)):
+        with raises(ValueError) as excinfo:
+            update(b.z)
+        assert "Structure is immutable" in str(excinfo.value)
+    assert b.z == [3,1,2]
+
+
+def test_immutable_array_field_updates_err():
+    class D(Structure):
+        z = Array(items=Number, immutable=True)
+    d = D(z=[1])
+    with raises(ValueError) as excinfo:
+        d.z.append(2)
+    assert "z: Field is immutable" in str(excinfo.value)
+
+
+def test_immutable_structure_set_updates_err():
+    class D(ImmutableStructure):
+        s = Set[Number]
+    d = D(s={1, 2})
+    with raises(ValueError) as excinfo:
+        d.s.add(3)
+    assert "Structure is immutable" in str(excinfo.value)
+    assert d.s == {1, 2}
@@ -1,6 +1,7 @@
 from pytest import raises
 
-from typedpy import Structure, AllOf, AnyOf, OneOf, Integer, String, Positive, Number, NotField
+from typedpy import Structure, AllOf, AnyOf, OneOf, Integer, String, Positive, Number, NotField, \
+    StructureReference
 
 
 class Foo(Structure):
@@ -144,3 +145,52 @@ def test_embeded_structure_type_err():
 def test_embeded_structure_valid():
     assert  Example(g = Foo(s="abc")).g.s == "abc"
 
+
+
+def test_options_are_looked_up_by_type():
+    assert Example.g._options_for(5) == (Example.g.get_fields()[1],)
+    assert Example.g._options_for(Foo(s='x')) == (Example.g.get_fields()[0],)
+    assert Example.g._options_for('x') == ()
+    assert Example.b._options_for('x') == (Example.b.get_fields()[3],)
+
+
+def test_structure_reference_option_accepts_its_instances():
+    class Bar(Structure):
+        a = AnyOf[Integer, StructureReference(x=Integer)]
+
+    inline = Bar.a.get_fields()[1]._newclass
+    assert Bar(a=inline(x=1)).a == inline(x=1)
+
+
+def test_anyof_stops_at_first_match():
+    calls = []
+
+    class Tracked(Integer):
+        def _validate(self, value, name):
+            calls.append(value)
+            return super()._validate(value, name)
+
+    class Bar(Structure):
+        a = AnyOf[Integer, Tracked]
+
+    Bar(a=3)
+    assert calls == []
+
+
+def test_anyof_promotes_matching_option():
+    class Bar(Structure):
+        a = AnyOf[Integer(maximum=5), Integer(minimum=10)]
+
+    for _ in range(3):
+        Bar(a=20)
+    assert Bar.a._options_for(20)[0].minimum == 10
+    assert [f.maximum for f in Bar.a.get_fields()] == [5, None]
+    Bar(a=1)
+    with raises(ValueError):
+        Bar(a=7)
+
+
+def test_oneof_matches_few_by_type_err():
+    with raises(ValueError) as excinfo:
+        Example(c=15)
+    assert "c: Matched more than one field option" in str(excinfo.value)
@@ -0,0 +1,141 @@
+import json
+import pickle
+
+from pytest import raises, importorskip
+
+from typedpy import Structure, ImmutableStructure, Integer, Float, Number, PositiveInt, \
+    String, Array, AnyOf, OneOf, serialize, serialize_to_json
+
+numpy = importorskip('numpy')
+
+
+class Measurements(Structure):
+    _required = []
+    counts = Array(items=Integer(minimum=0, maximum=100), uniqueItems=True)
+    ratios = Array(items=Float(maximum=1.0, exclusiveMaximum=True), minItems=1, maxItems=3)
+    steps = Array[Number(multiplesOf=0.5)]
+    ids = Array[PositiveInt]
+    anything = Array
+    names = Array[String]
+
+
+def test_numpy_scalars():
+    class Foo(Structure):
+        i = Integer(maximum=10)
+        f = Float
+        n = Number
+
+    foo = Foo(i=numpy.int32(5), f=numpy.float32(1.5), n=numpy.uint8(3))
+    assert type(foo.i) is int and foo.i == 5
+    assert type(foo.f) is float and foo.f == 1.5
+    assert type(foo.n) is int
+    with raises(ValueError) as excinfo:
+        foo.i = numpy.int64(11)
+    assert "i: Expected a maxmimum of 10" in str(excinfo.value)
+    with raises(TypeError):
+        foo.i = numpy.float64(1.0)
+    with raises(TypeError):
+        foo.f = numpy.int64(1)
+
+
+def test_array_is_not_copied():
+    counts = numpy.array([1, 2, 3])
+    measurements = Measurements(counts=counts)
+    assert isinstance(measurements.counts, numpy.ndarray)
+    assert numpy.shares_memory(measurements.counts, counts)
+    with raises(ValueError):
+        measurements.counts[0] = -1
+    counts[0] = 5
+    assert counts.flags.writeable
+
+
+def test_array_aliases_the_original():
+    class Frozen(ImmutableStructure):
+        counts = Array(items=Integer(minimum=0))
+
+    counts = numpy.array([1, 2, 3])
+    frozen = Frozen(counts=counts)
+    # documented: updates of the original array are seen, and are not validated
+    counts[0] = -5
+    assert frozen.counts[0] == -5
+    counts = numpy.array([1, 2, 3])
+    frozen = Frozen(counts=counts.copy())
+    counts[0] = -5
+    assert frozen.counts[0] == 1
+
+
+def test_numpy_values_of_multiple_options():
+    class Foo(Structure):
+        _required = []
+        a = AnyOf[Integer, String]
+        o = OneOf[Integer(maximum=5), Float]
+        arr = AnyOf[Array[Integer], String]
+
+    foo = Foo(a=numpy.int64(3), o=numpy.int32(4), arr=numpy.array([1, 2]))
+    assert foo.a == 3
+    assert foo.o == 4
+    foo.o = numpy.float32(7.5)
+    assert foo.o == 7.5
+    assert isinstance(foo.arr, numpy.ndarray)
+    with raises(ValueError):
+        foo.o = numpy.int64(7)
+
+
+def test_vectorized_checks():
+    with raises(ValueError) as excinfo:
+        Measurements(counts=numpy.array([1, 2, 300, -1]))
+    assert "counts_2: Expected a maxmimum of 100" in str(excinfo.value)
+    with raises(ValueError) as excinfo:
+        Measurements(counts=numpy.array([1, -1]))
+    assert "counts_1: Expected a minimum of 0" in str(excinfo.value)
+    with raises(ValueError) as excinfo:
+        Measurements(counts=numpy.array([1, 2, 1]))
+    assert "counts: Expected unique items" in str(excinfo.value)
+    with raises(ValueError) as excinfo:
+        Measurements(ratios=numpy.array([0.5, 1.0]))
+    assert "ratios_1: Expected a maxmimum of less than 1.0" in str(excinfo.value)
+    with raises(ValueError):
+        Measurements(ratios=numpy.array([], dtype=float))
+    with raises(ValueError):
+        Measurements(ratios=numpy.zeros(4))
+    with raises(ValueError) as excinfo:
+        Measurements(steps=numpy.array([0.5, 2, 0.75]))
+    assert "steps_2: Expected a a multiple of 0.5" in str(excinfo.value)
+    with raises(ValueError) as excinfo:
+        Measurements(ids=numpy.array([3, 0], dtype=numpy.uint16))
+    assert "ids_1: Must be positive" in str(excinfo.value)
+    Measurements(counts=numpy.arange(101), ratios=numpy.array([0.1, 0.9]),
+                 steps=numpy.array([1, 1.5]), ids=numpy.array([1, 2]),
+                 anything=numpy.array([True, False]))
+
+
+def test_other_arrays_are_converted():
+    with raises(TypeError) as excinfo:
+        Measurements(counts=numpy.array([1.0, 2.0]))
+    assert "counts_0: Expected <class 'int'>" in str(excinfo.value)
+    measurements = Measurements(names=numpy.array(['a', 'b'], dtype=object),
+                                anything=numpy.array([[1, 2], [3, 4]]))
+    assert measurements.names == ['a', 'b']
+    assert measurements.anything == [[1, 2], [3, 4]]
+    with raises(TypeError):
+        measurements.names.append(1)
+
+
+def test_check():
+    field = Measurements.__dict__['counts']
+    assert field._get_checker()(numpy.array([1, 2]), 'counts') is None
+    failure = field._get_checker()(numpy.array([1, 200]), 'counts')
+    assert "counts_1: Expected a maxmimum of 100" in str(failure)
+
+
+def test_eq_serialize_and_pickle():
+    measurements = Measurements(counts=numpy.array([1, 2]), anything=numpy.array([1.5]))
+    assert measurements == Measurements(counts=numpy.array([1, 2]), anything=[1.5])
+    assert measurements != Measurements(counts=numpy.array([1, 3]), anything=[1.5])
+    assert measurements != Measurements(counts=numpy.array([1]), anything=[1.5])
+    assert serialize(measurements) == {'counts': [1, 2], 'anything': [1.5]}
+    assert json.loads(serialize_to_json(measurements)) == {'counts': [1, 2], 'anything': [1.5]}
+    restored = pickle.loads(pickle.dumps(measurements))
+    assert restored == measurements
+    with raises(ValueError):
+        restored.counts[0] = 3
@@ -0,0 +1,78 @@
+import pickle
+
+from pytest import raises
+
+from typedpy import Structure, Integer, String, Array, Map, Set, StructureReference, \
+    deserialize_many, serialize_many, RejectedItem
+
+
+class Foo(Structure):
+    _required = ['a']
+    a = Integer
+    arr = Array[Integer]
+    m = Map[String, Integer]
+    s = Set[Integer]
+    emb = StructureReference(x=Integer, inner=StructureReference(y=String))
+
+
+SOURCE = [{'a': i, 'arr': [i], 'emb': {'x': i, 'inner': {'y': 'abc'}}} for i in range(50)]
+
+
+def test_pickle_inline_structure_classes():
+    foo = Foo(a=1, arr=[1, 2], m={'a': 1}, s={1}, emb={'x': 3, 'inner': {'y': 'z'}})
+    copied = pickle.loads(pickle.dumps(foo))
+    assert copied == foo
+    assert type(copied.emb) is type(foo.emb)
+    assert type(copied.emb.inner) is type(foo.emb.inner)
+    with raises(TypeError) as excinfo:
+        copied.arr.append('x')
+    assert "arr_2: Expected <class 'int'>" in str(excinfo.value)
+
+
+class Points(Structure):
+    points = Array[StructureReference(x=Integer)]
+
+
+def test_deserialize_many_inline_items():
+    source = [{'points': [{'x': i}]} for i in range(10)]
+    points = list(deserialize_many(Points, source, workers=2, chunksize=3))
+    assert [p.points[0].x for p in points] == list(range(10))
+    assert list(serialize_many(points, workers=2, chunksize=3)) == source
+
+
+def test_pickle_field():
+    field = pickle.loads(pickle.dumps(Foo.arr))
+    assert field.items._ty is int
+    with raises(TypeError):
+        field.items._get_compiled()('x', 'a')
+
+
+def test_deserialize_many_ordered():
+    foos = list(deserialize_many(Foo, SOURCE, workers=2, chunksize=7))
+    assert [foo.a for foo in foos] == list(range(50))
+    assert foos[3].emb.inner.y == 'abc'
+
+
+def test_deserialize_many_unordered():
+    foos = deserialize_many(Foo, SOURCE, workers=2, chunksize=7, ordered=False)
+    assert sorted(foo.a for foo in foos) == list(range(50))
+
+
+def test_deserialize_many_errors():
+    source = SOURCE[:10] + [{'a': 'x'}] + SOURCE[10:20] + [{'b': 1}]
+    with raises(TypeError) as excinfo:
+        list(deserialize_many(Foo, source, workers=2, chunksize=4))
+    assert "item 10: a: Expected <class 'int'>" in str(excinfo.value)
+
+    rejected = []
+    foos = list(deserialize_many(Foo, source, workers=2, chunksize=4, errors='collect',
+                                 rejected=rejected))
+    assert [foo.a for foo in foos] == list(range(20))
+    assert [(item.position, item.source) for item in rejected] == [(10, {'a': 'x'}),
+                                                                   (21, {'b': 1})]
+    assert isinstance(rejected[0], RejectedItem)
+
+
+def test_serialize_many():
+    foos = [Foo(**source) for source in SOURCE]
+    assert list(serialize_many(foos, workers=2, chunksize=7)) == SOURCE
@@ -0,0 +1,120 @@
+import copy
+import pickle
+
+from pytest import raises
+
+from typedpy import Structure, ImmutableStructure, Integer, String, Array, Map, Set, Tuple, \
+    StructureReference, AnyOf
+
+
+class Foo(Structure):
+    _required = ['a']
+    a = Integer
+    arr = Array[Array[Integer]]
+    m = Map[String, Array[Integer]]
+    s = Set[Integer]
+    t = Tuple[Integer, Array[Integer]]
+    emb = StructureReference(x=Integer, inner=StructureReference(y=String))
+
+
+class Bar(Foo):
+    b = String
+
+
+class Verified(Structure):
+    _verify_on_unpickle = True
+    a = Integer
+
+
+class Frozen(ImmutableStructure):
+    a = Array[Integer]
+
+
+def make_foo(cls=Foo, **kwargs):
+    return cls(a=1, arr=[[1], [2]], m={'a': [1]}, s={1}, t=(1, [2]),
+               emb={'x': 3, 'inner': {'y': 'z'}}, **kwargs)
+
+
+def test_inline_class_names_are_deterministic():
+    assert Foo.emb._newclass.__name__ == 'StructureReference_Foo_emb'
+    assert Foo.emb._newclass.__qualname__ == 'Foo.emb'
+    inner = Foo.emb._newclass.inner._newclass
+    assert inner.__name__ == 'StructureReference_Foo_emb_inner'
+    assert str(make_foo().emb) == \
+        "<Instance of Structure. Properties: inner = <Instance of Structure. " \
+        "Properties: y = 'z'>, x = 3>"
+
+
+def test_pickle_round_trip():
+    foo = make_foo(Bar, b='x', extra=[1])
+    foo.__dict__['none'] = None
+    restored = pickle.loads(pickle.dumps(foo))
+    assert restored == foo
+    assert restored.__dict__['none'] is None
+    assert type(restored.emb.inner) is type(foo.emb.inner)
+
+
+class Nested(Structure):
+    arr = Array[StructureReference(x=Integer)]
+    m = Map[String, StructureReference(y=Integer)]
+    opt = AnyOf[Integer, StructureReference(z=Integer)]
+
+
+def test_pickle_inline_classes_in_items_and_options():
+    assert Nested.arr.items._newclass.__name__ == 'StructureReference_Nested_arr_items'
+    assert Nested.m.items[1]._newclass.__qualname__ == 'Nested.m_items_1'
+    option_class = Nested.opt.get_fields()[1]._newclass
+    assert option_class.__name__ == 'StructureReference_Nested_opt_options_1'
+    nested = Nested(arr=[{'x': 1}], m={'a': {'y': 2}}, opt=option_class(z=3))
+    restored = pickle.loads(pickle.dumps(nested))
+    assert restored == nested
+    assert type(restored.arr[0]) is Nested.arr.items._newclass
+    assert type(restored.opt) is option_class
+
+
+def test_pickle_is_compact():
+    payload = pickle.dumps(Foo(a=1, arr=[[1]]))
+    assert b'arr' not in payload
+
+
+def test_unpickled_collections_are_validated():
+    foo = pickle.loads(pickle.dumps(make_foo()))
+    for update, message in [(lambda: foo.arr[1].append('x'), "arr_1_1: Expected <class 'int'>"),
+                            (lambda: foo.arr.append(['x']), "arr_2_0: Expected <class 'int'>"),
+                            (lambda: foo.m['a'].append('x'),
+                             "m_value_1: Expected <class 'int'>"),
+                            (lambda: foo.s.add('x'), "s: Expected <class 'int'>")]:
+        with raises(TypeError) as excinfo:
+            update()
+        assert message in str(excinfo.value)
+    foo.arr[0].append(5)
+    assert foo.arr == [[1, 5], [2]]
+
+
+def test_unpickled_immutable_structure():
+    frozen = pickle.loads(pickle.dumps(Frozen(a=[1])))
+    with raises(ValueError) as excinfo:
+        frozen.a.append(2)
+    assert "Structure is immutable" in str(excinfo.value)
+
+
+def test_verify_on_unpickle_err():
+    verified = Verified(a=1)
+    verified.__dict__['a'] = 'x'
+    payload = pickle.dumps(verified)
+    with raises(TypeError) as excinfo:
+        pickle.loads(payload)
+    assert "a: Expected <class 'int'>" in str(excinfo.value)
+
+
+def test_copy():
+    foo = make_foo()
+    copied = copy.copy(foo)
+    copied.arr.append([3])
+    assert foo.arr == [[1], [2]]
+    deep = copy.deepcopy(foo)
+    deep.arr[0].append(3)
+    assert foo.arr == [[1], [2]]
+    assert deep.arr == [[1, 3], [2]]
+    with raises(TypeError):
+        deep.arr[0].append('x')
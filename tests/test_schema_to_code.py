@@ -180,3 +180,25 @@ def test_boolean_field():
     assert foo.b == False
 
 
+
+
+def test_discriminated_union():
+    definitions = {
+        "Circle": {"type": "object", "radius": {"type": "number"}},
+        "Square": {"type": "object", "side": {"type": "number"}},
+    }
+    schema = {
+        "type": "object",
+        "shape": {
+            "oneOf": [{"$ref": "#/definitions/Circle"}, {"$ref": "#/definitions/Square"}],
+            "discriminator": {
+                "propertyName": "kind",
+                "mapping": {"circle": "#/definitions/Circle", "square": "#/definitions/Square"}
+            }
+        }
+    }
+    exec(schema_definitions_to_code(definitions), globals())
+    struct_code = schema_to_struct_code('Drawing', schema, definitions)
+    exec(struct_code, globals())
+    drawing = Drawing(shape={'kind': 'square', 'side': 2})
+    assert isinstance(drawing.shape, Square)
@@ -1,10 +1,12 @@
+import io
 import json
 
 from pytest import raises
 
 from typedpy import Structure, Array, Number, String, Integer, \
     StructureReference, AllOf, deserialize_structure, Enum, \
-    Float, TypedField, serialize, Map, Set, AnyOf, create_typed_field
+    Float, TypedField, serialize, Map, Set, Tuple, AnyOf, create_typed_field, \
+    Boolean, serialize_to_json
 
 
 class SimpleStruct(Structure):
@@ -75,13 +77,75 @@ def test_null_fields():
     assert serialize(foo)=={'a': 5}
 
 
-def test_serialize_set_err():
+def test_serialize_set():
     class Foo(Structure):
         a = Set()
 
     foo = Foo(a={1,2,3})
-    with raises(TypeError) as excinfo:
-        serialize(foo)
-    assert "a: Serialization unsupported for set, tuple" in str(excinfo.value)
+    assert sorted(serialize(foo)['a']) == [1, 2, 3]
 
 
+def test_serialize_tuple():
+    class Foo(Structure):
+        a = Tuple[Integer, SimpleStruct]
+
+    foo = Foo(a=(1, SimpleStruct(name='abc')))
+    assert serialize(foo) == {'a': [1, {'name': 'abc'}]}
+
+
+def test_serialize_inherited_fields():
+    class Base(Structure):
+        _required = []
+        a = Array[SimpleStruct]
+
+    class Foo(Base):
+        b = Map[String, SimpleStruct]
+
+    foo = Foo(a=[SimpleStruct(name='abc')], b={'x': SimpleStruct(name='def')}, c=3)
+    assert serialize(foo) == {'a': [{'name': 'abc'}], 'b': {'x': {'name': 'def'}}, 'c': 3}
+
+
+def test_serialize_after_field_is_changed():
+    class Foo(Structure):
+        a = Array[Number]
+
+    foo = Foo(a=[1, 2])
+    assert serialize(foo) == {'a': [1, 2]}
+    Foo.a.items = SimpleStruct
+    foo = Foo(a=[SimpleStruct(name='abc')])
+    assert serialize(foo) == {'a': [{'name': 'abc'}]}
+
+
+def test_serialize_to_json_matches_json_dumps():
+    class Inner(Structure):
+        _required = ['x']
+        x = Float
+        s = String
+
+    class Foo(Structure):
+        _required = []
+        inners = Array[Inner]
+        floats = Array[Float]
+        numbers = Array[Number]
+        inner = Inner
+        m = Map[String, Inner]
+        t = Tuple[Integer, Inner]
+        s = Set[Integer]
+        nested = Array[Array[Integer]]
+        b = Boolean
+        any = AnyOf[Integer, String]
+
+    foo = Foo(inners=[Inner(x=i * 0.1, s='é"\n{}'.format(i)) for i in range(2500)],
+              floats=[float('nan'), float('-inf'), 1e300, -0.0], numbers=[True, 3, 2.5],
+              inner=Inner(x=1.0), m={'k': Inner(x=2.0, s='x')}, t=(1, Inner(x=3.0, s='y')),
+              s={1, 2}, nested=[[1, 2], []], b=False, any='z', extra={'a': [1, None]}, empty=[])
+    for structure in [foo, Foo(), SimpleStruct(name='abc')]:
+        assert serialize_to_json(structure) == json.dumps(serialize(structure))
+
+
+def test_serialize_to_json_file():
+    foo = Example(i=5, s='abc', array=[10, 2.5], embedded={'a1': 1, 'a2': 0.5},
+                  simplestruct=SimpleStruct(name='abc'), all=3, enum=2)
+    f = io.StringIO()
+    assert serialize_to_json(foo, f) is None
+    assert f.getvalue() == json.dumps(serialize(foo))
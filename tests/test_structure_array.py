@@ -0,0 +1,130 @@
+from pytest import raises, importorskip
+
+from typedpy import Structure, ImmutableStructure, Integer, Float, Boolean, String, Enum, \
+    Array, StructureArray
+
+
+class Trade(Structure):
+    _required = ['price']
+    price = Float
+    size = Integer(minimum=0)
+    side = Enum(values=['buy', 'sell'])
+    active = Boolean
+    tags = Array[String]
+
+
+class Point(ImmutableStructure):
+    x = Integer
+    y = Integer
+
+
+def make():
+    return StructureArray[Trade]([
+        {'price': 1.5, 'size': 2, 'side': 'buy', 'active': True},
+        Trade(price=2.5, tags=['x']),
+    ])
+
+
+def test_structure_array_class():
+    assert StructureArray[Trade] is StructureArray[Trade]
+    assert isinstance(make(), StructureArray)
+    with raises(TypeError):
+        StructureArray[int]
+    with raises(TypeError):
+        StructureArray()
+
+
+def test_rows():
+    trades = make()
+    assert len(trades) == 2
+    assert trades[0].price == 1.5
+    assert trades[0].active is True
+    assert trades[-1].tags == ['x']
+    assert trades[1].size is None
+    assert trades[1] == Trade(price=2.5, tags=['x'])
+    assert [trade.price for trade in trades] == [1.5, 2.5]
+    with raises(IndexError):
+        trades[2]
+    with raises(AttributeError):
+        trades[0].missing
+
+
+def test_columns():
+    trades = make()
+    assert list(trades.column('price')) == [1.5, 2.5]
+    assert list(trades.column('size')) == [2, 0]
+    assert trades.mask('size') == bytearray(b'\x01\x00')
+    assert trades.mask('price') is None
+    assert trades.column('side') == ['buy', None]
+
+
+def test_append_validates():
+    trades = make()
+    with raises(TypeError) as excinfo:
+        trades.append({'size': 1})
+    assert "missing a required argument: 'price'" in str(excinfo.value)
+    with raises(ValueError):
+        trades.append({'price': 1.0, 'size': -1})
+    with raises(TypeError):
+        trades.append({'price': 1.0, 'other': 1})
+    with raises(TypeError):
+        trades.append(Trade(price=1.0, other=1))
+    assert len(trades) == 2
+
+
+def test_append_copies_collections():
+    trade = Trade(price=1.0, tags=['x'])
+    trades = make()
+    trades.append(trade)
+    trade.tags.append('y')
+    assert trades[2].tags == ['x']
+    assert trades.to_structures()[2] == Trade(price=1.0, tags=['x'])
+
+
+def test_update_row():
+    trades = make()
+    trades[1].size = 5
+    assert trades[1].size == 5
+    assert trades.mask('size') == bytearray(b'\x01\x01')
+    with raises(TypeError):
+        trades[1].size = 'x'
+    points = StructureArray[Point]([Point(x=1, y=2)])
+    with raises(ValueError):
+        points[0].x = 3
+
+
+def test_append_while_column_is_viewed():
+    trades = make()
+    view = trades.column('price')
+    trades.append({'price': 3.5})
+    assert list(view) == [1.5, 2.5]
+    assert list(trades.column('price')) == [1.5, 2.5, 3.5]
+
+
+def test_large_integers():
+    trades = make()
+    trades.append({'price': 1.0, 'size': 2 ** 70})
+    assert trades.column('size') == [2, None, 2 ** 70]
+    assert trades[2].size == 2 ** 70
+
+
+def test_conversions():
+    trades = make()
+    assert trades.to_dicts() == [{'price': 1.5, 'size': 2, 'side': 'buy', 'active': True},
+                                 {'price': 2.5, 'tags': ['x']}]
+    assert trades.to_structures() == [Trade(price=1.5, size=2, side='buy', active=True),
+                                      Trade(price=2.5, tags=['x'])]
+    assert StructureArray[Trade].from_structures(trades.to_structures()) == trades
+    assert StructureArray[Trade].from_dicts(trades.to_dicts()) == trades
+
+
+def test_numpy_columns():
+    numpy = importorskip('numpy')
+    trades = make()
+    prices = trades.column('price')
+    assert isinstance(prices, numpy.ndarray)
+    assert prices.dtype == numpy.float64
+    assert prices.sum() == 4.0
+    assert trades.column('active').tolist() == [True, False]
+    with raises(ValueError):
+        prices[0] = 1.0
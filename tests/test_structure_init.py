@@ -0,0 +1,137 @@
+from pytest import raises
+
+from typedpy import Structure, ImmutableStructure, Integer, String, Array
+
+
+class Example(Structure):
+    _required = ['num']
+    num = Integer(minimum=10)
+    st = String
+    arr = Array[Integer]
+
+
+class Strict(Structure):
+    _additionalProperties = False
+    a = Integer
+    b = String
+
+
+class WithConstructor(Example):
+    def __init__(self, *args, x, **kwargs):
+        self.x = x
+        super().__init__(*args, **kwargs)
+
+
+class InheritsConstructor(WithConstructor):
+    _required = []
+    z = Integer
+
+
+def test_generated_constructor_is_used():
+    assert getattr(Example.__init__, '_generated', False)
+    assert Example.__init__ is not Structure.__init__
+
+
+def test_positional_and_keyword_arguments():
+    e = Example(10, 'abc')
+    assert e.num == 10
+    assert e.st == 'abc'
+    assert e == Example(num=10, st='abc')
+
+
+def test_optional_arguments_are_not_set():
+    e = Example(num=10)
+    assert 'st' not in e.__dict__
+    assert 'arr' not in e.__dict__
+
+
+def test_none_for_optional_argument_is_validated():
+    with raises(TypeError) as excinfo:
+        Example(num=10, st=None)
+    assert "st: Expected a string" in str(excinfo.value)
+
+
+def test_missing_required_argument_err():
+    with raises(TypeError) as excinfo:
+        Example(st='abc')
+    assert "missing a required argument: 'num'" == str(excinfo.value)
+
+
+def test_too_many_positional_arguments_err():
+    with raises(TypeError) as excinfo:
+        Example(10, 'abc', [1], 4)
+    assert "too many positional arguments" == str(excinfo.value)
+
+
+def test_multiple_values_for_argument_err():
+    with raises(TypeError) as excinfo:
+        Example(10, num=11)
+    assert "multiple values for argument 'num'" == str(excinfo.value)
+
+
+def test_unexpected_keyword_argument_err():
+    with raises(TypeError) as excinfo:
+        Strict(a=1, b='x', c=2)
+    assert "got an unexpected keyword argument 'c'" == str(excinfo.value)
+
+
+def test_additional_properties_are_set():
+    e = Example(num=10, foo=5)
+    assert e.foo == 5
+
+
+def test_validation_of_fields():
+    with raises(ValueError) as excinfo:
+        Example(num=5)
+    assert "num: Expected a minimum of 10" in str(excinfo.value)
+
+
+def test_array_field_is_wrapped():
+    e = Example(num=10, arr=[1, 2])
+    with raises(TypeError) as excinfo:
+        e.arr.append('x')
+    assert "arr_2: Expected <class 'int'>" in str(excinfo.value)
+
+
+def test_user_defined_constructor():
+    e = WithConstructor(num=10, st='abc', x=2)
+    assert e.x == 2
+    assert e.num == 10
+
+
+def test_user_defined_constructor_is_not_bypassed_by_subclass():
+    e = InheritsConstructor(num=10, x=2, z=3)
+    assert e.x == 2
+    assert e.z == 3
+    assert InheritsConstructor.__init__ is WithConstructor.__init__
+
+
+def test_user_defined_constructor_missing_argument_err():
+    with raises(TypeError) as excinfo:
+        WithConstructor(st='abc', x=2)
+    assert "missing a required argument: 'num'" == str(excinfo.value)
+
+
+def test_immutable_structure_reinitialization_err():
+    class Foo(ImmutableStructure):
+        a = Integer
+
+    foo = Foo(a=1)
+    with raises(ValueError) as excinfo:
+        foo.__init__(a=2)
+    assert "Structure is immutable" in str(excinfo.value)
+    assert foo.a == 1
+
+
+def test_custom_setattr_is_respected():
+    calls = []
+
+    class Foo(Structure):
+        a = Integer
+
+        def __setattr__(self, key, value):
+            calls.append(key)
+            super().__setattr__(key, value)
+
+    Foo(a=1)
+    assert calls == ['a']
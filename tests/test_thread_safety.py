@@ -0,0 +1,61 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from typedpy import Structure, Integer, String, Array, Map, AnyOf, OneOf, Field
+
+
+class Doubled(Field):
+    """
+    A field with its own __set__, which uses the name of the field
+    """
+    def __set__(self, instance, value):
+        if not isinstance(value, int):
+            raise TypeError("{}: Expected an int to double".format(self._name))
+        super().__set__(instance, value * 2)
+
+
+class Foo(Structure):
+    _required = []
+    doubles = Array[Doubled]
+    matrix = Array[Array[Integer(maximum=10)]]
+    m = Map[String, Array[Doubled]]
+    any = Array[AnyOf[Integer(maximum=10), String(maxLength=3)]]
+    one = OneOf[Integer(maximum=10), String(maxLength=3)]
+
+
+def validate(i):
+    errors = []
+    ind = i % 7
+    values = list(range(10))
+    bad = values[:ind] + ['x'] + values[ind:]
+    cases = [
+        (lambda: Foo(doubles=bad), "doubles_{}: Expected an int to double".format(ind)),
+        (lambda: Foo(matrix=[values, bad]), "matrix_1_{}: Expected <class 'int'>".format(ind)),
+        (lambda: Foo(m={'a': values, 'b': bad}),
+         "m_value_{}: Expected an int to double".format(ind)),
+        (lambda: Foo(any=values[:ind] + [11] + values[ind:]),
+         "any_{}: Did not match any field option".format(ind)),
+    ]
+    for create, message in cases:
+        try:
+            create()
+            errors.append('no error for: ' + message)
+        except (TypeError, ValueError) as ex:
+            if message not in str(ex):
+                errors.append('expected {}, got {}'.format(message, ex))
+    foo = Foo(doubles=values, matrix=[values], m={'a': values}, any=values + ['abc'], one=i % 10)
+    if foo.doubles != [v * 2 for v in values] or foo.m['a'][ind] != ind * 2:
+        errors.append('wrong values')
+    return errors
+
+
+def test_concurrent_validation_of_the_same_fields():
+    # switch threads often, to make races likely
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(validate, range(2000)))
+    finally:
+        sys.setswitchinterval(interval)
+    assert [errors for errors in results if errors] == []
@@ -1,6 +1,6 @@
 from pytest import raises
 
-from typedpy import Structure, Tuple, Number, String, Integer, Float
+from typedpy import Structure, Tuple, Number, String, Integer, Float, Array
 
 
 class Example(Structure):
@@ -60,3 +60,11 @@ def test_wrong_type_in_items_definition_err():
     with raises(TypeError) as excinfo:
         Tuple(items=[int, String])
     assert "Expected a Field class or instance" in str(excinfo.value)
+
+def test_non_unique_unhashable_items_err():
+    class Foo(Structure):
+        a = Tuple(uniqueItems=True, items=[Array, Array])
+
+    with raises(ValueError) as excinfo:
+        Foo(a=([1, 2], [1.0, 2]))
+    assert "a: Expected unique items" in str(excinfo.value)
@@ -0,0 +1,164 @@
+from pytest import raises
+
+from typedpy import Structure, Array, Map, Set, Tuple, Number, Integer, Float, String, \
+    PositiveInt, PositiveFloat, Positive, Boolean, Field, ImmutableStructure, AnyOf
+
+
+class Even(Field):
+    def __set__(self, instance, value):
+        if value % 2 > 0:
+            raise ValueError('{}: Must be even'.format(self._name))
+        super().__set__(instance, value)
+
+
+class EvenPositiveInt(Integer, Positive, Even):
+    pass
+
+
+class Example(Structure):
+    _required = []
+    ints = Array[Integer(minimum=0, maximum=100)]
+    positives = Array[PositiveInt]
+    floats = Array[PositiveFloat(multiplesOf=0.5)]
+    names = Array[String(minLength=2, pattern='[a-z]+$')]
+    flags = Array[Boolean]
+    nested = Array[Array[Integer]]
+    evens = Array[EvenPositiveInt]
+    mapping = Map[String, Array[Integer]]
+    pairs = Tuple[Integer, Array[String]]
+    numbers = Set[Number(maximum=10)]
+
+
+def test_items_field_name_is_not_modified():
+    items = Example.ints.items
+    Example(ints=[1, 2, 3])
+    assert items._name is None
+
+
+def test_compiled_number_validator_err():
+    with raises(ValueError) as excinfo:
+        Example(ints=[1, 2, 300])
+    assert "ints_2: Expected a maxmimum of 100" == str(excinfo.value)
+
+
+def test_compiled_integer_type_err():
+    with raises(TypeError) as excinfo:
+        Example(ints=[1, 2.5])
+    assert "ints_1: Expected <class 'int'>" == str(excinfo.value)
+
+
+def test_compiled_positive_int_err():
+    with raises(ValueError) as excinfo:
+        Example(positives=[1, 0])
+    assert "positives_1: Must be positive" == str(excinfo.value)
+
+
+def test_compiled_float_multiple_err():
+    with raises(ValueError) as excinfo:
+        Example(floats=[0.5, 1.25])
+    assert "floats_1: Expected a a multiple of 0.5" == str(excinfo.value)
+
+
+def test_compiled_string_err():
+    with raises(ValueError) as excinfo:
+        Example(names=['ab', 'a1'])
+    assert 'names_1: Does not match regular expression: "[a-z]+$"' == str(excinfo.value)
+
+
+def test_compiled_boolean_err():
+    with raises(TypeError) as excinfo:
+        Example(flags=[True, 1])
+    assert "flags_1: Expected <class 'bool'>" == str(excinfo.value)
+
+
+def test_valid_primitive_arrays():
+    e = Example(ints=[0, 100], positives=[3], floats=[1.5], names=['abc'], flags=[False])
+    assert e.ints == [0, 100]
+    assert e.floats == [1.5]
+
+
+def test_compiled_validator_reflects_updated_properties():
+    class Foo(Structure):
+        a = Array[Integer(maximum=10)]
+
+    Foo(a=[8])
+    Foo.a.items.maximum = 5
+    with raises(ValueError) as excinfo:
+        Foo(a=[8])
+    assert "a_0: Expected a maxmimum of 5" == str(excinfo.value)
+
+
+def test_nested_array_element_name_err():
+    with raises(TypeError) as excinfo:
+        Example(nested=[[1, 2], [3, 'x']])
+    assert "nested_1_1: Expected <class 'int'>" == str(excinfo.value)
+
+
+def test_item_with_custom_setter_err():
+    with raises(ValueError) as excinfo:
+        Example(evens=[2, 4, 5])
+    assert "evens_2: Must be even" == str(excinfo.value)
+
+
+def test_item_with_custom_setter_inherited_checks_err():
+    with raises(ValueError) as excinfo:
+        Example(evens=[2, -4])
+    assert "evens_1: Must be positive" == str(excinfo.value)
+
+
+def test_map_with_array_values_err():
+    with raises(TypeError) as excinfo:
+        Example(mapping={'a': [1, 'x']})
+    assert "mapping_value_1: Expected <class 'int'>" == str(excinfo.value)
+
+
+def test_tuple_with_array_element_err():
+    with raises(TypeError) as excinfo:
+        Example(pairs=(1, ['a', 2]))
+    assert "pairs_1_1: Expected a string" == str(excinfo.value)
+
+
+def test_set_item_err():
+    with raises(ValueError) as excinfo:
+        Example(numbers={1, 20})
+    assert "numbers: Expected a maxmimum of 10" == str(excinfo.value)
+
+
+def test_update_of_nested_array_is_validated():
+    e = Example(nested=[[1, 2], [3]])
+    with raises(TypeError) as excinfo:
+        e.nested[1].append('x')
+    assert "nested_1_1: Expected <class 'int'>" == str(excinfo.value)
+    e.nested[1].append(4)
+    assert e.nested == [[1, 2], [3, 4]]
+    e.nested.append([5])
+    with raises(TypeError) as excinfo:
+        e.nested[2].append('x')
+    assert "nested_2_1: Expected <class 'int'>" == str(excinfo.value)
+
+
+def test_update_of_array_in_map_is_validated():
+    e = Example(mapping={'a': [1]})
+    with raises(TypeError):
+        e.mapping['a'].append('x')
+    e.mapping['a'].append(2)
+    assert e.mapping['a'] == [1, 2]
+
+
+def test_update_of_nested_array_in_immutable_structure_err():
+    class Foo(ImmutableStructure):
+        a = Array[Array[Integer]]
+
+    foo = Foo(a=[[1], [2]])
+    with raises(ValueError) as excinfo:
+        foo.a[0].append(3)
+    assert "Structure is immutable" in str(excinfo.value)
+    assert foo.a == [[1], [2]]
+
+
+def test_multifield_option_names_are_not_modified():
+    class Foo(Structure):
+        a = AnyOf[Integer, String]
+
+    Foo(a='abc')
+    assert all(field._name is None for field in Foo.a.get_fields())
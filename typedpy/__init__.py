@@ -3,13 +3,13 @@ A type-safe strictly defined structures, compatible with JSON draft 4
 but offers significantly more functionality.
 """
 from typedpy.structures import (
-    Structure, Field, TypedField, ClassReference, ImmutableStructure
+    Structure, Field, TypedField, ClassReference, ImmutableStructure, ValidationFailure
     )
 from typedpy.fields import (
     Number, Integer, PositiveInt, PositiveFloat, Float, Positive,
     String, SizedString, Sized, Enum, EnumString,
-    AllOf, AnyOf, OneOf, NotField, Boolean, DateString,
-    Array, Set, Map, Tuple, StructureReference,
+    AllOf, AnyOf, OneOf, NotField, Boolean, DateString, DateTimeString, TimestampField,
+    Array, Set, Map, Tuple, StructureReference, DiscriminatedUnion,
     ImmutableField, create_typed_field,
     )
 
@@ -19,5 +19,14 @@ from typedpy.json_schema_mapping import (
     )
 
 from typedpy.serialization import (
-    deserialize_structure, serialize
+    deserialize_structure, serialize, serialize_to_json, deserialize_stream,
+    deserialize_json_array, deserialize_many, serialize_many, RejectedItem
 )
+
+from typedpy.structure_array import StructureArray
+
+try:
+    from typedpy.async_serialization import adeserialize, adeserialize_stream
+except SyntaxError:
+    # asynchronous generators require Python 3.6
+    pass
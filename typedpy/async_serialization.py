@@ -0,0 +1,241 @@
+"""
+Deserialization for asyncio applications. Large content is processed in slices, and the
+control is returned to the event loop between them, so that other tasks are not blocked.
+Requires Python 3.6.
+"""
+import asyncio
+import codecs
+import json
+
+from typedpy.fields import Field, Array, Map, ClassReference, StructureReference, \
+    _ValidatedElements, _ValidatedEntries, _validate_elements, _validate_entries
+from typedpy.serialization import RejectedItem, deserialize_structure, _JsonArrayParser, \
+    _check_error_policy, _rejection_error, _decode, _get_decoder, _AS_IS
+from typedpy.structures import _structure_fields
+
+# the default number of elements of an array or a map that are processed without yielding
+_SLICE_SIZE = 1000
+
+
+async def _adeserialize_elements(items, values, name, slice_size):
+    decoder = _get_decoder(items)
+    validate = items._get_validator()
+    validated = []
+    for start in range(0, len(values), slice_size):
+        elements = values[start:start + slice_size]
+        if decoder is not _AS_IS:
+            elements = [decoder(v, name) for v in elements]
+        validated += _validate_elements(validate, elements, name, start)
+        await asyncio.sleep(0)
+    return _ValidatedElements(items, validated)
+
+
+async def _adeserialize_map(map_field, source_val, name, slice_size):
+    key_field, value_field = map_field.items
+    pairs = list(source_val.items())
+    validated = []
+    for start in range(0, len(pairs), slice_size):
+        entries = [(_decode(key_field, key, name), _decode(value_field, val, name))
+                   for key, val in pairs[start:start + slice_size]]
+        validated += _validate_entries(map_field.items, entries, name).items()
+        await asyncio.sleep(0)
+    return _ValidatedEntries(map_field.items, validated)
+
+
+async def _adeserialize_fields(cls, the_dict, slice_size, name=None):
+    if not isinstance(the_dict, dict):
+        raise TypeError("{}: Expected a dictionary".format(name))
+    fields = _structure_fields(cls)
+    kwargs = {}
+    for key, val in the_dict.items():
+        field = fields.get(key)
+        if isinstance(field, ClassReference) and isinstance(val, dict):
+            val = getattr(field, '_ty')(**await _adeserialize_fields(
+                getattr(field, '_ty'), val, slice_size, key))
+        elif isinstance(field, StructureReference) and isinstance(val, dict):
+            val = await _adeserialize_fields(field._newclass, val, slice_size, key)
+        elif isinstance(field, Array) and isinstance(field.items, Field) and \
+                isinstance(val, list) and len(val) > slice_size:
+            val = await _adeserialize_elements(field.items, val, key, slice_size)
+        elif isinstance(field, Map) and field.items is not None and \
+                isinstance(val, dict) and len(val) > slice_size:
+            val = await _adeserialize_map(field, val, key, slice_size)
+        else:
+            val = _decode(field, val, key)
+        kwargs[key] = val
+    return kwargs
+
+
+async def adeserialize(cls, data, slice_size=_SLICE_SIZE):
+    """
+    Deserialize a JSON-like dict, or JSON text, to an instance of a :class:`Structure`,
+    like :func:`deserialize_structure`. Arrays and maps that are larger than the slice
+    size are processed in slices, and the control is returned to the event loop after
+    every slice.
+
+    Arguments:
+        cls(type):
+            The target class
+        data(dict, str or bytes):
+            the source dict, or its JSON
+        slice_size(int): optional
+            the number of elements that are processed without yielding
+
+    Returns:
+        an instance of the class
+    """
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode('utf-8-sig')
+    if isinstance(data, str):
+        data = json.loads(data)
+    return cls(**await _adeserialize_fields(cls, data, slice_size))
+
+
+async def _read_chunks(source, chunk_size):
+    """
+    :return: an asynchronous generator of the chunks of a source that has an asynchronous
+        read(n), such as asyncio.StreamReader, or that is an asynchronous iterable of chunks
+    """
+    if hasattr(source, 'read'):
+        while True:
+            chunk = await source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        async for chunk in source:
+            yield chunk
+
+
+def _text(chunk):
+    return chunk.decode('utf-8-sig') if isinstance(chunk, (bytes, bytearray)) else chunk
+
+
+async def _iter_lines(chunks, first):
+    """
+    :return: an asynchronous generator of (line number, line) of JSON Lines
+    """
+    separator = b'\n' if isinstance(first, (bytes, bytearray)) else '\n'
+    pending = first
+    line_number = 0
+    while True:
+        lines = pending.split(separator)
+        pending = lines.pop()
+        for line in lines:
+            line_number += 1
+            yield line_number, line
+        try:
+            pending += await chunks.__anext__()
+        except StopAsyncIteration:
+            break
+    if pending:
+        yield line_number + 1, pending
+
+
+def _chunk_decoder(first):
+    """
+    :return: a function that decodes the next chunk to text. A multi-byte character may be
+        split between chunks.
+    """
+    if not isinstance(first, (bytes, bytearray)):
+        return lambda chunk, eof=False: chunk
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    return lambda chunk, eof=False: decoder.decode(chunk, final=eof)
+
+
+def _lstripped(content):
+    """
+    :return: the content without the byte order mark and the whitespace that start it.
+        Bytes that are only a part of a byte order mark are stripped as well.
+    """
+    if isinstance(content, (bytes, bytearray)) and \
+            codecs.BOM_UTF8.startswith(content[:len(codecs.BOM_UTF8)]):
+        content = content[len(codecs.BOM_UTF8):]
+    return content.lstrip()
+
+
+async def _iter_array(chunks, first):
+    """
+    :return: an asynchronous generator of (index, element) of a JSON array
+    """
+    parser = _JsonArrayParser()
+    index = 0
+    decode = _chunk_decoder(first)
+    chunk = first
+    while True:
+        parser.feed(decode(chunk))
+        for element in parser.elements():
+            yield index, element
+            index += 1
+        try:
+            chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            break
+    parser.feed(decode(first[:0], eof=True), eof=True)
+    for element in parser.elements():
+        yield index, element
+        index += 1
+
+
+def adeserialize_stream(cls, source, errors='raise', rejected=None,
+                        chunk_size=65536, slice_size=_SLICE_SIZE):
+    """
+    Deserialize a stream of JSON Lines, or a JSON array, to instances of a
+    :class:`Structure`, as the content arrives. The format is detected by the first
+    character. The control is returned to the event loop after every slice of elements.
+
+    Arguments:
+        cls(type):
+            The target class
+        source:
+            An object with an asynchronous read(n), such as asyncio.StreamReader, or an
+            asynchronous iterable of chunks of bytes or str.
+        errors(str): optional
+            What to do with an element that is not a valid serialization of the class:
+            'raise' (default) raises a TypeError/ValueError that includes its position,
+            'skip' ignores it, and 'collect' adds a :class:`RejectedItem` to `rejected`.
+        rejected(list): optional
+            The list that collects the rejected elements when errors='collect'
+        chunk_size(int): optional
+            The size of a read from the source
+        slice_size(int): optional
+            the number of elements that are processed without yielding
+
+    Returns:
+        an asynchronous generator of instances of the class
+    """
+    _check_error_policy(errors, rejected)
+    return _adeserialize_items(cls, source, errors, rejected, chunk_size, slice_size)
+
+
+async def _adeserialize_items(cls, source, errors, rejected, chunk_size, slice_size):
+    chunks = _read_chunks(source, chunk_size)
+    first = None
+    async for chunk in chunks:
+        first = chunk if first is None else first + chunk
+        if _lstripped(first):
+            break
+    if first is None:
+        return
+    is_array = _lstripped(first)[:1] in (b'[', '[')
+    items = _iter_array(chunks, first) if is_array else _iter_lines(chunks, first)
+    position_name = 'element' if is_array else 'line'
+    count = 0
+    async for position, item in items:
+        try:
+            if not is_array:
+                item = _text(item)
+                if not item.strip():
+                    continue
+                item = json.loads(item)
+            instance = deserialize_structure(cls, item)
+        except (TypeError, ValueError) as ex:
+            if errors == 'raise':
+                raise _rejection_error(position_name, position, ex) from ex
+            if errors == 'collect':
+                rejected.append(RejectedItem(position, item, ex))
+            continue
+        yield instance
+        count += 1
+        if count % slice_size == 0:
+            await asyncio.sleep(0)
@@ -1,12 +1,20 @@
 """
 Definitions of various types of fields. Supports JSON draft4 types.
 """
+import operator
 import re
 from collections import OrderedDict
-from datetime import datetime
-from functools import reduce
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 
-from typedpy.structures import Field, Structure, TypedField, ClassReference
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from typedpy.structures import Field, Structure, TypedField, ClassReference, \
+    ValidationFailure, _plain_setter, _validate_chain, _set_compact_attribute, _item_key, \
+    _checker_from_validator
 
 
 class StructureReference(Field):
@@ -35,11 +43,12 @@ class StructureReference(Field):
         self._newclass = type(classname, (Structure,), kwargs)
         super().__init__(kwargs)
 
-    def __set__(self, instance, value):
+    def _validate(self, value, name):
+        if isinstance(value, self._newclass):
+            return super()._validate(value, name)
         if not isinstance(value, dict):
-            raise TypeError("{}: Expected a dictionary".format(self._name))
-        newval = self._newclass(**value)
-        super().__set__(instance, newval)
+            raise TypeError("{}: Expected a dictionary".format(name))
+        return super()._validate(self._newclass(**value), name)
 
     def __str__(self):
         props = []
@@ -51,10 +60,193 @@ class StructureReference(Field):
         return '<Structure{}>'.format(propst)
 
 
+class DiscriminatedUnion(Field):
+    """
+    A :class:`Structure` of one of several classes, where the class is selected by the value
+    of a discriminator property. Accepts an instance of one of the classes, or a dict that
+    contains the discriminator. The class is found with a single lookup, rather than by
+    trying every option, as in :class:`OneOf`.
+
+    The discriminator is passed to the selected class only if it defines it as a field.
+    Serialization adds it back.
+
+    Arguments:
+        discriminator(str):
+            the name of the property that selects the class
+        mapping(dict):
+            a mapping from values of the discriminator to :class:`Structure` classes
+
+    Example:
+
+    .. code-block:: python
+
+        event = DiscriminatedUnion(discriminator='type',
+                                   mapping={'click': Click, 'view': View})
+
+        # An instance of Click
+        Example(event={'type': 'click', 'x': 5, 'y': 10})
+
+    """
+
+    def __init__(self, *args, discriminator, mapping, **kwargs):
+        if not isinstance(discriminator, str):
+            raise TypeError("discriminator is expected to be a string")
+        if not isinstance(mapping, dict) or not mapping:
+            raise TypeError("mapping is expected to be a non-empty dict")
+        for cls in mapping.values():
+            if not isinstance(cls, type) or not issubclass(cls, Structure):
+                raise TypeError("Expected a Structure class in mapping")
+        self.discriminator = discriminator
+        self.mapping = mapping
+        self._tag_by_class = dict((cls, tag) for tag, cls in mapping.items())
+        super().__init__(*args, **kwargs)
+
+    def _lookup(self, tag):
+        try:
+            return self.mapping.get(tag)
+        except TypeError:
+            # unhashable
+            return None
+
+    def _get_class(self, value, name):
+        """
+        :param value: a dict with the discriminator
+        :return: a tuple of the selected class, and the dict to create it from
+        """
+        discriminator = self.discriminator
+        if discriminator not in value:
+            raise ValueError("{}: Missing discriminator '{}'".format(name, discriminator))
+        tag = value[discriminator]
+        cls = self._lookup(tag)
+        if cls is None:
+            raise ValueError("{}: Unknown value of {}: {}".format(name, discriminator, tag))
+        if not isinstance(getattr(cls, discriminator, None), Field):
+            value = dict(value)
+            del value[discriminator]
+        return cls, value
+
+    def _get_tag(self, value):
+        """
+        :param value: an instance of one of the classes
+        :return: the value of the discriminator for it
+        """
+        tag = self._tag_by_class.get(value.__class__)
+        if tag is None:
+            for cls, cls_tag in self._tag_by_class.items():
+                if isinstance(value, cls):
+                    return cls_tag
+        return tag
+
+    def _validate(self, value, name):
+        if isinstance(value, dict):
+            cls, content = self._get_class(value, name)
+            value = cls(**content)
+        elif not isinstance(value, Structure) or self._get_tag(value) is None:
+            raise TypeError("{}: Expected a dict or one of {}".format(
+                name, ', '.join(sorted(cls.__name__ for cls in self._tag_by_class))))
+        else:
+            tag = value.__dict__.get(self.discriminator)
+            if tag is not None and not isinstance(value, self._lookup(tag) or ()):
+                raise ValueError("{}: Unknown value of {}: {}".format(
+                    name, self.discriminator, tag))
+        return super()._validate(value, name)
+
+    def __str__(self):
+        mapping = ', '.join(["{}: {}".format(tag, cls.__name__)
+                             for tag, cls in self.mapping.items()])
+        return "<DiscriminatedUnion. Properties: discriminator = '{}', mapping = {{{}}}>".format(
+            self.discriminator, mapping)
+
+
 class ImmutableField(Field):
     _immutable = True
 
 
+def _is_number(val):
+    return isinstance(val, (float, int))
+
+
+def _make_validator(checks, namespace, prelude=()):
+    """
+    Generate a function validate(value, name) that raises the error of the first check that
+    fails, and otherwise returns the value.
+
+    :param checks: a list of tuples (condition for failure, error type, message template,
+     names of the arguments of the message other than the name of the field)
+    :param prelude: statements that normalize the value before the checks
+    """
+    lines = ['    ' + statement for statement in prelude]
+    for condition, error, template, args in checks:
+        lines += ['    if {}:'.format(condition),
+                  '        raise {}({!r}.format(name{}))'.format(
+                      error, template, ''.join(', ' + arg for arg in args))]
+    source = 'def validate(value, name):\n{}\n    return value\n'.format('\n'.join(lines))
+    namespace = dict(namespace)
+    exec(source, namespace)  # pylint: disable=W0122
+    return namespace['validate']
+
+
+def _make_checker(checks, namespace, prelude=()):
+    """
+    Generate a function check(value, name) from the same checks as :func:`_make_validator`,
+    which returns a :class:`ValidationFailure` instead of raising an exception.
+    """
+    lines = ['    ' + statement for statement in prelude]
+    for condition, error, template, args in checks:
+        lines += ['    if {}:'.format(condition),
+                  '        return _failure({}, {!r}, name{})'.format(
+                      error, template, ''.join(', ' + arg for arg in args))]
+    source = 'def check(value, name):\n{}\n    return None\n'.format('\n'.join(lines))
+    namespace = dict(namespace, _failure=ValidationFailure)
+    exec(source, namespace)  # pylint: disable=W0122
+    return namespace['check']
+
+
+def _number_checks(field, the_type, positive):
+    """
+    The checks for a numerical field, that are relevant to its properties,
+    in the same order as the _validate chain of the field.
+
+    :return: a tuple of the checks, the namespace they use, and the statements that precede
+     them
+    """
+    namespace = {
+        'the_type': the_type,
+        'multiple': field.multiplesOf,
+        'minimum': field.minimum,
+        'maximum': field.maximum,
+        'numpy_number': numpy.number if numpy is not None else None,
+    }
+    # NumPy scalars are converted to the equivalent Python numbers
+    prelude = [] if numpy is None else \
+        ['if isinstance(value, numpy_number): value = value.item()']
+    checks = []
+    if the_type is not None:
+        checks.append(('not isinstance(value, the_type)', 'TypeError',
+                       '{}: Expected {}', ['the_type']))
+    if positive:
+        checks.append(('value <= 0', 'ValueError', '{}: Must be positive', []))
+    if the_type is None or not issubclass(the_type, (float, int)):
+        checks.append(('not isinstance(value, float) and not isinstance(value, int)',
+                       'TypeError', '{}: Expected a number', []))
+    if isinstance(field.multiplesOf, float):
+        checks.append(('int(value / multiple) != value / multiple', 'ValueError',
+                       '{}: Expected a a multiple of {}', ['multiple']))
+    elif isinstance(field.multiplesOf, int):
+        checks.append(('value % multiple', 'ValueError',
+                       '{}: Expected a a multiple of {}', ['multiple']))
+    if _is_number(field.minimum):
+        checks.append(('minimum > value', 'ValueError',
+                       '{}: Expected a minimum of {}', ['minimum']))
+    if _is_number(field.maximum):
+        if field.exclusiveMaximum:
+            checks.append(('maximum == value', 'ValueError',
+                           '{}: Expected a maxmimum of less than {}', ['maximum']))
+        checks.append(('maximum < value', 'ValueError',
+                       '{}: Expected a maxmimum of {}', ['maximum']))
+    return checks, namespace, prelude
+
+
 class Number(Field):
     """
     Base class for numerical fields. Based on Json schema draft4.
@@ -80,29 +272,49 @@ class Number(Field):
         self.exclusiveMaximum = exclusiveMaximum
         super().__init__(*args, **kwargs)
 
-    def __set__(self, instance, value):
-        def is_number(val):
-            return isinstance(val, (float, int))
-
+    def _validate(self, value, name):
         if not isinstance(value, float) and not isinstance(value, int):
-            raise TypeError("{}: Expected a number".format(self._name))
+            raise TypeError("{}: Expected a number".format(name))
         if isinstance(self.multiplesOf, float) and \
                         int(value / self.multiplesOf) != value / self.multiplesOf or \
                         isinstance(self.multiplesOf, int) and value % self.multiplesOf:
             raise ValueError("{}: Expected a a multiple of {}".format(
-                self._name, self.multiplesOf))
-        if (is_number(self.minimum)) and self.minimum > value:
+                name, self.multiplesOf))
+        if (_is_number(self.minimum)) and self.minimum > value:
             raise ValueError("{}: Expected a minimum of {}".format(
-                self._name, self.minimum))
-        if is_number(self.maximum):
+                name, self.minimum))
+        if _is_number(self.maximum):
             if self.exclusiveMaximum and self.maximum == value:
                 raise ValueError("{}: Expected a maxmimum of less than {}".format(
-                    self._name, self.maximum))
+                    name, self.maximum))
             else:
                 if self.maximum < value:
                     raise ValueError("{}: Expected a maxmimum of {}".format(
-                        self._name, self.maximum))
-        super().__set__(instance, value)
+                        name, self.maximum))
+        return super()._validate(value, name)
+
+    def _checks(self):
+        """
+        :return: the checks and namespace to generate the validator and checker from,
+         or None if the validation chain of the class is not known
+        """
+        chain = _validate_chain(self.__class__)
+        if chain not in _COMPILABLE_NUMBER_CHAINS:
+            return None
+        the_type = self._ty if TypedField in chain else None
+        return _number_checks(self, the_type, Positive in chain)
+
+    def _compile_validator(self):
+        checks = self._checks()
+        if checks is None:
+            return super()._compile_validator()
+        return _make_validator(*checks)
+
+    def _compile_checker(self):
+        checks = self._checks()
+        if checks is None:
+            return super()._compile_checker()
+        return _make_checker(*checks)
 
 
 class Integer(TypedField, Number):
@@ -137,20 +349,57 @@ class String(TypedField):
             self._compiled_pattern = re.compile(self.pattern)
         super().__init__(*args, **kwargs)
 
-    def __set__(self, instance, value):
+    def _validate(self, value, name):
         if not isinstance(value, str):
-            raise TypeError("{}: Expected a string".format(self._name))
+            raise TypeError("{}: Expected a string".format(name))
         if self.maxLength is not None and len(value) > self.maxLength:
             raise ValueError("{}: Expected a maxmimum length of {}".format(
-                self._name, self.maxLength))
+                name, self.maxLength))
         if self.minLength is not None and len(value) < self.minLength:
             raise ValueError("{}: Expected a minimum length of {}".format(
-                self._name, self.minLength))
+                name, self.minLength))
         if self.pattern is not None and not self._compiled_pattern.match(value):
             raise ValueError('{}: Does not match regular expression: "{}"'.format(
-                self._name, self.pattern))
+                name, self.pattern))
 
-        super().__set__(instance, value)
+        return super()._validate(value, name)
+
+    def _checks(self):
+        """
+        :return: the checks and namespace to generate the validator and checker from,
+         or None if the validation chain of the class is not known
+        """
+        if _validate_chain(self.__class__) != (String, TypedField, Field):
+            return None
+        namespace = {
+            'max_length': self.maxLength,
+            'min_length': self.minLength,
+            'pattern': self.pattern,
+            'match': self._compiled_pattern.match if self.pattern is not None else None,
+        }
+        checks = [('not isinstance(value, str)', 'TypeError', '{}: Expected a string', [])]
+        if self.maxLength is not None:
+            checks.append(('len(value) > max_length', 'ValueError',
+                           '{}: Expected a maxmimum length of {}', ['max_length']))
+        if self.minLength is not None:
+            checks.append(('len(value) < min_length', 'ValueError',
+                           '{}: Expected a minimum length of {}', ['min_length']))
+        if self.pattern is not None:
+            checks.append(('not match(value)', 'ValueError',
+                           '{}: Does not match regular expression: "{}"', ['pattern']))
+        return checks, namespace
+
+    def _compile_validator(self):
+        checks = self._checks()
+        if checks is None:
+            return super()._compile_validator()
+        return _make_validator(*checks)
+
+    def _compile_checker(self):
+        checks = self._checks()
+        if checks is None:
+            return super()._compile_checker()
+        return _make_checker(*checks)
 
 
 class Float(TypedField, Number):
@@ -171,10 +420,10 @@ class Positive(Number):
     """
     An extension of :class:`Number`. Requires the number to be positive
     """
-    def __set__(self, instance, value):
+    def _validate(self, value, name):
         if value <= 0:
-            raise ValueError('{}: Must be positive'.format(self._name))
-        super().__set__(instance, value)
+            raise ValueError('{}: Must be positive'.format(name))
+        return super()._validate(value, name)
 
 
 class PositiveFloat(Float, Positive):
@@ -191,50 +440,299 @@ class PositiveInt(Integer, Positive):
     pass
 
 
+# the validation chains of numerical fields, for which a specialized validator is generated
+_COMPILABLE_NUMBER_CHAINS = {
+    (Number, Field),
+    (TypedField, Number, Field),
+    (Positive, Number, Field),
+    (TypedField, Positive, Number, Field),
+}
+
+
+def _check_owner_mutable(owner):
+    """
+    Verify that the structure that (directly, or through other collections) owns the content
+    of a collection, is not immutable.
+    """
+    while isinstance(owner, (_ListStruct, _DictStruct, _SetStruct)):
+        owner = owner._instance
+    if getattr(owner, '_immutable', False):
+        raise ValueError("Structure is immutable")
+
+
+def _adopt(owner, values, start=0):
+    """
+    Link collections that are elements of another collection to their owner, and name them
+    after their position in it, as in the error messages of its elements, e.g. "name_3", or
+    "name_value" in a map.
+
+    :param start: the index of the first value in a list
+    """
+    for ind, value in enumerate(values, start):
+        if isinstance(value, (_ListStruct, _DictStruct, _SetStruct)) and value._instance is None:
+            value._instance = owner
+            if isinstance(owner, dict):
+                value._name = '{}_value'.format(owner._name)
+            else:
+                value._name = '{}_{}'.format(owner._name, ind)
+
+
+def _is_incremental(field, instance):
+    """
+    Can an update of the content of a collection field be validated incrementally?
+    Not if the field, or the structure, customize the assignment.
+    """
+    if not getattr(type(field).__set__, 'plain_setter', False):
+        return False
+    return not isinstance(instance, Structure) or \
+        type(instance).__setattr__ in (Structure.__setattr__, _set_compact_attribute)
+
+
+def _check_field_mutable(field, instance, name):
+    if isinstance(instance, Structure) and getattr(field, '_immutable', False):
+        raise ValueError("{}: Field is immutable".format(name))
+
+
+def _stable_key(value):
+    """
+    :return: the value, as its own key in a :class:`_UniqueIndex`
+    :raises TypeError: if the value may change in place, e.g. a list, a dict or a Structure,
+     so that a key of its current content would go stale
+    """
+    if isinstance(value, Structure):
+        raise TypeError("cannot key a Structure")
+    hash(value)
+    return value
+
+
+class _UniqueIndex(dict):
+    """
+    The number of occurrences of every value in a collection.
+    Allows checking uniqueItems for an update of the collection without going over
+    all the values. Only values that cannot change in place are indexed.
+    """
+
+    def __init__(self, values):
+        super().__init__()
+        for value in values:
+            key = _stable_key(value)
+            self[key] = self.get(key, 0) + 1
+
+    def check_replace(self, removed, added):
+        """
+        Verify that the values remain unique after replacing the removed values with the added
+        values.
+
+        :return: the change in the number of occurrences of every affected key,
+         to be applied with :meth:`apply` once the collection is updated
+        :raises TypeError: if one of the values may change in place
+        :raises ValueError: if the values would not be unique
+        """
+        delta = {}
+        for value in removed:
+            key = _stable_key(value)
+            delta[key] = delta.get(key, 0) - 1
+        for value in added:
+            key = _stable_key(value)
+            if self.get(key, 0) + delta.get(key, 0) > 0:
+                raise ValueError("duplicate value")
+            delta[key] = delta.get(key, 0) + 1
+        return delta
+
+    def apply(self, delta):
+        for key, change in delta.items():
+            count = self.get(key, 0) + change
+            if count:
+                self[key] = count
+            else:
+                self.pop(key, None)
+
+
 class _ListStruct(list):
     """
     This is a useful wrapper for the content of list in an Array field.
     It ensures that an update of the form:
      mystruct.my_array[i] = new_val
     Will not bypass the validation of the Array.
+
+    An update only validates the new elements, and the constraints on the whole array
+    (size, unique items), so that growing an array element by element is not quadratic.
+    If the update fails, the content is unchanged.
     """
 
-    def __init__(self, array, struct_instance, mylist):
+    def __init__(self, array, struct_instance, mylist, name=None):
         self._array = array
         self._instance = struct_instance
+        self._name = getattr(array, '_name', None) if name is None else name
+        self._unique_index = None
         super().__init__(mylist)
 
+    def __reduce_ex__(self, protocol):
+        # a copy is detached from the structure, so it is a plain list
+        return list, (list(self),)
+
+    def _update(self, updated):
+        name = getattr(self._array, '_name', None)
+        if isinstance(self._instance, Structure):
+            setattr(self._instance, name, updated)
+        else:
+            # an element of another collection
+            _check_owner_mutable(self._instance)
+            validated = self._array._get_compiled()(updated, self._name)
+            super().__setitem__(slice(None), validated)
+            self._unique_index = None
+            _adopt(self, self)
+
+    def _replace(self, start, stop, values):
+        """
+        Replace self[start:stop] with the values, validating only the new values
+        """
+        array = self._array
+        items = array.items
+        positional = items if isinstance(items, list) else []
+        if not _is_incremental(array, self._instance) or \
+                (start < len(positional) and stop - start != len(values)):
+            copied = self.copy()
+            copied[start:stop] = values
+            return self._update(copied)
+
+        _check_owner_mutable(self._instance)
+        name = self._name
+        array._validate_length(len(self) - (stop - start) + len(values), name)
+        if isinstance(items, Field):
+            values = _validate_elements(items._get_validator(), values, name, start)
+        elif start < len(positional):
+            values = list(values)
+            fields = positional[start:start + len(values)]
+            values[:len(fields)] = _validate_positional(fields, values, name, start)
+        if array.uniqueItems:
+            delta = self._check_unique(self[start:stop], values, start, stop)
+        _check_field_mutable(array, self._instance, name)
+
+        super().__setitem__(slice(start, stop), values)
+        if array.uniqueItems:
+            if delta is None:
+                self._unique_index = None
+            else:
+                self._unique_index.apply(delta)
+        _adopt(self, values, start)
+
+    def _check_unique(self, removed, added, start, stop):
+        """
+        :return: the change to apply to the unique index, or None if the index cannot be used
+        """
+        index = self._unique_index
+        try:
+            if index is None:
+                index = self._unique_index = _UniqueIndex(self)
+            return index.check_replace(removed, added)
+        except TypeError:
+            # some value may change in place, so the whole content is checked
+            self._unique_index = None
+            if _has_duplicates(self[:start] + list(added) + self[stop:]):
+                raise ValueError("{}: Expected unique items".format(self._name))
+            return None
+        except ValueError:
+            raise ValueError("{}: Expected unique items".format(self._name))
+
+    def _position(self, index, error):
+        length = len(self)
+        ind = operator.index(index)
+        if ind < 0:
+            ind += length
+        if not 0 <= ind < length:
+            raise IndexError(error)
+        return ind
+
+    def _slice_bounds(self, key):
+        """
+        :return: start and stop of a slice with step 1, or None
+        """
+        start, stop, step = key.indices(len(self))
+        if step != 1:
+            return None
+        return start, max(start, stop)
+
     def __setitem__(self, key, value):
-        copied = self.copy()
-        copied.__setitem__(key, value)
-        setattr(self._instance, getattr(self._array, '_name', None), copied)
+        if isinstance(key, slice):
+            bounds = self._slice_bounds(key)
+            if bounds is None:
+                copied = self.copy()
+                copied.__setitem__(key, value)
+                return self._update(copied)
+            return self._replace(bounds[0], bounds[1], list(value))
+        ind = self._position(key, 'list assignment index out of range')
+        self._replace(ind, ind + 1, [value])
+
+    def __delitem__(self, key):
+        if isinstance(key, slice):
+            bounds = self._slice_bounds(key)
+            if bounds is None:
+                copied = self.copy()
+                copied.__delitem__(key)
+                return self._update(copied)
+            return self._replace(bounds[0], bounds[1], [])
+        ind = self._position(key, 'list assignment index out of range')
+        self._replace(ind, ind + 1, [])
 
     def append(self, value):
-        copied = self.copy()
-        copied.append(value)
-        setattr(self._instance, getattr(self._array, '_name', None), copied)
+        self._replace(len(self), len(self), [value])
 
     def extend(self, value):
-        copied = self.copy()
-        copied.extend(value)
-        setattr(self._instance, getattr(self._array, '_name', None), copied)
+        self._replace(len(self), len(self), list(value))
+
+    def __iadd__(self, value):
+        self.extend(value)
+        return self
+
+    def __imul__(self, value):
+        copies = operator.index(value)
+        if copies <= 0:
+            self.clear()
+        else:
+            self.extend(self * (copies - 1))
+        return self
 
     def insert(self, index: int, value):
-        copied = self.copy()
-        copied.insert(index, value)
-        setattr(self._instance, getattr(self._array, '_name', None), copied)
+        ind = operator.index(index)
+        length = len(self)
+        ind = min(max(ind + length if ind < 0 else ind, 0), length)
+        self._replace(ind, ind, [value])
 
     def remove(self, ind):
-        copied = self.copy()
-        copied.remove(ind)
-        setattr(self._instance, getattr(self._array, '_name', None), copied)
+        for pos, val in enumerate(self):
+            if val is ind or val == ind:
+                return self._replace(pos, pos + 1, [])
+        raise ValueError('list.remove(x): x not in list')
 
     def pop(self, index: int = -1):
-        copied = self.copy()
-        res = copied.pop(index)
-        setattr(self._instance, getattr(self._array, '_name', None), copied)
+        if not self:
+            raise IndexError('pop from empty list')
+        ind = self._position(index, 'pop index out of range')
+        res = self[ind]
+        self._replace(ind, ind + 1, [])
         return res
 
+    def clear(self):
+        self._replace(0, len(self), [])
+
+    def _reorder(self, reorder, *args, **kwargs):
+        if isinstance(self._array.items, list) or \
+                not _is_incremental(self._array, self._instance):
+            # reordering may move an element to a position with a different field
+            copied = self.copy()
+            reorder(copied, *args, **kwargs)
+            return self._update(copied)
+        _check_owner_mutable(self._instance)
+        _check_field_mutable(self._array, self._instance, self._name)
+        reorder(self, *args, **kwargs)
+
+    def sort(self, *args, **kwargs):
+        self._reorder(list.sort, *args, **kwargs)
+
+    def reverse(self):
+        self._reorder(list.reverse)
+
 
 class _DictStruct(dict):
     """
@@ -244,29 +742,366 @@ class _DictStruct(dict):
      mystruct.my_map.update(some_dict)
 
     ...will not bypass the validation of the Map.
+
+    An update only validates the new keys and values, and the size of the map.
+    If the update fails, the content is unchanged.
     """
 
-    def __init__(self, the_map, struct_instance, mydict):
+    def __init__(self, the_map, struct_instance, mydict, name=None):
         self._map = the_map
         self._instance = struct_instance
+        self._name = getattr(the_map, '_name', None) if name is None else name
         super().__init__(mydict)
 
+    def __reduce_ex__(self, protocol):
+        # a copy is detached from the structure, so it is a plain dict
+        return dict, (dict(self),)
+
+    def _update(self, updated):
+        name = getattr(self._map, '_name', None)
+        if isinstance(self._instance, Structure):
+            setattr(self._instance, name, updated)
+        else:
+            # an element of another collection
+            _check_owner_mutable(self._instance)
+            validated = self._map._get_compiled()(updated, self._name)
+            super().clear()
+            super().update(validated)
+            _adopt(self, self.values())
+
+    def _check_update(self, new_length):
+        _check_owner_mutable(self._instance)
+        self._map._validate_length(new_length, self._name)
+
+    def _put(self, pairs):
+        """
+        Validate only the given items, and add them to the content
+        """
+        if not _is_incremental(self._map, self._instance):
+            copied = self.copy()
+            copied.update(pairs)
+            return self._update(copied)
+        items = self._map.items
+        if items is not None:
+            validate_key = items[0]._get_validator()
+            validate_value = items[1]._get_validator()
+            key_name, value_name = '{}_key'.format(self._name), '{}_value'.format(self._name)
+            pairs = OrderedDict([(validate_key(key, key_name), validate_value(val, value_name))
+                                 for key, val in pairs.items()])
+        self._check_update(len(self) + len([key for key in pairs if key not in self]))
+        _check_field_mutable(self._map, self._instance, self._name)
+        super().update(pairs)
+        _adopt(self, pairs.values())
+
+    def _discard(self, keys):
+        """
+        Remove the given existing keys
+        """
+        if not _is_incremental(self._map, self._instance):
+            copied = self.copy()
+            for key in keys:
+                del copied[key]
+            return self._update(copied)
+        self._check_update(len(self) - len(keys))
+        _check_field_mutable(self._map, self._instance, self._name)
+        for key in keys:
+            super().__delitem__(key)
+
     def __setitem__(self, key, value):
-        copied = self.copy()
-        copied.__setitem__(key, value)
-        setattr(self._instance, getattr(self._map, '_name', None), copied)
+        self._put({key: value})
 
     def __delitem__(self, key):
-        copied = self.copy()
-        del copied[key]
-        setattr(self._instance, getattr(self._map, '_name', None), copied)
+        if key not in self:
+            raise KeyError(key)
+        self._discard([key])
 
     def update(self, *args, **kwargs):
-        copied = self.copy()
-        res = copied.update(*args, **kwargs)
-        setattr(self._instance, getattr(self._map, '_name', None), copied)
+        self._put(OrderedDict(*args, **kwargs))
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        res = self[key]
+        self._discard([key])
         return res
 
+    def popitem(self):
+        if not self:
+            raise KeyError('popitem(): dictionary is empty')
+        key, value = super().popitem()
+        # put it back, as the last item, until the removal is validated
+        super().__setitem__(key, value)
+        self._discard([key])
+        return key, value
+
+    def clear(self):
+        self._discard(list(self))
+
+
+class _SetStruct(set):
+    """
+    This is a useful wrapper for the content of set in a Set field.
+    It ensures that an update of the form:
+     mystruct.my_set.add(val)
+    Will not bypass the validation of the Set.
+
+    An update only validates the new elements, and the size of the set.
+    If the update fails, the content is unchanged.
+    """
+
+    def __init__(self, the_set, struct_instance, myset, name=None):
+        self._set = the_set
+        self._instance = struct_instance
+        self._name = getattr(the_set, '_name', None) if name is None else name
+        super().__init__(myset)
+
+    def __reduce_ex__(self, protocol):
+        # a copy is detached from the structure, so it is a plain set
+        return set, (set(self),)
+
+    def __repr__(self):
+        return repr(set(self)) if self else 'set()'
+
+    def _update(self, updated):
+        name = getattr(self._set, '_name', None)
+        if isinstance(self._instance, Structure):
+            setattr(self._instance, name, updated)
+        else:
+            # an element of another collection
+            _check_owner_mutable(self._instance)
+            validated = self._set._get_compiled()(updated, self._name)
+            super().clear()
+            super().update(validated)
+
+    def _change(self, added=(), removed=()):
+        """
+        Remove the given existing elements and add the given elements, validating only
+        the added ones
+        """
+        the_set = self._set
+        if not _is_incremental(the_set, self._instance):
+            copied = set(self)
+            copied.difference_update(removed)
+            copied.update(added)
+            return self._update(copied)
+        if the_set.items is not None:
+            validate = the_set.items._get_validator()
+            added = [validate(val, self._name) for val in added]
+        added = set(added)
+        removed = set(removed)
+        new_length = len(self) - len(removed) + \
+            len([val for val in added if val not in self or val in removed])
+        _check_owner_mutable(self._instance)
+        the_set._validate_length(new_length, self._name)
+        _check_field_mutable(the_set, self._instance, self._name)
+        super().difference_update(removed)
+        super().update(added)
+
+    def add(self, value):
+        self._change(added=[value])
+
+    def update(self, *others):
+        self._change(added=[val for other in others for val in other])
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def discard(self, value):
+        if value in self:
+            self._change(removed=[value])
+
+    def remove(self, value):
+        if value not in self:
+            raise KeyError(value)
+        self._change(removed=[value])
+
+    def pop(self):
+        if not self:
+            raise KeyError('pop from an empty set')
+        value = next(iter(self))
+        self._change(removed=[value])
+        return value
+
+    def clear(self):
+        self._change(removed=list(self))
+
+    def difference_update(self, *others):
+        self._change(removed=[val for other in others for val in other if val in self])
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def intersection_update(self, *others):
+        kept = set(self).intersection(*others)
+        self._change(removed=[val for val in self if val not in kept])
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def symmetric_difference_update(self, other):
+        other = set(other)
+        self._change(added=[val for val in other if val not in self],
+                     removed=[val for val in other if val in self])
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+
+
+def _has_duplicates(values):
+    """
+    Check whether the sequence has two equal values, in linear time for values that can be keyed.
+    Values that cannot be keyed are compared by equality to the preceding values,
+    which is what the check used to do for all values.
+    """
+    seen = set()
+    unkeyed = []
+    for ind, value in enumerate(values):
+        try:
+            key = _item_key(value)
+        except TypeError:
+            if value in values[:ind]:
+                return True
+            unkeyed.append(value)
+            continue
+        if key in seen or (unkeyed and value in unkeyed):
+            return True
+        seen.add(key)
+    return False
+
+
+def _is_ndarray(value):
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def _vectorized_kinds(items):
+    """
+    :return: the kinds of the dtypes of NumPy arrays that can be validated with vectorized
+     operations, for the items field of an :class:`Array`
+    """
+    if items is None:
+        return 'biuf'
+    if not isinstance(items, Number) or \
+            not getattr(type(items).__set__, 'plain_setter', False) or \
+            _validate_chain(items.__class__) not in _COMPILABLE_NUMBER_CHAINS:
+        return ''
+    the_type = items._ty if isinstance(items, TypedField) else None
+    return {None: 'iuf', int: 'iu', float: 'f'}.get(the_type, '')
+
+
+def _invalid_numbers(field, values):
+    """
+    :return: a boolean NumPy array that marks the values that fail the checks of a numerical
+     field, computed with vectorized operations
+    """
+    if Positive in _validate_chain(field.__class__):
+        invalid = values <= 0
+    else:
+        invalid = numpy.zeros(values.shape, dtype=bool)
+    multiple = field.multiplesOf
+    if isinstance(multiple, float):
+        quotients = values / multiple
+        invalid |= numpy.trunc(quotients) != quotients
+    elif isinstance(multiple, int):
+        invalid |= values % multiple != 0
+    if _is_number(field.minimum):
+        invalid |= values < field.minimum
+    if _is_number(field.maximum):
+        invalid |= values >= field.maximum if field.exclusiveMaximum else values > field.maximum
+    return invalid
+
+
+def _has_duplicate_numbers(values):
+    """
+    Check whether a NumPy array of numbers has two equal values, by comparing its sorted values
+    to their neighbours
+    """
+    ordered = numpy.sort(values)
+    return bool((ordered[1:] == ordered[:-1]).any())
+
+
+class _ValidatedElements(list):
+    """
+    Elements of an array that were already validated by the items field of the
+    :class:`Array`, e.g. in slices by an asynchronous deserialization, so that the array
+    does not validate them again.
+    """
+    def __init__(self, items, elements):
+        self.items = items
+        super().__init__(elements)
+
+
+class _ValidatedEntries(OrderedDict):
+    """
+    Entries of a map that were already validated by the items fields of the :class:`Map`,
+    e.g. in slices by an asynchronous deserialization, so that the map does not validate
+    them again.
+    """
+    def __init__(self, items, entries):
+        self.items = items
+        super().__init__(entries)
+
+
+def _validate_elements(validate, values, name, start=0):
+    """
+    Validate all the values using the same validator. The name of an element,
+    e.g. "name_3", is only formatted in case of an error, when the validation is repeated
+    in order to report the error.
+
+    :param start: the index of the first value in the collection
+    :return: a list of the normalized values
+    """
+    try:
+        return [validate(val, name) for val in values]
+    except (TypeError, ValueError) as ex:
+        error = ex
+    for ind, val in enumerate(values, start):
+        validate(val, "{}_{}".format(name, ind))
+    raise error
+
+
+def _validate_entries(items, entries, name):
+    """
+    Validate the keys and the values of the entries of a map, using the items fields of
+    the :class:`Map`
+
+    :return: an OrderedDict of the normalized keys and values
+    """
+    validate_key = items[0]._get_validator()
+    validate_value = items[1]._get_validator()
+    key_name, value_name = '{}_key'.format(name), '{}_value'.format(name)
+    res = OrderedDict()
+    for key, val in entries:
+        res[validate_key(key, key_name)] = validate_value(val, value_name)
+    return res
+
+
+def _validate_positional(fields, values, name, start=0):
+    """
+    Validate each of the values using the field in the corresponding position.
+    Element names are only formatted in case of an error.
+
+    :param start: the index of the first value in the collection
+    :return: a list of the normalized values
+    """
+    try:
+        return [field._get_validator()(val, name) for field, val in zip(fields, values)]
+    except (TypeError, ValueError) as ex:
+        error = ex
+    for ind, (field, val) in enumerate(zip(fields, values), start):
+        field._get_validator()(val, "{}_{}".format(name, ind))
+    raise error
+
 
 class _CollectionMeta(type):
     def __getitem__(cls, item):
@@ -316,17 +1151,27 @@ class SizedCollection(object):
         super().__init__(*args, **kwargs)
 
     def validate_size(self, items, name):
-        if self.minItems is not None and len(items) < self.minItems:
-            raise ValueError("{}: Expected length of at least {}".format(
-                name, self.minItems))
-        if self.maxItems is not None and len(items) > self.maxItems:
-            raise ValueError("{}: Expected length of at most {}".format(
-                name, self.maxItems))
+        self._validate_length(len(items), name)
+
+    def _validate_length(self, length, name):
+        failure = self._check_length(length, name)
+        if failure is not None:
+            raise failure.exception()
+
+    def _check_length(self, length, name):
+        if self.minItems is not None and length < self.minItems:
+            return ValidationFailure(
+                ValueError, "{}: Expected length of at least {}", name, self.minItems)
+        if self.maxItems is not None and length > self.maxItems:
+            return ValidationFailure(
+                ValueError, "{}: Expected length of at most {}", name, self.maxItems)
+        return None
 
 
 class Set(SizedCollection, TypedField, metaclass=_CollectionMeta):
     """
-    A set collection. Accepts input of type `set`
+    A set collection. Accepts input of type `set` or `frozenset`. A `frozenset` is
+    kept as is, so the content cannot be updated in place.
 
     Arguments:
         minItems(int): optional
@@ -363,19 +1208,36 @@ class Set(SizedCollection, TypedField, metaclass=_CollectionMeta):
                 getattr(self.items, '_ty')))
         super().__init__(*args, **kwargs)
 
-    def __set__(self, instance, value):
+    def _validate(self, value, name):
+        if isinstance(value, frozenset):
+            self.validate_size(value, name)
+            if self.items is not None:
+                validate = self.items._get_validator()
+                validated = [validate(val, name) for val in value]
+                if any(new is not val for new, val in zip(validated, value)):
+                    value = frozenset(validated)
+            return value
         if not isinstance(value, set):
-            raise TypeError("%s: Expected %s" % (self._name, set))
-        self.validate_size(value, self._name)
+            raise TypeError("%s: Expected %s" % (name, set))
+        self.validate_size(value, name)
         if self.items is not None:
-            temp_st = Structure()
-            setattr(self.items, '_name', self._name)
-            res = set()
-            for val in value:
-                self.items.__set__(temp_st, val)
-                res.add(getattr(temp_st, getattr(self.items, '_name')))
-                value = res
+            validate = self.items._get_validator()
+            value = _SetStruct(self, None, [validate(val, name) for val in value], name)
+        else:
+            value = _SetStruct(self, None, value, name)
+        return super()._validate(value, name)
+
+    def _restore(self, value, instance, name):
+        if isinstance(value, set):
+            return _SetStruct(self, instance, value, name)
+        return value
+
+    @_plain_setter
+    def __set__(self, instance, value):
         super().__set__(instance, value)
+        content = instance.__dict__[self._name]
+        if isinstance(content, _SetStruct):
+            content._instance = instance
 
 
 class Map(SizedCollection, TypedField, metaclass=_CollectionMeta):
@@ -422,32 +1284,46 @@ class Map(SizedCollection, TypedField, metaclass=_CollectionMeta):
                     getattr(key_field, '_ty')))
         super().__init__(*args, **kwargs)
 
-    def __set__(self, instance, value):
+    def _validate(self, value, name):
         if not isinstance(value, dict):
-            raise TypeError("%s: Expected %s" % (self._name, dict))
-        self.validate_size(value, self._name)
+            raise TypeError("%s: Expected %s" % (name, dict))
+        self.validate_size(value, name)
 
         if self.items is not None:
-            temp_st = Structure()
-            key_field, value_field = self.items[0], self.items[1]
-            setattr(key_field, '_name', self._name + '_key')
-            setattr(value_field, '_name', self._name + '_value')
-            res = OrderedDict()
+            if isinstance(value, _ValidatedEntries) and value.items is self.items:
+                res = value
+            else:
+                res = _validate_entries(self.items, value.items(), name)
+            value = _DictStruct(self, None, res, name)
+            if isinstance(self.items[1], (Array, Map, Set)):
+                _adopt(value, value.values())
+        else:
+            value = _DictStruct(self, None, value, name)
+        return super()._validate(value, name)
 
+    def _restore(self, value, instance, name):
+        if not isinstance(value, dict):
+            return value
+        restored = _DictStruct(self, instance, value, name)
+        if self.items is not None:
+            value_field, value_name = self.items[1], '{}_value'.format(name)
             for key, val in value.items():
-                key_field.__set__(temp_st, key)
-                value_field.__set__(temp_st, val)
-                res[getattr(temp_st, getattr(key_field, '_name'))] = getattr(
-                    temp_st, getattr(value_field, '_name'))
-            value = res
+                restored_value = value_field._restore(val, restored, value_name)
+                dict.__setitem__(restored, key, restored_value)
+        return restored
 
-        super().__set__(instance, _DictStruct(self, instance, value))
+    @_plain_setter
+    def __set__(self, instance, value):
+        super().__set__(instance, value)
+        instance.__dict__[self._name]._instance = instance
 
 
 class Array(SizedCollection, TypedField, metaclass=_CollectionMeta):
     """
     An Array field, similar to a list. Supports the properties in JSON schema draft 4.
-    Expected input is of type `list`.
+    Expected input is of type `list`, or a `numpy.ndarray` if NumPy is installed.
+    A NumPy array of numbers is stored as a read-only view, which shares its memory with
+    the original array, so updates of the original array are not validated.
 
     Arguments:
         minItems(int): optional
@@ -507,43 +1383,105 @@ class Array(SizedCollection, TypedField, metaclass=_CollectionMeta):
             self.items = items
         super().__init__(*args, **kwargs)
 
-    def __set__(self, instance, value):
+    def _validate(self, value, name):
+        if _is_ndarray(value):
+            if value.ndim == 1 and value.dtype.kind in _vectorized_kinds(self.items):
+                return self._validate_ndarray(value, name)
+            value = value.tolist()
         if not isinstance(value, list):
-            raise TypeError("%s: Expected %s" % (self._name, list))
-        self.validate_size(value, self._name)
+            raise TypeError("%s: Expected %s" % (name, list))
+        self.validate_size(value, name)
         if self.uniqueItems:
-            unique = reduce(lambda unique_vals, x: unique_vals.append(x) or
-                            unique_vals if x not in unique_vals
-                            else unique_vals, value, [])
-            if len(unique) < len(value):
-                raise ValueError("{}: Expected unique items".format(self._name))
-        if self.items is not None:
-            if isinstance(self.items, Field):
-                temp_st = Structure()
-                setattr(self.items, '_name', self._name)
-                res = []
-                for i, val in enumerate(value):
-                    setattr(self.items, '_name', self._name + "_{}".format(str(i)))
-                    self.items.__set__(temp_st, val)
-                    res.append(getattr(temp_st, getattr(self.items, '_name')))
-                value = res
-            elif isinstance(self.items, list):
+            if _has_duplicates(value):
+                raise ValueError("{}: Expected unique items".format(name))
+        items = self.items
+        if items is not None:
+            if isinstance(items, Field):
+                if isinstance(value, _ValidatedElements) and value.items is items:
+                    elements = value
+                else:
+                    elements = _validate_elements(items._get_validator(), value, name)
+                value = _ListStruct(self, None, elements, name)
+                if isinstance(items, (Array, Map, Set)):
+                    _adopt(value, value)
+                return super()._validate(value, name)
+            elif isinstance(items, list):
                 additional_properties_forbidden = self.additionalItems is not None and \
                                                   self.additionalItems is False
-                if len(self.items) > len(value) or \
-                        (additional_properties_forbidden and len(self.items) > len(value)):
+                if len(items) > len(value) or \
+                        (additional_properties_forbidden and len(items) > len(value)):
                     raise ValueError("{}: Expected an array of length {}".format(
-                        self._name, len(self.items)))
-                temp_st = Structure()
-                res = []
-                for ind, item in enumerate(self.items):
-                    setattr(item, '_name', self._name + "_{}".format(str(ind)))
-                    item.__set__(temp_st, value[ind])
-                    res.append(getattr(temp_st, getattr(item, '_name')))
-                res += value[len(self.items):]
-                value = res
+                        name, len(items)))
+                res = _validate_positional(items, value, name)
+                res += value[len(items):]
+                value = _ListStruct(self, None, res, name)
+                _adopt(value, value[:len(items)])
+                return super()._validate(value, name)
 
-        super().__set__(instance, _ListStruct(self, instance, value))
+        return super()._validate(_ListStruct(self, None, value, name), name)
+
+    def _validate_ndarray(self, value, name):
+        """
+        Validate a one-dimensional NumPy array of numbers, with vectorized operations.
+
+        :return: a read-only view of the array, so that it is not copied. The original
+         array remains writable, and its updates are seen through the view.
+        """
+        self.validate_size(value, name)
+        if self.uniqueItems and _has_duplicate_numbers(value):
+            raise ValueError("{}: Expected unique items".format(name))
+        items = self.items
+        if items is not None and _invalid_numbers(items, value).any():
+            # report the error of the first invalid element, as for a list
+            _validate_elements(items._get_validator(), value.tolist(), name)
+        view = value.view()
+        view.flags.writeable = False
+        return view
+
+    def _compile_checker(self):
+        if _validate_chain(self.__class__) != (Array, TypedField, Field) or \
+                isinstance(self.items, list):
+            return super()._compile_checker()
+
+        def check(value, name):
+            if _is_ndarray(value):
+                return _checker_from_validator(self._validate)(value, name)
+            if not isinstance(value, list):
+                return ValidationFailure(TypeError, "{}: Expected {}", name, list)
+            failure = self._check_length(len(value), name)
+            if failure is not None:
+                return failure
+            if self.uniqueItems and _has_duplicates(value):
+                return ValidationFailure(ValueError, "{}: Expected unique items", name)
+            if self.items is not None:
+                check_item = self.items._get_checker()
+                for ind, val in enumerate(value):
+                    if check_item(val, name) is not None:
+                        return check_item(val, "{}_{}".format(name, ind))
+            return None
+        return check
+
+    def _restore(self, value, instance, name):
+        if _is_ndarray(value):
+            value.flags.writeable = False
+        if not isinstance(value, list):
+            return value
+        restored = _ListStruct(self, instance, value, name)
+        items = self.items
+        if isinstance(items, Field):
+            items = [items] * len(value)
+        if isinstance(items, list):
+            for ind, (item, val) in enumerate(zip(items, value)):
+                list.__setitem__(restored, ind, item._restore(
+                    val, restored, '{}_{}'.format(name, ind)))
+        return restored
+
+    @_plain_setter
+    def __set__(self, instance, value):
+        super().__set__(instance, value)
+        stored = instance.__dict__[self._name]
+        if isinstance(stored, _ListStruct):
+            stored._instance = instance
 
 
 
@@ -597,30 +1535,43 @@ class Tuple(TypedField, metaclass=_CollectionMeta):
             raise TypeError("Expected a list/tuple of Fields")
         super().__init__(*args, **kwargs)
 
-    def __set__(self, instance, value):
+    def _validate(self, value, name):
         if not isinstance(value, tuple):
-            raise TypeError("%s: Expected %s" % (self._name, tuple))
+            raise TypeError("%s: Expected %s" % (name, tuple))
         if self.uniqueItems:
-            unique = reduce(lambda unique_vals, x: unique_vals.append(x) or
-                            unique_vals if x not in unique_vals
-                            else unique_vals, value, [])
-            if len(unique) < len(value):
-                raise ValueError("{}: Expected unique items".format(self._name))
+            if _has_duplicates(value):
+                raise ValueError("{}: Expected unique items".format(name))
         if len(self.items) != len(value):
             raise ValueError("{}: Expected a tuple of length {}".format(
-                self._name, len(self.items)))
+                name, len(self.items)))
+
+        value = tuple(_validate_positional(self.items, value, name))
+        return super()._validate(value, name)
+
+    def _restore(self, value, instance, name):
+        if not isinstance(value, tuple):
+            return value
+        return tuple(item._restore(val, None, name) for item, val in zip(self.items, value)) + \
+            value[len(self.items):]
 
-        temp_st = Structure()
-        res = []
-        for ind, item in enumerate(self.items):
-            setattr(item, '_name', self._name + "_{}".format(str(ind)))
-            item.__set__(temp_st, value[ind])
-            res.append(getattr(temp_st, getattr(item, '_name')))
-            res += value[len(self.items):]
-        value = tuple(res)
 
-        super().__set__(instance, value)
 
+class _EnumValues(object):
+    """
+    The values of an :class:`Enum`, as shown in an error message.
+    Only the first values of a large enum are formatted, and only when the message is used.
+    """
+    max_shown = 10
+
+    def __init__(self, values):
+        self._values = values
+
+    def __str__(self):
+        values = self._values
+        if len(values) <= self.max_shown:
+            return str(values)
+        shown = ', '.join([repr(val) for val in list(values)[:self.max_shown]])
+        return '[{}, ...] ({} values)'.format(shown, len(values))
 
 
 class Enum(Field, metaclass=_EnumMeta):
@@ -629,18 +1580,57 @@ class Enum(Field, metaclass=_EnumMeta):
 
         Arguments:
              values(`list` or `set` or `tuple`):
-                 allowed values. Can be of any type
+                 allowed values. Can be of any type.
+                 They are indexed on first use, so to change them, assign a new collection
+                 rather than updating it in place.
 
     """
     def __init__(self, *args, values, **kwargs):
         self.values = values
         super().__init__(*args, **kwargs)
 
-    def __set__(self, instance, value):
-        if value not in self.values:
-            raise ValueError('{}: Must be one of {}'.format(self._name, self.values))
-        super().__set__(instance, value)
+    def _get_index(self):
+        """
+        :return: a tuple of the values, a frozenset of the hashable ones, and a list of the
+         unhashable ones
+        """
+        index = self.__dict__.get('_index')
+        if index is None or index[0] is not self.values:
+            hashable, unhashable = [], []
+            for val in self.values:
+                try:
+                    hash(val)
+                    hashable.append(val)
+                except TypeError:
+                    unhashable.append(val)
+            index = self._index = (self.values, frozenset(hashable), unhashable)
+        return index
+
+    def _check(self, value, name):
+        values, hashable, unhashable = self._get_index()
+        try:
+            found = value in hashable
+        except TypeError:
+            # an unhashable value is compared to all the values
+            found = value in values
+        else:
+            if not found and unhashable:
+                found = value in unhashable
+        if not found:
+            return ValidationFailure(ValueError, '{}: Must be one of {}', name,
+                                     _EnumValues(values))
+        return None
 
+    def _validate(self, value, name):
+        failure = self._check(value, name)
+        if failure is not None:
+            raise failure.exception()
+        return super()._validate(value, name)
+
+    def _compile_checker(self):
+        if _validate_chain(self.__class__) != (Enum, Field):
+            return super()._compile_checker()
+        return self._check
 
 
 class EnumString(Enum, String):
@@ -660,20 +1650,140 @@ class EnumString(Enum, String):
     pass
 
 
+_DATE_PATTERN = re.compile(r'(\d{4})-(\d{2})-(\d{2})\Z', re.ASCII)
+
+_DATETIME_PATTERN = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?'
+    r'(Z|[+-]\d{2}:?\d{2})?\Z', re.ASCII)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(value):
+    """
+    Parse a date of the format '%Y-%m-%d'. The common form with two-digit month and day,
+    e.g. '2017-08-09', is parsed directly, and anything else by strptime, so that the same
+    strings are accepted, with the same errors. Recently parsed dates are cached.
+
+    :raises ValueError: if the string is invalid
+    """
+    match = _DATE_PATTERN.match(value)
+    if match is not None:
+        try:
+            return date(*map(int, match.groups()))
+        except ValueError:
+            pass
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+@lru_cache(maxsize=4096)
+def _parse_datetime(value):
+    """
+    Parse an ISO 8601 date and time, such as '2017-08-09T13:45:00.250+02:00'. Seconds,
+    fraction of a second, and the timezone are optional. Recently parsed values are cached.
+
+    :raises ValueError: if the string is invalid
+    """
+    match = _DATETIME_PATTERN.match(value)
+    if match is None:
+        raise ValueError("time data '{}' is not an ISO 8601 date and time".format(value))
+    year, month, day, hour, minute, second, fraction, zone = match.groups()
+    tzinfo = None
+    if zone == 'Z':
+        tzinfo = timezone.utc
+    elif zone is not None:
+        offset = timedelta(hours=int(zone[1:3]), minutes=int(zone[-2:]))
+        tzinfo = timezone(-offset if zone[0] == '-' else offset)
+    return datetime(int(year), int(month), int(day), int(hour), int(minute),
+                    int(second or 0), int((fraction or '0').ljust(6, '0')), tzinfo)
+
+
 class DateString(TypedField):
     """
     A string field of the format '%Y-%m-%d' that can be converted to a date
+
+    Arguments:
+        keep_parsed(bool): optional
+            if True, the value is stored as a :class:`datetime.date`, and a date is accepted
+            as well
     """
     _ty = str
 
-    def __set__(self, instance, value):
-        super().__set__(instance, value)
-        try:
-            datetime.strptime(value, '%Y-%m-%d')
-        except ValueError as ex:
-            raise ValueError("{}: {}".format(self._name, ex.args[0]))
+    def __init__(self, *args, keep_parsed=None, **kwargs):
+        self.keep_parsed = keep_parsed
+        if keep_parsed:
+            self._ty = (str, date)
+        super().__init__(*args, **kwargs)
+
+    def _validate(self, value, name):
+        value = super()._validate(value, name)
+        if isinstance(value, str):
+            try:
+                parsed = _parse_date(value)
+            except ValueError as ex:
+                raise ValueError("{}: {}".format(name, ex.args[0]))
+            if self.keep_parsed:
+                return parsed
+        return value
+
+
+class DateTimeString(TypedField):
+    """
+    A string field of an ISO 8601 date and time, such as '2017-08-09T13:45:00'. Seconds,
+    fraction of a second, and the timezone (e.g. 'Z', '+02:00') are optional.
+
+    Arguments:
+        keep_parsed(bool): optional
+            if True, the value is stored as a :class:`datetime.datetime`, and a datetime is
+            accepted as well
+    """
+    _ty = str
+
+    def __init__(self, *args, keep_parsed=None, **kwargs):
+        self.keep_parsed = keep_parsed
+        if keep_parsed:
+            self._ty = (str, datetime)
+        super().__init__(*args, **kwargs)
+
+    def _validate(self, value, name):
+        value = super()._validate(value, name)
+        if isinstance(value, str):
+            try:
+                parsed = _parse_datetime(value)
+            except ValueError as ex:
+                raise ValueError("{}: {}".format(name, ex.args[0]))
+            if self.keep_parsed:
+                return parsed
+        return value
+
+
+class TimestampField(Field):
+    """
+    A Unix timestamp: the number of seconds since 1970-01-01 UTC, as int or float.
+
+    Arguments:
+        keep_parsed(bool): optional
+            if True, the value is stored as a timezone-aware :class:`datetime.datetime` in UTC,
+            and a timezone-aware datetime is accepted as well
+    """
 
+    def __init__(self, *args, keep_parsed=None, **kwargs):
+        self.keep_parsed = keep_parsed
+        super().__init__(*args, **kwargs)
 
+    def _validate(self, value, name):
+        if self.keep_parsed and isinstance(value, datetime):
+            if value.tzinfo is None:
+                raise ValueError("{}: Expected a timezone-aware datetime".format(name))
+            return super()._validate(value, name)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError("{}: Expected a timestamp".format(name))
+        try:
+            parsed = _EPOCH + timedelta(seconds=value)
+        except (OverflowError, ValueError):
+            raise ValueError("{}: Timestamp is out of range".format(name))
+        return super()._validate(parsed if self.keep_parsed else value, name)
 
 
 class Sized(Field):
@@ -691,10 +1801,10 @@ class Sized(Field):
         self.maxlen = maxlen
         super().__init__(*args, **kwargs)
 
-    def __set__(self, instance, value):
+    def _validate(self, value, name):
         if len(value) > self.maxlen:
-            raise ValueError('{}: Too long'.format(self._name))
-        super().__set__(instance, value)
+            raise ValueError('{}: Too long'.format(name))
+        return super()._validate(value, name)
 
 
 class SizedString(String, Sized):
@@ -711,10 +1821,49 @@ def _str_for_multioption_field(instance):
     return '<{}{}>'.format(name, propst)
 
 
+def _accepted_types(field):
+    """
+    :return: the types of values that the field may accept, or None if the field may accept
+     values of any type
+    """
+    if not getattr(type(field).__set__, 'plain_setter', False):
+        # a custom __set__ may convert the value
+        return None
+    if isinstance(field, Set):
+        return (set, frozenset)
+    if numpy is not None:
+        # NumPy arrays and scalars are accepted as well
+        if isinstance(field, Array):
+            return (list, numpy.ndarray)
+        if isinstance(field, Number):
+            the_type = field._ty if isinstance(field, TypedField) else None
+            return {int: (int, numpy.integer), float: (float, numpy.floating),
+                    None: (int, float, numpy.number)}.get(the_type, (the_type,))
+    if isinstance(field, TypedField):
+        return (field._ty,)
+    if isinstance(field, Number):
+        return (int, float)
+    if isinstance(field, StructureReference):
+        return (dict, field._newclass)
+    if isinstance(field, TimestampField):
+        return (int, float, datetime)
+    if isinstance(field, DiscriminatedUnion):
+        return (dict,) + tuple(field.mapping.values())
+    if isinstance(field, (AnyOf, OneOf)):
+        types = [_accepted_types(option) for option in field.get_fields()]
+        if None in types:
+            return None
+        return tuple(ty for option_types in types for ty in option_types)
+    return None
+
+
 class MultiFieldWrapper(object):
     """
     An abstract base class for AllOf, AnyOf, OneOf, etc.
     It provides flexibility in reading the "fields" argument.
+
+    The options that may accept a value are looked up by the type of the value, so that
+    options of other types are not tried.
     """
     def __init__(self, *arg, fields, **kwargs):
         if isinstance(fields, list):
@@ -728,11 +1877,57 @@ class MultiFieldWrapper(object):
                     raise TypeError("Expected a Field class or instance")
         else:
             raise TypeError("Expected a Field class or instance")
+        self._options_by_type = {}
         super().__init__(*arg, **kwargs)
 
     def get_fields(self):
         return self._fields
 
+    def _check(self, value, name):
+        """
+        :return: None if the value is valid, otherwise a :class:`ValidationFailure`
+        """
+        raise NotImplementedError()
+
+    def _validate(self, value, name):
+        failure = self._check(value, name)
+        if failure is not None:
+            raise failure.exception()
+        return super()._validate(value, name)
+
+    def _compile_checker(self):
+        if _validate_chain(self.__class__) != (MultiFieldWrapper, Field):
+            return super()._compile_checker()
+        return self._check
+
+    def _options_for(self, value):
+        """
+        :return: the options that may accept the value, in their order
+        """
+        cls = type(value)
+        options = self._options_by_type.get(cls)
+        if options is None:
+            options = []
+            for field in self.get_fields():
+                types = _accepted_types(field)
+                if types is None or issubclass(cls, types):
+                    options.append(field)
+            options = tuple(options)
+            self._options_by_type[cls] = options
+        return options
+
+    def _promote(self, value, ind):
+        """
+        Move the option in the given index one place forward, for values of the type of the
+        given value. An option that often matches moves to the front.
+        A concurrent promotion may be lost, but the options remain the same, since the
+        tuple is replaced rather than modified.
+        """
+        cls = type(value)
+        options = list(self._options_by_type[cls])
+        options[ind - 1], options[ind] = options[ind], options[ind - 1]
+        self._options_by_type[cls] = tuple(options)
+
 
 class AllOf(MultiFieldWrapper, Field, metaclass=_JSONSchemaDraft4ReuseMeta):
     """
@@ -752,11 +1947,12 @@ class AllOf(MultiFieldWrapper, Field, metaclass=_JSONSchemaDraft4ReuseMeta):
     def __init__(self, fields):
         super().__init__(fields=fields)
 
-    def __set__(self, instance, value):
+    def _check(self, value, name):
         for field in self.get_fields():
-            setattr(field, '_name', self._name)
-            field.__set__(instance, value)
-        super().__set__(instance, value)
+            failure = field._get_checker()(value, name)
+            if failure is not None:
+                return failure
+        return None
 
     def __str__(self):
         return _str_for_multioption_field(self)
@@ -781,20 +1977,14 @@ class AnyOf(MultiFieldWrapper, Field, metaclass=_JSONSchemaDraft4ReuseMeta):
     def __init__(self, fields):
         super().__init__(fields=fields)
 
-    def __set__(self, instance, value):
-        matched = False
-        for field in self.get_fields():
-            setattr(field, '_name', self._name)
-            try:
-                field.__set__(instance, value)
-                matched = True
-            except TypeError:
-                pass
-            except ValueError:
-                pass
-        if not matched:
-            raise ValueError("{}: Did not match any field option".format(self._name))
-        super().__set__(instance, value)
+    def _check(self, value, name):
+        for ind, field in enumerate(self._options_for(value)):
+            if field._get_checker()(value, name) is not None:
+                continue
+            if ind:
+                self._promote(value, ind)
+            return None
+        return ValidationFailure(ValueError, "{}: Did not match any field option", name)
 
     def __str__(self):
         return _str_for_multioption_field(self)
@@ -818,22 +2008,17 @@ class OneOf(MultiFieldWrapper, Field, metaclass=_JSONSchemaDraft4ReuseMeta):
     def __init__(self, fields):
         super().__init__(fields=fields)
 
-    def __set__(self, instance, value):
+    def _check(self, value, name):
         matched = 0
-        for field in self.get_fields():
-            setattr(field, '_name', self._name)
-            try:
-                field.__set__(instance, value)
+        for field in self._options_for(value):
+            if field._get_checker()(value, name) is None:
                 matched += 1
-            except TypeError:
-                pass
-            except ValueError:
-                pass
+            if matched > 1:
+                return ValidationFailure(
+                    ValueError, "{}: Matched more than one field option", name)
         if not matched:
-            raise ValueError("{}: Did not match any field option".format(self._name))
-        if matched > 1:
-            raise ValueError("{}: Matched more than one field option".format(self._name))
-        super().__set__(instance, value)
+            return ValidationFailure(ValueError, "{}: Did not match any field option", name)
+        return None
 
     def __str__(self):
         return _str_for_multioption_field(self)
@@ -858,19 +2043,12 @@ class NotField(MultiFieldWrapper, Field, metaclass=_JSONSchemaDraft4ReuseMeta):
     def __init__(self, fields):
         super().__init__(fields=fields)
 
-    def __set__(self, instance, value):
-        for field in self.get_fields():
-            setattr(field, '_name', self._name)
-            try:
-                field.__set__(instance, value)
-            except TypeError:
-                pass
-            except ValueError:
-                pass
-            else:
-                raise ValueError("{}: Expected not to match any field definition".
-                                 format(self._name))
-        super().__set__(instance, value)
+    def _check(self, value, name):
+        for field in self._options_for(value):
+            if field._get_checker()(value, name) is None:
+                return ValidationFailure(
+                    ValueError, "{}: Expected not to match any field definition", name)
+        return None
 
     def __str__(self):
         return _str_for_multioption_field(self)
@@ -878,9 +2056,9 @@ class NotField(MultiFieldWrapper, Field, metaclass=_JSONSchemaDraft4ReuseMeta):
 
 class ValidatedTypedField(TypedField):
 
-    def __set__(self, instance, value):
+    def _validate(self, value, name):
         self._validate_func(value) # pylint: disable=E1101
-        super().__set__(instance, value)
+        return super()._validate(value, name)
 
 
 def create_typed_field(classname, cls, validate_func=None):
@@ -2,7 +2,8 @@ from collections import OrderedDict
 
 from typedpy.fields import StructureReference, Integer, Number, Float, Array, Enum, String, \
     ClassReference, Field, Boolean, \
-    AllOf, OneOf, AnyOf, NotField
+    AllOf, OneOf, AnyOf, NotField, DiscriminatedUnion
+from typedpy.structures import _CompactField
 
 
 def as_str(val):
@@ -22,7 +23,8 @@ def get_mapper(field_cls):
         AllOf: AllOfMapper,
         AnyOf: AnyOfMapper,
         OneOf: OneOfMapper,
-        NotField: NotFieldMapper
+        NotField: NotFieldMapper,
+        DiscriminatedUnion: DiscriminatedUnionMapper
     }
     return field_type_to_mapper[field_cls]
 
@@ -35,16 +37,27 @@ def convert_to_schema(field, definitions_schema):
     if field is None:
         return None
     if isinstance(field, ClassReference):
-        definition, _ = structure_to_schema(getattr(field, '_ty'), definitions_schema)
-        name = getattr(field, '_ty').__name__
-        definitions_schema[name] = definition
-        return {'$ref': '#/definitions/{}'.format(name)}
+        return class_to_schema_reference(getattr(field, '_ty'), definitions_schema)
     if isinstance(field, list):
         return [convert_to_schema(f, definitions_schema) for f in field]
-    mapper = get_mapper(field.__class__)(field)
+    field_cls = field.__class__
+    if isinstance(field, _CompactField):
+        # the field of a compact structure is an instance of a subclass of the declared type
+        field_cls = field._field_class
+    mapper = get_mapper(field_cls)(field)
     return mapper.to_schema(definitions_schema)
 
 
+def class_to_schema_reference(cls, definitions_schema):
+    """
+    Add the schema of a :class:`Structure` to the definitions, and return a reference to it
+    """
+    definition, _ = structure_to_schema(cls, definitions_schema)
+    name = cls.__name__
+    definitions_schema[name] = definition
+    return {'$ref': '#/definitions/{}'.format(name)}
+
+
 def structure_to_schema(structure, definitions_schema):
     """
     Generate JSON schema from :class:`Structure`
@@ -109,7 +122,10 @@ def convert_to_field_code(schema, definitions):
         'oneOf': OneOf,
         'not': NotField
     }
-    if any(multival in schema for multival in multivals):
+    if 'discriminator' in schema:
+        cls = DiscriminatedUnion
+        mapper = DiscriminatedUnionMapper
+    elif any(multival in schema for multival in multivals):
         for (k, the_class) in multivals.items():
             if k in schema:
                 cls = the_class
@@ -386,3 +402,26 @@ class AnyOfMapper(Mapper):
 class NotFieldMapper(Mapper):
     def to_schema(self, definitions):
         return {'not': convert_to_schema(self.value._fields, definitions)}
+
+
+class DiscriminatedUnionMapper(Mapper):
+    @staticmethod
+    def get_paramlist_from_schema(schema, definitions):
+        discriminator = schema['discriminator']
+        mapping = ', '.join(["{}: {}".format(as_str(tag), ref[len('#/definitions/'):])
+                             for tag, ref in discriminator['mapping'].items()])
+        return [('discriminator', as_str(discriminator['propertyName'])),
+                ('mapping', '{{{}}}'.format(mapping))]
+
+    def to_schema(self, definitions):
+        value = self.value
+        refs = OrderedDict([(tag, class_to_schema_reference(cls, definitions))
+                            for tag, cls in value.mapping.items()])
+        return OrderedDict([
+            ('oneOf', [ref for ind, ref in enumerate(refs.values())
+                       if ref not in list(refs.values())[:ind]]),
+            ('discriminator', OrderedDict([
+                ('propertyName', value.discriminator),
+                ('mapping', OrderedDict([(tag, ref['$ref']) for tag, ref in refs.items()]))
+            ]))
+        ])
@@ -1,22 +1,119 @@
+import bz2
+import codecs
+import gzip
+import io
+import json
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from datetime import date
+from itertools import islice
+from json.encoder import encode_basestring_ascii
+
+try:
+    from json.encoder import c_make_encoder
+except ImportError:  # pragma: no cover
+    c_make_encoder = None
+
+try:
+    import lzma
+except ImportError:  # pragma: no cover
+    lzma = None
+
 from typedpy.fields import Field, Number, String, StructureReference,\
-    Array, Map, ClassReference, Enum, MultiFieldWrapper, Boolean
+    Array, Map, ClassReference, Enum, MultiFieldWrapper, Boolean, DiscriminatedUnion, \
+    DateString, DateTimeString, TimestampField, Set, Tuple, _is_ndarray
+from typedpy.structures import Structure, RejectedItem, _structure_fields, \
+    _check_error_policy, _rejection_error
 
 
-def deserialize_array(array_field, value, name):
-    if not isinstance(value, list):
-        return value
-    items = array_field.items
-    if isinstance(items, Field):
-        return [deserialize_single_field(items, v, name) for v in value]
-
-    values = []
-    for i, field in enumerate(items):
-        res = deserialize_single_field(field, value[i], name)
-        values.append(res)
-    values += value[len(items):]
+# marks a field whose values are serialized or deserialized as is
+_AS_IS = object()
+
+_PRIMITIVE_FIELDS = (Number, String, Boolean)
+
+_PRIMITIVE_SOURCE_FIELDS = _PRIMITIVE_FIELDS + (Enum, DateString, DateTimeString,
+                                                TimestampField)
+
+
+def _decode_items(field, value, name):
+    if isinstance(field, Field):
+        decoder = _get_decoder(field)
+        if decoder is _AS_IS:
+            return list(value)
+        return [decoder(v, name) for v in value]
+    values = [_decode(item, v, name) for item, v in zip(field, value)]
+    values += value[len(field):]
     return values
 
 
+def _make_decoder(field):
+    """
+    :return: a function that deserializes a value of the field, or _AS_IS
+    """
+    if isinstance(field, _PRIMITIVE_SOURCE_FIELDS):
+        return _AS_IS
+    if isinstance(field, Array):
+        items = field.items
+        if items is None or not isinstance(items, (Field, list)):
+            return _AS_IS
+        return lambda value, name: \
+            _decode_items(items, value, name) if isinstance(value, list) else value
+    if isinstance(field, Set):
+        items = field.items
+        if not isinstance(items, Field):
+            return lambda value, name: set(value) if isinstance(value, list) else value
+        return lambda value, name: set(_decode_items(items, value, name)) \
+            if isinstance(value, (list, set, frozenset)) else value
+    if isinstance(field, Tuple):
+        items = field.items
+        return lambda value, name: tuple(_decode_items(items, value, name)) \
+            if isinstance(value, (list, tuple)) else value
+    if isinstance(field, MultiFieldWrapper):
+        if all(isinstance(option, (Number, String, Enum, Boolean))
+               for option in field.get_fields()):
+            return _AS_IS
+        return lambda value, name: deserialize_multifield_wrapper(field, value, name)
+    if isinstance(field, DiscriminatedUnion):
+        return lambda value, name: deserialize_discriminated_union(field, value, name)
+    if isinstance(field, ClassReference):
+        cls = getattr(field, '_ty')
+        return lambda value, name: deserialize_structure(cls, value, name)
+    if isinstance(field, StructureReference):
+        cls = getattr(field, '_newclass')
+        return lambda value, name: deserialize_structure_reference(cls, value)
+    if isinstance(field, Map):
+        return lambda value, name: deserialize_map(field, value, name)
+
+    def unsupported(value, name):
+        raise NotImplementedError("cannot deserialize field '{}' of type {}".
+                                  format(name, field.__class__.__name__))
+    return unsupported
+
+
+def _get_decoder(field):
+    """
+    :return: the deserializer of the field, which is generated once, and cached in it
+    """
+    decoder = field.__dict__.get('_decoder')
+    if decoder is None:
+        decoder = field._decoder = _make_decoder(field)
+    return decoder
+
+
+def _decode(field, value, name):
+    if field is None:
+        return value
+    decoder = _get_decoder(field)
+    return value if decoder is _AS_IS else decoder(value, name)
+
+
+def deserialize_array(array_field, value, name):
+    return _decode(array_field, value, name)
+
+
 def deserialize_multifield_wrapper(field, source_val, name):
     """
     Only primitive values are supported, otherwise deserialization is ambiguous,
@@ -29,47 +126,51 @@ def deserialize_multifield_wrapper(field, source_val, name):
     return source_val
 
 
+def deserialize_discriminated_union(field, source_val, name):
+    if isinstance(source_val, Structure):
+        return source_val
+    if not isinstance(source_val, dict):
+        raise TypeError("{}: Expected a dictionary".format(name))
+    cls, content = field._get_class(source_val, name)
+    return deserialize_structure(cls, content, name)
+
+
 def deserialize_map(map_field, source_val, name):
     if not isinstance(source_val, dict):
         raise TypeError("{}: expected a dict".format(name))
-    if map_field.items:
-        key_field, value_field = map_field.items
-    else:
-        key_field, value_field = None, None
+    if not map_field.items:
+        return dict(source_val)
+    key_field, value_field = map_field.items
+    key_decoder, value_decoder = _get_decoder(key_field), _get_decoder(value_field)
+    if key_decoder is _AS_IS and value_decoder is _AS_IS:
+        return dict(source_val)
     res = {}
     for key, val in source_val.items():
-        res[deserialize_single_field(key_field, key, name)] = \
-            deserialize_single_field(value_field, val, name)
+        res[_decode(key_field, key, name)] = _decode(value_field, val, name)
     return res
 
 
 def deserialize_single_field(field, source_val, name):
-    if isinstance(field, (Number, String, Enum, Boolean)) or field is None:
-        value = source_val
-    elif isinstance(field, Array):
-        value = deserialize_array(field, source_val, name)
-    elif isinstance(field, MultiFieldWrapper):
-        value = deserialize_multifield_wrapper(field, source_val, name)
-    elif isinstance(field, ClassReference):
-        value = deserialize_structure(getattr(field, '_ty'), source_val, name)
-    elif isinstance(field, StructureReference):
-        value = deserialize_structure_reference(getattr(field, '_newclass'), source_val)
-    elif isinstance(field, Map):
-        value = deserialize_map(field, source_val, name)
-    else:
-        raise NotImplementedError("cannot deserialize field '{}' of type {}".\
-                                  format(name, field.__class__.__name__))
-    return value
+    return _decode(field, source_val, name)
 
-def deserialize_structure_reference(cls, the_dict: dict):
-    field_by_name = dict([(k, v) for k, v in cls.__dict__.items()
-                          if isinstance(v, Field) and k in the_dict])
-    kwargs = dict([(k, v) for k, v in the_dict.items() if k not in cls.__dict__])
-    for name, field in field_by_name.items():
-        kwargs[name] = deserialize_single_field(field, the_dict[name], name)
+
+def _deserialize_fields(cls, the_dict):
+    fields = _structure_fields(cls)
+    kwargs = {}
+    for key, val in the_dict.items():
+        field = fields.get(key)
+        if field is not None:
+            decoder = field.__dict__.get('_decoder') or _get_decoder(field)
+            if decoder is not _AS_IS:
+                val = decoder(val, key)
+        kwargs[key] = val
     return kwargs
 
 
+def deserialize_structure_reference(cls, the_dict: dict):
+    return _deserialize_fields(cls, the_dict)
+
+
 def deserialize_structure(cls, the_dict, name=None):
     """
         Deserialize a dict to a Structure instance, Jackson style.
@@ -91,24 +192,94 @@ def deserialize_structure(cls, the_dict, name=None):
     """
     if not isinstance(the_dict, dict):
         raise TypeError("{}: Expected a dictionary".format(name))
-    field_by_name = dict([(k, v) for k, v in cls.__dict__.items()
-                          if isinstance(v, Field) and k in the_dict])
-    kwargs = dict([(k, v) for k, v in the_dict.items() if k not in cls.__dict__])
-    for key, field in field_by_name.items():
-        kwargs[key] = deserialize_single_field(field, the_dict[key], key)
-    return cls(**kwargs)
+    return cls(**_deserialize_fields(cls, the_dict))
 
 
-def serialize_val(name, val):
-    if isinstance(val, (set, tuple)):
-        raise TypeError("{}: Serialization unsupported for set, tuple".format(name))
+def serialize_val(name, val, field=None):
+    """
+    Serialize a value by its type. Used for values of properties that are not fields,
+    and of fields that have no specific serializer.
+    """
     if isinstance(val, (int, str, bool, float)) or val is None:
         return val
-    if isinstance(val, list):
-        return [serialize_val(name, i) for i in val]
+    if isinstance(val, date):
+        return val.timestamp() if isinstance(field, TimestampField) else val.isoformat()
+    if _is_ndarray(val):
+        return val.tolist()
+    if isinstance(val, (list, set, frozenset, tuple)):
+        items = field.items if isinstance(field, Array) else None
+        item_field = items if isinstance(items, Field) else None
+        return [serialize_val(name, i, item_field) for i in val]
+    if isinstance(field, DiscriminatedUnion) and isinstance(val, Structure):
+        result = {field.discriminator: field._get_tag(val)}
+        result.update(serialize(val))
+        return result
     return serialize(val)
 
 
+def _make_encoder(field):
+    """
+    :return: a function that serializes a value of the field, or _AS_IS
+    """
+    if isinstance(field, _PRIMITIVE_FIELDS):
+        return _AS_IS
+    if isinstance(field, (DateString, DateTimeString)):
+        return (lambda val: val.isoformat()) if field.keep_parsed else _AS_IS
+    if isinstance(field, TimestampField):
+        return (lambda val: val.timestamp()) if field.keep_parsed else _AS_IS
+    if isinstance(field, (ClassReference, StructureReference)):
+        return serialize
+    if isinstance(field, DiscriminatedUnion):
+        def encode_tagged(val):
+            result = {field.discriminator: field._get_tag(val)}
+            result.update(serialize(val))
+            return result
+        return encode_tagged
+    if isinstance(field, (Array, Set)):
+        items = field.items
+        if isinstance(items, Field):
+            def encode_items(val):
+                encoder = _get_encoder(items)
+                if encoder is _AS_IS:
+                    return val.tolist() if _is_ndarray(val) else list(val)
+                return [encoder(v) for v in val]
+            return encode_items
+        if isinstance(items, list):
+            return lambda val: _encode_positional(items, val)
+    if isinstance(field, Tuple):
+        return lambda val: _encode_positional(field.items, val)
+    if isinstance(field, Map) and field.items is not None:
+        value_field = field.items[1]
+
+        def encode_map(val):
+            encoder = _get_encoder(value_field)
+            if encoder is _AS_IS:
+                return dict([(k, v) for k, v in val.items() if v is not None])
+            return dict([(k, encoder(v)) for k, v in val.items() if v is not None])
+        return encode_map
+    name = field._name
+    return lambda val: serialize_val(name, val, field)
+
+
+def _get_encoder(field):
+    """
+    :return: the serializer of the field, which is generated once, and cached in it
+    """
+    encoder = field.__dict__.get('_encoder')
+    if encoder is None:
+        encoder = field._encoder = _make_encoder(field)
+    return encoder
+
+
+def _encode(encoder, val):
+    return val if encoder is _AS_IS else encoder(val)
+
+
+def _encode_positional(fields, val):
+    result = [_encode(_get_encoder(field), v) for field, v in zip(fields, val)]
+    result += [serialize_val(None, v) for v in val[len(fields):]]
+    return result
+
 
 def serialize(structure):
     """
@@ -121,11 +292,553 @@ def serialize(structure):
     Returns:
         a serialized Python dict
     """
-    items = structure.items() if isinstance(structure, dict) \
-        else structure.__dict__.items()
     result = {}
-    for key, val in items:
+    if isinstance(structure, dict):
+        for key, val in structure.items():
+            if val is not None:
+                result[key] = serialize_val(key, val)
+        return result
+
+    fields = _structure_fields(structure.__class__)
+    for key, val in structure.__dict__.items():
         if val is None:
             continue
-        result[key] = serialize_val(key, val)
+        field = fields.get(key)
+        if field is None:
+            result[key] = serialize_val(key, val)
+            continue
+        encoder = field.__dict__.get('_encoder') or _get_encoder(field)
+        result[key] = val if encoder is _AS_IS else encoder(val)
     return result
+
+
+# the encoder that json.dumps uses by default
+_JSON_ENCODER = json.JSONEncoder()
+
+
+def _make_json_encode():
+    """
+    :return: a function that encodes a value like json.dumps. The C encoder is created once,
+        rather than per call.
+    """
+    if c_make_encoder is None:
+        return _JSON_ENCODER.encode
+    iterencode = c_make_encoder(None, _JSON_ENCODER.default, encode_basestring_ascii, None,
+                                ': ', ', ', False, False, True)
+    return lambda val: ''.join(iterencode(val, 0))
+
+
+_json_encode = _make_json_encode()
+
+_INFINITY = float('inf')
+
+# the number of elements of an array that are encoded together
+_JSON_ARRAY_CHUNK = 1000
+
+
+def _json_primitive(val):
+    """
+    :return: the JSON text of a primitive value, exactly as json.dumps encodes it
+    """
+    if isinstance(val, str):
+        return encode_basestring_ascii(val)
+    if val is True:
+        return 'true'
+    if val is False:
+        return 'false'
+    if isinstance(val, int):
+        return int.__repr__(val)
+    if isinstance(val, float) and val == val and val not in (_INFINITY, -_INFINITY):
+        return float.__repr__(val)
+    return _JSON_ENCODER.encode(val)
+
+
+class _JsonWriter(object):
+    """
+    Collects the pieces of a JSON text. When a file is given, they are written to it
+    after every chunk of an array.
+    """
+    def __init__(self, fp=None):
+        self.fp = fp
+        self.pieces = []
+        self.append = self.pieces.append
+
+    def flush(self):
+        if self.fp is not None:
+            self.fp.write(''.join(self.pieces))
+            del self.pieces[:]
+
+    def write_value(self, field, val):
+        if field is None:
+            self.append(_json_encode(serialize_val(None, val)))
+            return
+        encoder = field.__dict__.get('_encoder') or _get_encoder(field)
+        if encoder is _AS_IS:
+            self.append(_json_primitive(val))
+        elif isinstance(field, (ClassReference, StructureReference)):
+            self.write_structure(val)
+        elif isinstance(field, (Array, Set)) and isinstance(field.items, Field):
+            self.write_array(field.items, val)
+        else:
+            self.append(_json_encode(encoder(val)))
+
+    def write_array(self, items, val):
+        encoder = _get_encoder(items)
+        if not isinstance(val, list):
+            val = val.tolist() if _is_ndarray(val) else list(val)
+        if not val:
+            self.append('[]')
+            return
+        for start in range(0, len(val), _JSON_ARRAY_CHUNK):
+            chunk = val[start:start + _JSON_ARRAY_CHUNK]
+            if encoder is not _AS_IS:
+                chunk = [encoder(v) for v in chunk]
+            self.append((', ' if start else '[') + _json_encode(chunk)[1:-1])
+            self.flush()
+        self.append(']')
+
+    def write_structure(self, structure):
+        if isinstance(structure, dict):
+            self.append(_json_encode(serialize(structure)))
+            return
+        append = self.append
+        fields = _structure_fields(structure.__class__)
+        separator = '{'
+        # consecutive primitive values are encoded together, by the json encoder
+        primitives = {}
+        for key, val in structure.__dict__.items():
+            if val is None:
+                continue
+            field = fields.get(key)
+            if field is not None and field.__dict__.get('_encoder') is _AS_IS:
+                primitives[key] = val
+                continue
+            if primitives:
+                append(separator + _json_encode(primitives)[1:-1])
+                separator = ', '
+                primitives = {}
+            append(separator + encode_basestring_ascii(key) + ': ')
+            separator = ', '
+            self.write_value(field, val)
+        if primitives:
+            append(separator + _json_encode(primitives)[1:-1])
+            separator = ', '
+        append('}' if separator == ', ' else '{}')
+
+
+def serialize_to_json(structure, fp=None):
+    """
+    Serialize an instance of :class:`Structure` to JSON, without creating the intermediate
+    dict. The result is identical to json.dumps(serialize(structure)).
+    Large arrays are encoded in chunks, so when a file is given, memory usage does not
+    depend on their size.
+
+    Arguments:
+        structure(:class:`Structure`):
+        fp(file object): optional
+            a text file to write the JSON to
+
+    Returns:
+        the JSON string, or None if fp is given
+    """
+    writer = _JsonWriter(fp)
+    writer.write_structure(structure)
+    if fp is None:
+        return ''.join(writer.pieces)
+    writer.flush()
+
+
+# magic numbers of compressed content, and how to decompress it
+_COMPRESSIONS = [
+    (b'\x1f\x8b', lambda stream: gzip.GzipFile(fileobj=stream)),
+    (b'BZh', bz2.BZ2File),
+    (b'\xfd7zXZ\x00', lzma.LZMAFile if lzma else None),
+]
+
+_BUFFER_SIZE = 1 << 20
+
+
+def _decompressed(stream):
+    """
+    :return: a binary stream of the content of the given binary stream, which is
+        decompressed if it starts with the magic number of gzip, bz2 or xz.
+        The given stream must support peek.
+    """
+    head = stream.peek(6)
+    for magic, decompress in _COMPRESSIONS:
+        if head.startswith(magic) and decompress is not None:
+            return decompress(stream)
+    return stream
+
+
+@contextmanager
+def _open_stream(source):
+    """
+    Open a file name or a file object for reading. The content of a binary stream is
+    decompressed if needed.
+    """
+    if isinstance(source, str):
+        with open(source, 'rb', buffering=_BUFFER_SIZE) as stream:
+            yield _decompressed(stream)
+    elif isinstance(source, io.TextIOBase):
+        yield source
+    elif hasattr(source, 'peek'):
+        yield _decompressed(source)
+    else:
+        # the buffer would close the stream of the caller when it is garbage-collected
+        buffered = io.BufferedReader(source, buffer_size=_BUFFER_SIZE)
+        try:
+            yield _decompressed(buffered)
+        finally:
+            buffered.detach()
+
+
+def deserialize_stream(cls, source, errors='raise', rejected=None):
+    """
+    Deserialize JSON Lines - a JSON object per line - to instances of a :class:`Structure`.
+    The content is read lazily, so memory usage does not depend on the size of the input.
+    Empty lines are ignored.
+
+    Arguments:
+        cls(type):
+            The target class
+        source(str or file object):
+            A file name, or a file object opened in text or binary mode. Binary content
+            compressed with gzip, bz2 or xz is decompressed.
+        errors(str): optional
+            What to do with a line that is not a valid serialization of the class:
+            'raise' (default) raises a TypeError/ValueError that includes the line number,
+            'skip' ignores it, and 'collect' adds a :class:`RejectedItem` to `rejected`.
+        rejected(list): optional
+            The list that collects the rejected lines when errors='collect'
+
+    Returns:
+        a generator of instances of the class
+    """
+    _check_error_policy(errors, rejected)
+    return _deserialize_lines(cls, source, errors, rejected)
+
+
+def _deserialize_lines(cls, source, errors, rejected):
+    with _open_stream(source) as stream:
+        for line_number, line in enumerate(stream, 1):
+            try:
+                if isinstance(line, bytes):
+                    line = line.decode('utf-8-sig')
+                if not line.strip():
+                    continue
+                instance = deserialize_structure(cls, json.loads(line))
+            except (TypeError, ValueError) as ex:
+                if errors == 'raise':
+                    raise _rejection_error('line', line_number, ex) from ex
+                if errors == 'collect':
+                    rejected.append(RejectedItem(line_number, line, ex))
+                continue
+            yield instance
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+# the states of _JsonArrayParser
+_ARRAY_START, _ARRAY_FIRST, _ARRAY_ELEMENT, _ARRAY_SEPARATOR, _ARRAY_END = range(5)
+
+# returned by _JsonArrayParser when it needs more text
+_MORE = object()
+
+# the longest text at the end of the input that fails to decode only because it is
+# incomplete, such as '-Infinit' or a surrogate pair of escapes
+_MAX_PARTIAL_TOKEN = 12
+
+# the most text that is read ahead to decode a single element
+_MAX_LOOKAHEAD = 1 << 26
+
+
+def _incomplete(error, length):
+    """
+    :return: whether a JSON decoding error might be due to the text that is not read yet,
+        as opposed to invalid JSON
+    """
+    pos = getattr(error, 'pos', None)
+    return pos is None or length - pos <= _MAX_PARTIAL_TOKEN or \
+        error.msg.startswith('Unterminated string')
+
+
+class _JsonArrayParser(object):
+    """
+    Parses the elements of a JSON array from text that is fed to it in pieces, using
+    json.JSONDecoder.raw_decode. Only the text that was not parsed yet is kept, which is
+    roughly one element.
+    It does no I/O, so that it can be used by both blocking and asynchronous readers.
+    """
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._state = _ARRAY_START
+        # an element is not decoded again before this much text is available, so that a
+        # large element is not decoded many times as its text arrives
+        self._needed = 0
+
+    def feed(self, text, eof=False):
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        self._eof = eof
+
+    def _next_char(self):
+        """
+        :return: the next character that is not a whitespace, or None if there is none yet
+        """
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else None
+
+    def _expect(self, chars):
+        char = self._next_char()
+        if char is None and not self._eof:
+            return None
+        if char is None or char not in chars:
+            raise ValueError("Expected {} in JSON array, got {}".format(
+                ' or '.join("'{}'".format(c) for c in chars),
+                'end of input' if char is None else repr(char)))
+        self._pos += 1
+        return char
+
+    def _decode_element(self):
+        available = len(self._buffer) - self._pos
+        if available < self._needed and not self._eof:
+            return _MORE
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            # a value that ends the text, such as a number, might continue in the next piece
+            if end < len(self._buffer) or self._eof:
+                self._pos = end
+                self._needed = 0
+                return value
+        except ValueError as ex:
+            if self._eof or not _incomplete(ex, len(self._buffer)):
+                raise
+        if available >= _MAX_LOOKAHEAD:
+            raise ValueError("JSON array element is longer than {} characters".format(
+                _MAX_LOOKAHEAD))
+        self._needed = 2 * available
+        return _MORE
+
+    def elements(self):
+        """
+        :return: a generator of the elements that can be parsed from the text that was fed
+        """
+        while True:
+            if self._state == _ARRAY_START:
+                if self._expect('[') is None:
+                    return
+                self._state = _ARRAY_FIRST
+            elif self._state == _ARRAY_FIRST:
+                char = self._next_char()
+                if char is None and not self._eof:
+                    return
+                if char == ']':
+                    self._pos += 1
+                    self._state = _ARRAY_END
+                else:
+                    self._state = _ARRAY_ELEMENT
+            elif self._state == _ARRAY_ELEMENT:
+                self._next_char()
+                value = self._decode_element()
+                if value is _MORE:
+                    return
+                self._state = _ARRAY_SEPARATOR
+                yield value
+            elif self._state == _ARRAY_SEPARATOR:
+                char = self._expect(',]')
+                if char is None:
+                    return
+                self._state = _ARRAY_ELEMENT if char == ',' else _ARRAY_END
+            else:
+                if self._next_char() is not None:
+                    raise ValueError("Expected end of input after the JSON array")
+                return
+
+
+def _text_decoder(stream):
+    """
+    :return: a function that decodes the next piece of a stream to text
+    """
+    if isinstance(stream, io.TextIOBase):
+        return lambda data, eof: data
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    return lambda data, eof: decoder.decode(data, final=eof)
+
+
+def _iter_json_array(stream, chunk_size):
+    parser = _JsonArrayParser()
+    decode = _text_decoder(stream)
+    eof = False
+    while not eof:
+        data = stream.read(chunk_size)
+        eof = not data
+        parser.feed(decode(data, eof), eof)
+        yield from parser.elements()
+
+
+def deserialize_json_array(cls, source, errors='raise', rejected=None, chunk_size=65536):
+    """
+    Deserialize a JSON array of objects to instances of a :class:`Structure`.
+    The array is read incrementally, so memory usage is proportional to the size of a
+    single element, rather than of the whole array. An element of more than 64M characters
+    raises a ValueError.
+
+    Arguments:
+        cls(type):
+            The target class
+        source(str or file object):
+            A file name, or a file object opened in text or binary mode. Binary content
+            compressed with gzip, bz2 or xz is decompressed.
+        errors(str): optional
+            What to do with an element that is not a valid serialization of the class:
+            'raise' (default) raises a TypeError/ValueError that includes its index,
+            'skip' ignores it, and 'collect' adds a :class:`RejectedItem` to `rejected`.
+            Invalid JSON is always raised.
+        rejected(list): optional
+            The list that collects the rejected elements when errors='collect'
+        chunk_size(int): optional
+            The size of a read from the stream
+
+    Returns:
+        a generator of instances of the class
+    """
+    _check_error_policy(errors, rejected)
+    return _deserialize_elements(cls, source, errors, rejected, chunk_size)
+
+
+def _deserialize_elements(cls, source, errors, rejected, chunk_size):
+    with _open_stream(source) as stream:
+        for index, element in enumerate(_iter_json_array(stream, chunk_size)):
+            try:
+                instance = deserialize_structure(cls, element)
+            except (TypeError, ValueError) as ex:
+                if errors == 'raise':
+                    raise _rejection_error('element', index, ex) from ex
+                if errors == 'collect':
+                    rejected.append(RejectedItem(index, element, ex))
+                continue
+            yield instance
+
+
+def _deserialize_chunk(cls, start, items):
+    instances, rejected = [], []
+    for position, item in enumerate(items, start):
+        try:
+            instances.append(deserialize_structure(cls, item))
+        except (TypeError, ValueError) as ex:
+            rejected.append(RejectedItem(position, item, ex))
+    return instances, rejected
+
+
+def _serialize_chunk(start, structures):
+    results, rejected = [], []
+    for position, structure in enumerate(structures, start):
+        try:
+            results.append(serialize(structure))
+        except (TypeError, ValueError) as ex:
+            rejected.append(RejectedItem(position, structure, ex))
+    return results, rejected
+
+
+def _chunks(iterable, size):
+    """
+    :return: a generator of (index of first item, list of items) of consecutive chunks
+    """
+    iterator = iter(iterable)
+    start = 0
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield start, chunk
+        start += len(chunk)
+        chunk = list(islice(iterator, size))
+
+
+def _run_chunks(func, args, iterable, workers, chunksize, ordered, errors, rejected):
+    """
+    Apply func(*args, start, chunk) to chunks of the iterable in a pool of processes, and
+    yield the results. Only a few chunks per worker are in progress at any time.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        max_pending = 2 * (workers or os.cpu_count() or 1)
+        chunks = _chunks(iterable, chunksize)
+        pending = OrderedDict()
+        while True:
+            for start, chunk in islice(chunks, max_pending - len(pending)):
+                pending[executor.submit(func, *(args + (start, chunk)))] = (start, chunk)
+            if not pending:
+                return
+            if ordered:
+                future = next(iter(pending))
+            else:
+                future = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+            start, chunk = pending.pop(future)
+            try:
+                results, failures = future.result()
+            except Exception as ex:
+                # the whole chunk failed, for example when a worker died
+                if errors == 'raise':
+                    raise
+                results = []
+                failures = [RejectedItem(position, item, ex)
+                            for position, item in enumerate(chunk, start)]
+            for failure in failures:
+                if errors == 'raise':
+                    raise _rejection_error('item', failure.position, failure.error) \
+                        from failure.error
+                if errors == 'collect':
+                    rejected.append(failure)
+            yield from results
+
+
+def deserialize_many(cls, iterable, workers=None, chunksize=1000, ordered=True,
+                     errors='raise', rejected=None):
+    """
+    Deserialize many dicts to instances of a :class:`Structure`, in a pool of processes.
+    The input is sent to the workers in chunks, and only a few chunks are in progress at any
+    time, so the iterable can be larger than the memory.
+
+    Arguments:
+        cls(type):
+            The target class. It has to be importable by the workers.
+        iterable:
+            the source dicts
+        workers(int): optional
+            the number of processes. The default is the number of CPUs.
+        chunksize(int): optional
+            the number of items that are sent to a worker together
+        ordered(bool): optional
+            should the results be in the order of the input? Otherwise, the results of a
+            chunk are yielded as soon as it is done.
+        errors(str): optional
+            What to do with an item that is not a valid serialization of the class:
+            'raise' (default) raises a TypeError/ValueError that includes its index,
+            'skip' ignores it, and 'collect' adds a :class:`RejectedItem` to `rejected`.
+            If a whole chunk fails, all its items are rejected with the same error.
+        rejected(list): optional
+            The list that collects the rejected items when errors='collect'
+
+    Returns:
+        a generator of instances of the class
+    """
+    _check_error_policy(errors, rejected)
+    return _run_chunks(_deserialize_chunk, (cls,), iterable, workers, chunksize, ordered,
+                       errors, rejected)
+
+
+def serialize_many(structures, workers=None, chunksize=1000, ordered=True,
+                   errors='raise', rejected=None):
+    """
+    Serialize many instances of :class:`Structure` in a pool of processes.
+    The arguments are the same as in :func:`deserialize_many`.
+
+    Returns:
+        a generator of serialized Python dicts
+    """
+    _check_error_policy(errors, rejected)
+    return _run_chunks(_serialize_chunk, (), structures, workers, chunksize, ordered,
+                       errors, rejected)
@@ -0,0 +1,334 @@
+"""
+A columnar container of many instances of one :class:`Structure` class.
+"""
+import sys
+from array import array
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from typedpy.fields import Integer, Float, Boolean
+from typedpy.structures import Structure, _structure_fields, _restore_structure
+
+# the type codes of the columns of fields that are stored in an array.array
+_TYPECODES = [(Boolean, 'b'), (Integer, 'q'), (Float, 'd')]
+
+_NUMPY_TYPES = {'b': 'bool', 'q': 'int64', 'd': 'float64'}
+
+
+def _typecode(field):
+    for field_cls, typecode in _TYPECODES:
+        if isinstance(field, field_cls):
+            return typecode
+    return None
+
+
+class _StructureArrayMeta(type):
+    """
+    Allows StructureArray[cls], which is a subclass of StructureArray for the given
+    Structure class
+    """
+    _classes = {}
+
+    def __getitem__(cls, structure_cls):
+        if not isinstance(structure_cls, type) or not issubclass(structure_cls, Structure):
+            raise TypeError("Expected a Structure class")
+        array_cls = cls._classes.get(structure_cls)
+        if array_cls is None:
+            array_cls = type(cls)('{}[{}]'.format(cls.__name__, structure_cls.__name__),
+                                  (cls,), {'_structure': structure_cls})
+            cls._classes[structure_cls] = array_cls
+        return array_cls
+
+
+class _Row(object):
+    """
+    A proxy of an element of a :class:`StructureArray`. It reads and updates the columns of
+    the array.
+    """
+    __slots__ = ('_array', '_index')
+
+    def __init__(self, structure_array, index):
+        object.__setattr__(self, '_array', structure_array)
+        object.__setattr__(self, '_index', index)
+
+    def __getattr__(self, name):
+        if name not in self._array._fields:
+            raise AttributeError("'{}' has no field '{}'".format(
+                self._array._structure.__name__, name))
+        return self._array._get(self._index, name)
+
+    def __setattr__(self, name, value):
+        self._array._set(self._index, name, value)
+
+    def to_structure(self):
+        """
+        :return: an instance of the Structure class with the values of the row
+        """
+        return self._array._structure_at(self._index)
+
+    def __eq__(self, other):
+        if isinstance(other, _Row):
+            other = other.to_structure()
+        return self.to_structure() == other
+
+    def __str__(self):
+        return str(self.to_structure())
+
+    __repr__ = __str__
+
+
+class StructureArray(object, metaclass=_StructureArrayMeta):
+    """
+    A container of instances of a single :class:`Structure` class, which is stored by
+    columns: a column per field, rather than an object per instance. This takes a fraction of
+    the memory of a list of instances, and a column can be aggregated without going over the
+    instances.
+
+    Integer, Float and Boolean fields are stored in an array.array. The strings of String and
+    Enum fields are interned. Other fields are stored in a list.
+    Elements are validated by the field definitions when they are added or updated.
+    An element is accessed through a proxy, which is created when it is accessed.
+
+    Properties that are not fields are not supported.
+
+    Example:
+
+    .. code-block:: python
+
+        class Trade(Structure):
+            price = Float
+            size = Integer
+            side = Enum(values=['buy', 'sell'])
+
+        trades = StructureArray[Trade](trade_dicts)
+        total = sum(trades.column('size'))
+        trades[0].price
+        trades.append(Trade(price=1.5, size=10, side='buy'))
+
+    """
+    _structure = None
+
+    def __init__(self, items=()):
+        if self._structure is None:
+            raise TypeError("Use StructureArray[cls], where cls is a Structure class")
+        fields = _structure_fields(self._structure)
+        self._fields = fields
+        self._typecodes = dict((name, _typecode(field)) for name, field in fields.items())
+        self._columns = OrderedDict(
+            (name, array(typecode) if typecode else []) for name, typecode in
+            self._typecodes.items())
+        self._validators = dict((name, field._get_validator()) for name, field in fields.items())
+        # the presence of the values of a column in an array.array, only if some are missing
+        self._masks = {}
+        self._required = set(_required_fields(self._structure))
+        self._length = 0
+        self.extend(items)
+
+    @classmethod
+    def from_structures(cls, structures):
+        """
+        :return: a StructureArray of the given instances
+        """
+        return cls(structures)
+
+    @classmethod
+    def from_dicts(cls, dicts):
+        """
+        :return: a StructureArray of the instances that the given dicts describe
+        """
+        return cls(dicts)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        return _Row(self, self._normalized_index(index))
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield _Row(self, index)
+
+    def _normalized_index(self, index):
+        if not isinstance(index, int):
+            raise TypeError("Expected an integer index")
+        normalized = index + self._length if index < 0 else index
+        if not 0 <= normalized < self._length:
+            raise IndexError("index {} is out of range".format(index))
+        return normalized
+
+    def column(self, name):
+        """
+        The values of a field, without copying them. A column that is stored in an array is
+        returned as a read-only NumPy array, if NumPy is installed, or otherwise as a
+        read-only memoryview. Missing values in it are zeros (see :meth:`mask`).
+        Other columns are returned as a list, which should not be updated.
+
+        :param name: the name of the field
+        """
+        column = self._columns[name]
+        typecode = self._typecodes[name]
+        if not typecode:
+            return column
+        if numpy is None:
+            view = memoryview(column)
+            return view.toreadonly() if hasattr(view, 'toreadonly') else view
+        if not column:
+            return numpy.empty(0, dtype=_NUMPY_TYPES[typecode])
+        view = numpy.frombuffer(column, dtype=_NUMPY_TYPES[typecode])
+        view.flags.writeable = False
+        return view
+
+    def mask(self, name):
+        """
+        :param name: the name of a field that is stored in an array
+        :return: a bytearray that is 1 for every element in which the field is set, or None if
+            it is set in all of them
+        """
+        return self._masks.get(name)
+
+    def append(self, item):
+        """
+        Add an element: an instance of the Structure class, or a dict
+        """
+        values = self._validated(item)
+        for name, column in self._columns.items():
+            value = values.get(name)
+            typecode = self._typecodes[name]
+            if not typecode:
+                if isinstance(value, str):
+                    value = sys.intern(value)
+                column.append(value)
+                continue
+            mask = self._masks.get(name)
+            if value is None:
+                if mask is None:
+                    mask = self._masks[name] = bytearray(b'\x01') * self._length
+                mask.append(0)
+                value = 0
+            elif mask is not None:
+                mask.append(1)
+            self._append_to_array(name, value)
+        self._length += 1
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def _append_to_array(self, name, value):
+        column = self._columns[name]
+        try:
+            column.append(value)
+        except BufferError:
+            # there is a view of the array, which keeps its content, while the array grows
+            column = self._columns[name] = array(column.typecode, column)
+            column.append(value)
+        except OverflowError:
+            # an integer that does not fit in 64 bits
+            column = self._columns[name] = self._as_list(name)
+            column.append(value)
+
+    def _as_list(self, name):
+        values = self._columns[name].tolist()
+        mask = self._masks.pop(name, None)
+        if mask is not None:
+            values = [value if present else None for value, present in zip(values, mask)]
+        self._typecodes[name] = None
+        return values
+
+    def _validated(self, item):
+        structure_cls = self._structure
+        if isinstance(item, structure_cls):
+            values = item.__dict__
+            extra = [name for name in values if name not in self._fields]
+            if extra:
+                raise TypeError("{}: properties that are not fields are not supported".format(
+                    extra[0]))
+            # copy the collections, which the instance may still update, as to_structures does
+            return dict((name, self._fields[name]._restore(value, None, name))
+                        for name, value in values.items())
+        if not isinstance(item, dict):
+            raise TypeError("Expected an instance of {} or a dict".format(
+                structure_cls.__name__))
+        for name in self._required:
+            if item.get(name) is None:
+                raise TypeError("missing a required argument: {!r}".format(name))
+        values = {}
+        for name, value in item.items():
+            validate = self._validators.get(name)
+            if validate is None:
+                raise TypeError("got an unexpected keyword argument {!r}".format(name))
+            if value is not None:
+                values[name] = validate(value, name)
+        return values
+
+    def _get(self, index, name):
+        typecode = self._typecodes[name]
+        mask = self._masks.get(name)
+        if mask is not None and not mask[index]:
+            return None
+        value = self._columns[name][index]
+        return bool(value) if typecode == 'b' else value
+
+    def _set(self, index, name, value):
+        if getattr(self._structure, '_immutable', False):
+            raise ValueError("Structure is immutable")
+        validate = self._validators.get(name)
+        if validate is None:
+            raise AttributeError("'{}' has no field '{}'".format(self._structure.__name__, name))
+        if value is None:
+            raise TypeError("{}: Expected a value".format(name))
+        value = validate(value, name)
+        if self._typecodes[name]:
+            try:
+                self._columns[name][index] = value
+            except OverflowError:
+                self._columns[name] = self._as_list(name)
+                self._columns[name][index] = value
+            mask = self._masks.get(name)
+            if mask is not None:
+                mask[index] = 1
+        else:
+            self._columns[name][index] = sys.intern(value) if isinstance(value, str) else value
+
+    def _structure_at(self, index):
+        values = tuple(self._get(index, name) for name in self._columns)
+        return _restore_structure(self._structure, values)
+
+    def to_structures(self):
+        """
+        :return: a list of instances of the Structure class. They are not validated again.
+        """
+        return [self._structure_at(index) for index in range(self._length)]
+
+    def to_dicts(self):
+        """
+        :return: a list of dicts of the values of the elements
+        """
+        names = list(self._columns)
+        return [dict((name, value) for name, value in
+                     zip(names, [self._get(index, name) for name in names])
+                     if value is not None)
+                for index in range(self._length)]
+
+    def __eq__(self, other):
+        if isinstance(other, StructureArray):
+            other = other.to_structures()
+        return self.to_structures() == other
+
+    def __str__(self):
+        return '<{} of {} elements>'.format(self.__class__.__name__, self._length)
+
+    __repr__ = __str__
+
+
+def _required_fields(cls):
+    """
+    :return: the names of the required fields of a Structure class
+    """
+    params = getattr(cls, '__signature__').parameters.values()
+    return [param.name for param in params
+            if param.kind == param.POSITIONAL_OR_KEYWORD and param.default is param.empty]
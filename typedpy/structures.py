@@ -2,8 +2,12 @@
 The Skeleton classes to support strictly defined structures:
 Structure, Field, StructureReference, ClassReference, TypedField
 """
-from collections import OrderedDict
+import copyreg
+from collections import OrderedDict, namedtuple
+from collections.abc import MutableMapping
+from itertools import islice
 from inspect import Signature, Parameter
+from keyword import iskeyword
 
 
 # support:
@@ -54,6 +58,108 @@ def make_signature(names, required, additional_properties, bases_params_by_name)
     return Signature(non_default_args + default_args + additional_args)
 
 
+_MISSING = object()
+
+_INIT_PREFIX = '_typedpy_'
+
+
+def _attribute_from_mro(cls, name):
+    for base in cls.__mro__:
+        if name in base.__dict__:
+            return base.__dict__[name]
+    return None
+
+
+def _can_generate_init(cls):
+    """
+    A specialized constructor is generated only if there is no user-defined constructor
+    in the class hierarchy that we would otherwise bypass.
+    """
+    for base in cls.__mro__:
+        if base is Structure:
+            return True
+        init = base.__dict__.get('__init__')
+        if init is not None and not getattr(init, '_generated', False):
+            return False
+    return False
+
+
+def make_init(cls, signature):
+    """
+    Generate a constructor for a specific Structure class. It is equivalent to binding the
+    arguments to the signature of the class and setting each of them, including the error
+    messages, but it avoids the overhead of Signature.bind and of looking up every field.
+
+    :param cls: the Structure class
+    :param signature: the signature of the class, as created by make_signature
+    :return: the constructor, or None if it cannot be generated for this class
+    """
+    params = [param for param in signature.parameters.values()
+              if param.kind == Parameter.POSITIONAL_OR_KEYWORD]
+    names = [param.name for param in params]
+    if any(not name.isidentifier() or iskeyword(name) or name.startswith(_INIT_PREFIX)
+           for name in names):
+        return None
+    additional_props = any(param.kind == Parameter.VAR_KEYWORD
+                           for param in signature.parameters.values())
+    immutable = getattr(cls, '_immutable', False)
+    direct_set = cls.__setattr__ in (Structure.__setattr__, _set_compact_attribute)
+
+    namespace = {
+        '_typedpy_cls': cls,
+        '_typedpy_missing': _MISSING,
+        '_typedpy_generic_init': Structure.__init__,
+    }
+    # the parameters are keyword-only, so that Python does not bind positional arguments,
+    # which would raise errors with messages that differ from those of Signature.bind
+    lines = ['def __init__(_typedpy_self, *_typedpy_args, {}**_typedpy_kwargs):'.format(
+        ''.join('{}=_typedpy_missing, '.format(name) for name in names))]
+    # positional arguments are bound by the generic constructor, as is a subclass with its
+    # own constructor that reaches here through super().__init__
+    lines.append('    if _typedpy_args or _typedpy_self.__class__ is not _typedpy_cls:')
+    lines.append('        _typedpy_kwargs.update((_typedpy_k, _typedpy_v) for (_typedpy_k, '
+                 '_typedpy_v) in ({}) if _typedpy_v is not _typedpy_missing)'.format(
+                     ''.join("('{0}', {0}), ".format(name) for name in names)))
+    lines.append('        return _typedpy_generic_init(_typedpy_self, *_typedpy_args, '
+                 '**_typedpy_kwargs)')
+    for param in params:
+        if param.default is Parameter.empty:
+            lines.append('    if {} is _typedpy_missing:'.format(param.name))
+            lines.append('        raise TypeError("missing a required argument: {!r}")'.format(
+                param.name))
+    lines.append('    if _typedpy_kwargs:')
+    if additional_props:
+        lines.append('        for _typedpy_k, _typedpy_v in _typedpy_kwargs.items():')
+        lines.append('            setattr(_typedpy_self, _typedpy_k, _typedpy_v)')
+    else:
+        lines.append('        raise TypeError("got an unexpected keyword argument {!r}".format('
+                     'next(iter(_typedpy_kwargs))))')
+    if immutable:
+        lines.append('    _typedpy_dict = _typedpy_self.__dict__')
+    for i, param in enumerate(params):
+        name = param.name
+        indent = '    '
+        if param.default is not Parameter.empty:
+            lines.append('    if {} is not _typedpy_missing:'.format(name))
+            indent = '        '
+        field = _attribute_from_mro(cls, name)
+        if direct_set and isinstance(field, Field):
+            if immutable:
+                lines.append(indent + "if '{}' in _typedpy_dict:".format(name))
+                lines.append(indent + "    raise ValueError('Structure is immutable')")
+            namespace['_typedpy_set_{}'.format(i)] = field.__set__
+            lines.append(indent + '_typedpy_set_{}(_typedpy_self, {})'.format(i, name))
+        else:
+            lines.append(indent + "setattr(_typedpy_self, '{0}', {0})".format(name))
+
+    exec('\n'.join(lines), namespace)  # pylint: disable=W0122
+    init = namespace['__init__']
+    init.__qualname__ = '{}.__init__'.format(cls.__qualname__)
+    init.__module__ = cls.__module__
+    init._generated = True
+    return init
+
+
 def get_base_info(bases):
     """
     Extract the parameters from all the base classes to support inheritance of Structures.
@@ -78,6 +184,101 @@ def get_base_info(bases):
     return (bases_params, bases_required)
 
 
+def _plain_setter(setter):
+    """
+    Marks an implementation of __set__ that does nothing beyond validating the value using
+    _validate, and storing the result. Fields with such a setter can be validated without an
+    instance of a Structure.
+    """
+    setter.plain_setter = True
+    return setter
+
+
+class _ValueHolder(object):
+    pass
+
+
+def _validator_from_setter(field):
+    """
+    A validator for a field that overrides __set__ with its own logic, which has to be
+    invoked on some instance.
+    The setter uses the name of the field, so it is invoked on a copy of the field with the
+    given name, rather than on the field itself. Otherwise, concurrent validations of the
+    field would use each other's names.
+    """
+    cls = field.__class__
+
+    def validate(value, name):
+        named = field
+        if name != field._name:
+            named = cls.__new__(cls)
+            named.__dict__.update(field.__dict__)
+            named.__dict__['_name'] = name
+        holder = _ValueHolder()
+        named.__set__(holder, value)
+        return holder.__dict__[name]
+    return validate
+
+
+class ValidationFailure(object):
+    """
+    The result of :meth:`Field.check` for an invalid value. Building it is cheaper than
+    raising an exception, since the error message is only formatted when it is used.
+    """
+    __slots__ = ('error_type', '_template', '_args', '_exception')
+
+    def __init__(self, error_type, template, *args):
+        self.error_type = error_type
+        self._template = template
+        self._args = args
+        self._exception = None
+
+    @classmethod
+    def from_exception(cls, exception):
+        failure = cls(type(exception), None)
+        failure._exception = exception
+        return failure
+
+    def exception(self):
+        """
+        :return: the exception that an assignment of the value raises
+        """
+        if self._exception is None:
+            self._exception = self.error_type(self._template.format(*self._args))
+        return self._exception
+
+    @property
+    def message(self):
+        return str(self.exception())
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return '<ValidationFailure {}: {}>'.format(self.error_type.__name__, self.message)
+
+
+def _checker_from_validator(validate):
+    """
+    A checker that reports the exception raised by a validator
+    """
+    def check(value, name):
+        try:
+            validate(value, name)
+        except (TypeError, ValueError) as ex:
+            return ValidationFailure.from_exception(ex)
+        return None
+    return check
+
+
+# functions that are generated for a field, and cached in it
+_FIELD_CACHES = ('_compiled', '_validator', '_checker', '_encoder', '_decoder')
+
+# incremented whenever the caches of a field are dropped, to invalidate the functions that
+# are generated for a whole class
+_field_generation = 0
+
+
 class Field(object):
     """
     Base class for a field(i.e. property) in a structure.
@@ -89,9 +290,111 @@ class Field(object):
         if immutable is not None:
             self._immutable = immutable
 
+    def __setattr__(self, key, value):
+        # the compiled validators and serializers depend on the properties of the field
+        if not key.startswith('_'):
+            global _field_generation  # pylint: disable=W0603
+            _field_generation += 1
+            for cached in _FIELD_CACHES:
+                self.__dict__.pop(cached, None)
+        super().__setattr__(key, value)
+
+    def __getstate__(self):
+        # the generated functions cannot be pickled, and are regenerated on demand
+        state = self.__dict__.copy()
+        for cached in _FIELD_CACHES:
+            state.pop(cached, None)
+        return state
+
+    def _validate(self, value, name):
+        """
+        Validate a value for this field. Subclasses extend it cooperatively, by performing their
+        own checks and calling super()._validate().
+
+        :param value: the value to validate
+        :param name: the name to use in error messages
+        :return: the value, normalized (e.g. a dict converted to a Structure)
+        :raises TypeError, ValueError: if the value is invalid
+        """
+        return value
+
+    def _compile_validator(self):
+        """
+        :return: a function validate(value, name) that is equivalent to _validate, possibly
+                 specialized for the properties of this field
+        """
+        return self._validate
+
+    def _restore(self, value, instance, name):
+        """
+        Rebuild an unpickled value of this field, without validating it again. For example,
+        a collection is wrapped, so that its updates are validated.
+
+        :param value: a value that was validated by this field before it was pickled
+        :param instance: the structure, or the collection, that holds the value
+        :param name: the name to use in error messages
+        :return: the value to store
+        """
+        return value
+
+    def _get_compiled(self):
+        compiled = self.__dict__.get('_compiled')
+        if compiled is None:
+            compiled = self._compiled = self._compile_validator()
+        return compiled
+
+    def _get_validator(self):
+        """
+        :return: a function validate(value, name) that checks a value as if it was assigned to
+                 this field, and returns it normalized. This is what collections and other
+                 fields that contain fields use to validate their content.
+        """
+        validator = self.__dict__.get('_validator')
+        if validator is None:
+            if getattr(type(self).__set__, 'plain_setter', False):
+                validator = self._get_compiled()
+            else:
+                validator = _validator_from_setter(self)
+            self._validator = validator
+        return validator
+
+    def _compile_checker(self):
+        """
+        :return: a function check(value, name) that returns None if the value is valid,
+                 and otherwise a :class:`ValidationFailure`, without raising an exception
+                 if possible. It is used only if the field does not override __set__.
+        """
+        return _checker_from_validator(self._get_compiled())
+
+    def _get_checker(self):
+        checker = self.__dict__.get('_checker')
+        if checker is None:
+            if getattr(type(self).__set__, 'plain_setter', False):
+                checker = self._compile_checker()
+            else:
+                checker = _checker_from_validator(self._get_validator())
+            self._checker = checker
+        return checker
+
+    def check(self, value, name=None):
+        """
+        Validate a value for this field, without raising an exception.
+
+        :param value: the value to validate
+        :param name: optional name to use in the error message. The default is the name of
+                     the field.
+        :return: None if the value is valid, otherwise a :class:`ValidationFailure`
+        """
+        return self._get_checker()(value, self._name if name is None else name)
+
+    @_plain_setter
     def __set__(self, instance, value):
-        if getattr(self, '_immutable', False)  \
-                and  self._name in instance.__dict__:
+        compiled = self.__dict__.get('_compiled')
+        if compiled is None:
+            compiled = self._get_compiled()
+        value = compiled(value, self._name)
+        if getattr(self, '_immutable', False) \
+                and self._name in instance.__dict__:
             raise ValueError("{}: Field is immutable".format(self._name))
         instance.__dict__[self._name] = value
 
@@ -116,6 +419,290 @@ class Field(object):
         return '<{}{}>'.format(name, propst)
 
 
+_INLINE_PREFIX = 'StructureReference_'
+
+
+def _name_inline_classes(cls):
+    """
+    Name the classes of the :class:`StructureReference` fields of a class after the path of
+    the field, e.g. StructureReference_Foo_address, rather than by the order of creation,
+    so that the names are the same in every process. The classes are also linked to the
+    field that defines them, so that they can be pickled.
+    """
+    path = cls.__name__[len(_INLINE_PREFIX):] if '_owner' in cls.__dict__ else cls.__name__
+    for field_name in cls._fields:
+        for steps, reference in _inline_references(cls.__dict__[field_name]):
+            inline_class = reference._newclass
+            name = '_'.join([field_name] + [_STEP_NAMES[attribute] if index is None else
+                                            '{}_{}'.format(_STEP_NAMES[attribute], index)
+                                            for attribute, index in steps])
+            inline_class._owner = (cls, field_name) + steps
+            inline_class.__name__ = '{}{}_{}'.format(_INLINE_PREFIX, path, name)
+            inline_class.__qualname__ = '{}.{}'.format(cls.__qualname__, name)
+            _name_inline_classes(inline_class)
+
+
+# the names of the attributes of fields that hold other fields, in the names of inline classes
+_STEP_NAMES = {'items': 'items', '_fields': 'options'}
+
+
+def _inline_references(field, steps=()):
+    """
+    :return: a generator of the :class:`StructureReference` fields in a field, including
+        the ones in the items of a collection and the options of AnyOf/OneOf, with the steps
+        to each of them. A step is an attribute of a field, and an index in it, or None if
+        the attribute is a single field.
+    """
+    if getattr(field, '_newclass', None) is not None:
+        yield steps, field
+        return
+    for attribute in _STEP_NAMES:
+        nested = field.__dict__.get(attribute)
+        if isinstance(nested, Field):
+            yield from _inline_references(nested, steps + ((attribute, None),))
+        elif isinstance(nested, list):
+            for index, item in enumerate(nested):
+                if isinstance(item, Field):
+                    yield from _inline_references(item, steps + ((attribute, index),))
+
+
+def _fields_of(cls):
+    """
+    :return: a dict of the fields of a structure class, by name, including inherited ones,
+        in the order of declaration
+    """
+    fields = OrderedDict()
+    for klass in reversed(cls.__mro__):
+        for key, val in klass.__dict__.items():
+            if isinstance(val, Field):
+                fields[key] = val
+    return fields
+
+
+def _structure_fields(cls):
+    """
+    :return: the fields of a structure class by name, including inherited ones.
+        It is computed once, and cached in the class.
+    """
+    fields = cls.__dict__.get('_all_fields')
+    if fields is None:
+        fields = _fields_of(cls)
+        type.__setattr__(cls, '_all_fields', fields)
+    return fields
+
+
+_OVERFLOW = '_typedpy_overflow'
+
+
+def _overflow_of(instance):
+    """
+    :return: the dict of the properties of a compact structure that are not fields, or None
+    """
+    member = instance.__class__._compact_overflow
+    if member is None:
+        return None
+    try:
+        return member.__get__(instance)
+    except AttributeError:
+        return None
+
+
+def _shadows_class_attribute(instance, key):
+    """
+    Is the key of a property of a compact structure that is not a field also the name of a
+    class attribute that is not a data descriptor, e.g. a method? Then it is stored in the
+    overflow dict, for the __dict__ view, as well as in the real __dict__ of the instance,
+    which precedes the class attribute in the lookup of the attribute.
+    """
+    cls = instance.__class__
+    if key in instance._compact_slots or not hasattr(cls, key):
+        return False
+    return not hasattr(type(getattr(cls, key)), '__set__')
+
+
+def _real_dict(instance):
+    return Structure.__dict__['__dict__'].__get__(instance)
+
+
+class _CompactState(MutableMapping):
+    """
+    The __dict__ of an instance of a compact structure: a view of the slots of the fields
+    that are set, followed by the overflow dict of the properties that are not fields.
+    It allows all the code that accesses the content of a structure through its __dict__ to
+    work with compact structures.
+    """
+    __slots__ = ('_instance',)
+
+    def __init__(self, instance):
+        self._instance = instance
+
+    def __getitem__(self, key):
+        instance = self._instance
+        member = instance._compact_slots.get(key)
+        if member is None:
+            overflow = _overflow_of(instance)
+            if overflow is None:
+                raise KeyError(key)
+            return overflow[key]
+        try:
+            return member.__get__(instance)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        instance = self._instance
+        member = instance._compact_slots.get(key)
+        if member is not None:
+            member.__set__(instance, value)
+            return
+        overflow = _overflow_of(instance)
+        if overflow is None:
+            member = instance.__class__._compact_overflow
+            if member is None:
+                raise AttributeError("'{}' object has no attribute '{}'".format(
+                    instance.__class__.__name__, key))
+            overflow = {}
+            member.__set__(instance, overflow)
+        overflow[key] = value
+        if _shadows_class_attribute(instance, key):
+            _real_dict(instance)[key] = value
+
+    def __delitem__(self, key):
+        instance = self._instance
+        member = instance._compact_slots.get(key)
+        try:
+            if member is None:
+                del (_overflow_of(instance) or {})[key]
+                if _shadows_class_attribute(instance, key):
+                    _real_dict(instance).pop(key, None)
+            else:
+                member.__delete__(instance)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def items(self):
+        instance = self._instance
+        result = []
+        for key, member in instance._compact_slots.items():
+            try:
+                result.append((key, member.__get__(instance)))
+            except AttributeError:
+                pass
+        result.extend((_overflow_of(instance) or {}).items())
+        return result
+
+    def __iter__(self):
+        return iter([key for key, _ in self.items()])
+
+    def __len__(self):
+        return len(self.items())
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class _CompactField(object):
+    """
+    A field of a compact structure, which is stored in a slot of the instance.
+    _field_class is the declared class of the field.
+    """
+    _field_class = None
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return self._slot.__get__(instance, owner)
+        except AttributeError:
+            # like a field that is not set in a regular structure
+            return self
+
+
+class _CompactPlainField(_CompactField):
+    """
+    A field of a compact structure, with a plain setter that stores the value in the slot
+    directly, rather than through the __dict__ of the instance.
+    """
+    @_plain_setter
+    def __set__(self, instance, value):
+        compiled = self.__dict__.get('_compiled')
+        if compiled is None:
+            compiled = self._get_compiled()
+        value = compiled(value, self._name)
+        if getattr(self, '_immutable', False) and \
+                self.__get__(instance, None) is not self:
+            raise ValueError("{}: Field is immutable".format(self._name))
+        self._slot.__set__(instance, value)
+
+
+_COMPACT_FIELD_CLASSES = {}
+
+
+def _compact_field(field, member):
+    """
+    :return: a copy of the field that stores its value in the given slot
+    """
+    field_cls = field.__class__
+    compact_cls = _COMPACT_FIELD_CLASSES.get(field_cls)
+    if compact_cls is None:
+        mixin = _CompactPlainField if field_cls.__set__ is Field.__set__ else _CompactField
+        compact_cls = type(field_cls)(field_cls.__name__, (mixin, field_cls),
+                                      {'_field_class': field_cls})
+        compact_cls.__qualname__ = field_cls.__qualname__
+        compact_cls.__module__ = field_cls.__module__
+        _COMPACT_FIELD_CLASSES[field_cls] = compact_cls
+    compact = compact_cls.__new__(compact_cls)
+    compact.__dict__.update(field.__dict__)
+    compact.__dict__['_slot'] = member
+    return compact
+
+
+def _declare_compact_slots(name, bases, cls_dict, fields):
+    """
+    Declare slots for the fields of a compact structure class, that are not stored in the
+    slots of its bases. Their definitions are removed from the class dict, since a slot
+    cannot have the same name as a class attribute. They are put back, as compact fields,
+    by _install_compact_fields.
+
+    :return: the definitions of the fields that were removed
+    """
+    for base in bases:
+        for klass in base.__mro__[:-1]:
+            if '__slots__' not in klass.__dict__ and klass not in (Structure, ImmutableStructure):
+                raise TypeError("{}: a compact structure cannot derive from {}, which is not "
+                                "compact".format(name, klass.__name__))
+    inherited = OrderedDict()
+    has_overflow = False
+    for base in reversed(bases):
+        inherited.update(getattr(base, '_compact_slots', {}))
+        has_overflow = has_overflow or getattr(base, '_compact_overflow', None) is not None
+    slots = [field_name for field_name in fields if field_name not in inherited]
+    if cls_dict.get('_additionalProperties', True) and not has_overflow:
+        slots.append(_OVERFLOW)
+    cls_dict['__slots__'] = tuple(slots)
+    cls_dict['__dict__'] = property(_CompactState)
+    cls_dict['__setattr__'] = _set_compact_attribute
+    cls_dict['__getattr__'] = _get_compact_attribute
+    return OrderedDict([(field_name, cls_dict.pop(field_name))
+                        for field_name in fields if field_name not in inherited] +
+                       [(field_name, cls_dict[field_name])
+                        for field_name in fields if field_name in inherited])
+
+
+def _install_compact_fields(clsobj, definitions):
+    slots = OrderedDict()
+    overflow = None
+    for base in reversed(clsobj.__bases__):
+        slots.update(getattr(base, '_compact_slots', {}))
+        overflow = getattr(base, '_compact_overflow', None) or overflow
+    for field_name, field in definitions.items():
+        member = slots.get(field_name) or clsobj.__dict__[field_name]
+        slots[field_name] = member
+        type.__setattr__(clsobj, field_name, _compact_field(field, member))
+    clsobj._compact_slots = slots
+    clsobj._compact_overflow = clsobj.__dict__.get(_OVERFLOW, overflow)
+
+
 class StructMeta(type):
     """
     Metaclass for Structure. Manipulates it to ensure the fields are set up correctly.
@@ -136,13 +723,23 @@ class StructMeta(type):
         fields = [key for key, val in cls_dict.items() if isinstance(val, Field)]
         for field_name in fields:
             setattr(cls_dict[field_name], '_name', field_name)
+        compact = cls_dict.get('_compact', any(getattr(base, '_compact', False) for base in bases))
+        if compact:
+            definitions = _declare_compact_slots(name, bases, cls_dict, fields)
         clsobj = super().__new__(mcs, name, bases, dict(cls_dict))
+        if compact:
+            _install_compact_fields(clsobj, definitions)
         clsobj._fields = fields
+        _name_inline_classes(clsobj)
         default_required = list(set(bases_required + fields)) if bases_params else fields
         required = cls_dict.get('_required', default_required)
         additional_props = cls_dict.get('_additionalProperties', True)
         sig = make_signature(clsobj._fields, required, additional_props, bases_params)
         setattr(clsobj, '__signature__', sig)
+        if '__init__' not in cls_dict and _can_generate_init(clsobj):
+            init = make_init(clsobj, sig)
+            if init is not None:
+                clsobj.__init__ = init
         return clsobj
 
     def __str__(cls):
@@ -197,8 +794,28 @@ class Structure(metaclass=StructMeta):
                 # this raises an exception:
                 Foo(id = 1, a = 2)
 
+        _verify_on_unpickle(bool): optional
+            Should the values of an unpickled (or copied) instance be validated again?
+            The default is False, since they were validated when the instance was pickled.
+
+        _str_max_items(int): optional
+            The maximal number of items of a collection that str() shows, followed by the
+            number of the items that are left out, e.g. for logging structures with large
+            arrays. Applies to nested structures and collections as well.
+            The default is None, i.e. show all the items.
+
+        _compact(bool): optional
+            Should the fields be stored in slots, rather than in a __dict__ of every instance?
+            This reduces the memory of an instance significantly, at the cost of slower
+            access to the fields. Properties that are not fields, if allowed, are stored in an
+            overflow dict, which is created only when needed. The __dict__ of an instance is a
+            view of the slots and the overflow dict. A compact structure can only
+            derive from compact structures. Its subclasses are compact as well.
+            The default is False.
+
     """
     _fields = []
+    _str_max_items = None
 
     def __init__(self, *args, **kwargs):
         bound = getattr(self, '__signature__').bind(*args, **kwargs)
@@ -214,18 +831,59 @@ class Structure(metaclass=StructMeta):
             raise ValueError("Structure is immutable")
         super().__setattr__(key, value)
 
+    def __reduce__(self):
+        # compact: the values of the fields in the order of declaration, without their names
+        cls = self.__class__
+        state = self.__dict__
+        fields = cls.__dict__.get('_all_fields') or _structure_fields(cls)
+        values = [state.get(name) for name in fields]
+        if len(state) == len(values) - sum(value is None for value in values):
+            # all the values are of fields
+            while values and values[-1] is None:
+                values.pop()
+            return _restore_structure, (cls, tuple(values))
+        extra = dict([(name, val) for name, val in state.items()
+                      if name not in fields or val is None])
+        return _restore_structure, (cls, tuple(values), extra)
+
+    def __setstate__(self, state):
+        for name, val in state.items():
+            setattr(self, name, val)
+
     def __str__(self):
+        return self._to_str(self._str_max_items)
+
+    __repr__ = __str__
+
+    def _to_str(self, max_items):
         name = self.__class__.__name__
         if name.startswith('StructureReference_') and self.__class__.__bases__ == (Structure,):
             name = 'Structure'
         props = []
         for k, val in sorted(self.__dict__.items()):
-            strv = "'{}'".format(val) if isinstance(val, str) else str(val)
+            if isinstance(val, str):
+                strv = "'{}'".format(val)
+            elif max_items is None:
+                strv = str(val)
+            else:
+                strv = _bounded_repr(val, max_items)
             props.append('{} = {}'.format(k, strv))
         return '<Instance of {}. Properties: {}>'.format(name, ', '.join(props))
 
     def __eq__(self, other):
-        return str(self) == str(other)
+        if self is other:
+            return True
+        if not isinstance(other, Structure):
+            return NotImplemented
+        if self.__class__ is not other.__class__:
+            return False
+        try:
+            return self.__dict__ == other.__dict__
+        except ValueError:
+            # a value that is compared element-wise, such as a NumPy array
+            values, other_values = self.__dict__, other.__dict__
+            return values.keys() == other_values.keys() and \
+                all(_values_equal(value, other_values[key]) for key, value in values.items())
 
     def __delitem__(self, key):
         if isinstance(getattr(self, '_required'), list) and \
@@ -233,6 +891,420 @@ class Structure(metaclass=StructMeta):
             raise ValueError("{} is manadoty".format(key))
         del self.__dict__[key]
 
+    @classmethod
+    def from_dicts(cls, dicts, lazy=False, errors='raise', rejected=None):
+        """
+        Create instances from dicts of the arguments of the constructor. It is equivalent to
+        calling the constructor with every dict, but the lookups that do not depend on the
+        values are done once for all of them.
+
+        Arguments:
+            dicts:
+                an iterable of dicts
+            lazy(bool): optional
+                Return a generator that creates the instances as it is iterated, rather
+                than a list. The default is False.
+            errors(str): optional
+                What to do with a dict that is not valid: 'raise' (default) raises a
+                TypeError/ValueError that includes its index, 'skip' ignores it, and
+                'collect' adds a :class:`RejectedItem` to `rejected`.
+            rejected(list): optional
+                The list that collects the rejected dicts when errors='collect'
+
+        Returns:
+            a list, or a generator, of instances of the class
+        """
+        _check_error_policy(errors, rejected)
+        return _construct_all(cls, None, dicts, lazy, errors, rejected)
+
+    @classmethod
+    def from_rows(cls, rows, columns=None, lazy=False, errors='raise', rejected=None):
+        """
+        Create instances from rows of values, such as tuples from a CSV file or a database.
+        A value of None means that the property is not set.
+        The columns are checked once, rather than for every row.
+
+        Arguments:
+            rows:
+                an iterable of sequences of values
+            columns(list): optional
+                The names of the values in a row. The default is the fields of the class, in
+                the order of their declaration, starting with the inherited ones.
+            lazy(bool): optional
+                Return a generator that creates the instances as it is iterated, rather
+                than a list. The default is False.
+            errors(str): optional
+                What to do with a row that is not valid: 'raise' (default) raises a
+                TypeError/ValueError that includes its index, 'skip' ignores it, and
+                'collect' adds a :class:`RejectedItem` to `rejected`.
+            rejected(list): optional
+                The list that collects the rejected rows when errors='collect'
+
+        Returns:
+            a list, or a generator, of instances of the class
+        """
+        _check_error_policy(errors, rejected)
+        if columns is None:
+            columns = list(_structure_fields(cls))
+        return _construct_all(cls, list(columns), rows, lazy, errors, rejected)
+
+
+_BRACKETS = {list: '[]', tuple: '()', set: '{}', frozenset: '{}'}
+
+
+def _values_equal(first, second):
+    """
+    Compare two values, where sequences that are compared element-wise, such as NumPy arrays,
+    are equal if all their elements are equal
+    """
+    try:
+        return bool(first == second)
+    except ValueError:
+        pass
+    try:
+        return len(first) == len(second) and \
+            all(_values_equal(a, b) for a, b in zip(first, second))
+    except TypeError:
+        return False
+
+
+def _bounded_repr(val, max_items):
+    """
+    :return: the repr of a value, in which every collection shows at most max_items items
+    """
+    if isinstance(val, Structure):
+        return val._to_str(max_items)
+    if isinstance(val, dict):
+        items = ['{}: {}'.format(_bounded_repr(k, max_items), _bounded_repr(v, max_items))
+                 for k, v in islice(val.items(), max_items)]
+        brackets = '{}'
+    elif isinstance(val, (list, tuple, set, frozenset)):
+        if isinstance(val, (set, frozenset)) and not val:
+            return repr(val)
+        items = [_bounded_repr(v, max_items) for v in islice(val, max_items)]
+        brackets = next(brackets for cls, brackets in _BRACKETS.items() if isinstance(val, cls))
+        if isinstance(val, tuple) and len(val) == 1:
+            items[0] += ','
+    else:
+        return repr(val)
+    if len(val) > max_items:
+        items.append('... {} more'.format(len(val) - max_items))
+    return '{}{}{}'.format(brackets[0], ', '.join(items), brackets[1])
+
+
+def _fields_key(structure):
+    """
+    :return: a hashable key of the content of a structure, such that two structures of the same
+        class are equal if and only if their keys are equal
+    :raises TypeError: if one of the values cannot be keyed
+    """
+    return frozenset([(k, _item_key(v)) for k, v in structure.__dict__.items()])
+
+
+_LIST_KEY, _TUPLE_KEY, _DICT_KEY, _STRUCTURE_KEY = (object() for _ in range(4))
+
+
+def _item_key(value):
+    """
+    Map a value to a hashable key, such that two values are equal if and only if their keys are
+    equal. Hashable values are their own key. Unhashable lists, tuples, sets, dicts and
+    Structures are converted to a canonical hashable form.
+
+    :raises TypeError: if the value cannot be keyed, e.g. an unhashable object of another type
+    """
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        pass
+    cls = value.__class__
+    if isinstance(value, list) and cls.__eq__ is list.__eq__:
+        return (_LIST_KEY, tuple([_item_key(v) for v in value]))
+    if isinstance(value, tuple) and cls.__eq__ is tuple.__eq__:
+        return (_TUPLE_KEY, tuple([_item_key(v) for v in value]))
+    if isinstance(value, set) and cls.__eq__ is set.__eq__:
+        # a set equals the frozenset with the same elements
+        return frozenset(value)
+    if isinstance(value, dict) and cls.__eq__ is dict.__eq__:
+        return (_DICT_KEY, frozenset([(k, _item_key(v)) for k, v in value.items()]))
+    if isinstance(value, Structure) and cls.__eq__ is Structure.__eq__:
+        return (_STRUCTURE_KEY, value.__class__, _fields_key(value))
+    raise TypeError("cannot key a value of type {}".format(cls))
+
+
+def _set_compact_attribute(self, key, value):
+    """
+    __setattr__ of a compact structure
+    """
+    if key in self._compact_slots or \
+            hasattr(self.__class__, key) and not _shadows_class_attribute(self, key):
+        Structure.__setattr__(self, key, value)
+        return
+    if getattr(self, '_immutable', False) and key in self.__dict__:
+        raise ValueError("Structure is immutable")
+    self.__dict__[key] = value
+
+
+def _get_compact_attribute(self, key):
+    """
+    __getattr__ of a compact structure: the properties that are not fields
+    """
+    overflow = _overflow_of(self)
+    if overflow is None or key not in overflow:
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            self.__class__.__name__, key))
+    return overflow[key]
+
+
+def _restore_structure(cls, values, extra=None):
+    """
+    Create an unpickled structure. The values were validated when the structure was
+    pickled, so they are only validated again if the class sets _verify_on_unpickle.
+    """
+    instance = cls.__new__(cls)
+    fields = _structure_fields(cls)
+    state = OrderedDict([(name, val) for name, val in zip(fields, values) if val is not None])
+    if extra:
+        state.update(extra)
+    if getattr(cls, '_verify_on_unpickle', False):
+        instance.__setstate__(state)
+        return instance
+    content = instance.__dict__
+    for name, val in state.items():
+        field = fields.get(name)
+        content[name] = val if field is None else field._restore(val, instance, name)
+    return instance
+
+
+def _inline_class(owner, field_name, *steps):
+    """
+    :return: the class of a :class:`StructureReference` field, which is defined inline,
+        following the steps from the field of the owner, as in _inline_references
+    """
+    field = owner.__dict__[field_name]
+    for attribute, index in steps:
+        field = field.__dict__[attribute]
+        if index is not None:
+            field = field[index]
+    return field._newclass
+
+
+def _reduce_structure_class(cls):
+    """
+    Pickle a Structure class by reference. The class of a :class:`StructureReference` cannot
+    be imported, so it is pickled as a reference to the field that defines it.
+    """
+    owner = cls.__dict__.get('_owner')
+    if owner is None:
+        return cls.__qualname__
+    return _inline_class, owner
+
+
+copyreg.pickle(StructMeta, _reduce_structure_class)
+
+
+RejectedItem = namedtuple('RejectedItem', ['position', 'source', 'error'])
+RejectedItem.__doc__ = """
+An item that could not be deserialized, or could not be turned into a structure: its
+position (a line number, an index in an array, or the index of a row), its source, and the
+error.
+"""
+
+_ERROR_POLICIES = ('raise', 'skip', 'collect')
+
+
+def _check_error_policy(errors, rejected):
+    if errors not in _ERROR_POLICIES:
+        raise ValueError("errors: Expected one of {}".format(', '.join(_ERROR_POLICIES)))
+    if errors == 'collect' and rejected is None:
+        raise TypeError("rejected: Expected a list to collect the rejected items")
+
+
+def _rejection_error(position_name, position, error):
+    error_type = TypeError if isinstance(error, TypeError) else ValueError
+    return error_type("{} {}: {}".format(position_name, position, error))
+
+
+def _construction_plan(cls):
+    """
+    :return: a tuple of: a dict of the setter of every parameter of the constructor, the
+        required parameters, and whether other properties are allowed.
+        The setters are None if the construction cannot bypass the constructor.
+    """
+    params = getattr(cls, '__signature__').parameters.values()
+    names = [param.name for param in params if param.kind == Parameter.POSITIONAL_OR_KEYWORD]
+    required = [param.name for param in params if param.kind == Parameter.POSITIONAL_OR_KEYWORD
+                and param.default is Parameter.empty]
+    additional_props = any(param.kind == Parameter.VAR_KEYWORD for param in params)
+    fields = [_attribute_from_mro(cls, name) for name in names]
+    if not getattr(cls.__dict__.get('__init__'), '_generated', False) or \
+            cls.__setattr__ not in (Structure.__setattr__, _set_compact_attribute) or \
+            not all(isinstance(field, Field) for field in fields):
+        return None, required, additional_props
+    return OrderedDict(zip(names, [field.__set__ for field in fields])), required, \
+        additional_props
+
+
+def _generic_constructor(cls, columns):
+    """
+    :return: a function that creates an instance from a dict, or from a row of the values
+        of the columns, by calling the constructor
+    """
+    if columns is None:
+        return lambda kwargs: cls(**kwargs)
+
+    def construct(row):
+        if len(row) != len(columns):
+            raise TypeError("Expected {} values, got {}".format(len(columns), len(row)))
+        return cls(**dict([(name, value) for name, value in zip(columns, row)
+                           if value is not None]))
+    return construct
+
+
+def _attribute_setter(name):
+    def set_attribute(instance, value):
+        setattr(instance, name, value)
+    return set_attribute
+
+
+def _make_batch_constructor(cls, columns):
+    """
+    Generate a function that creates instances from dicts (if columns is None), or from rows
+    of the values of the given columns. It is equivalent to calling the constructor for
+    every one of them, but the setters of the fields are looked up once, and the loop over
+    the sources is a part of the generated code.
+
+    :return: a generator function construct_all(sources, reject) that yields the instances,
+        and calls reject(position, source, error) for every source that is not valid
+    :raises TypeError: if the columns do not match the constructor
+    """
+    setters, required, additional_props = _construction_plan(cls)
+    if columns is not None:
+        duplicates = [name for i, name in enumerate(columns) if name in columns[:i]]
+        if duplicates:
+            raise TypeError("columns: got multiple values for argument {!r}".format(
+                duplicates[0]))
+        missing = [name for name in required if name not in columns]
+        if missing:
+            raise TypeError("columns: missing a required argument: {!r}".format(missing[0]))
+        unknown = [name for name in columns
+                   if name not in getattr(cls, '__signature__').parameters]
+        if unknown and not additional_props:
+            raise TypeError("columns: got an unexpected keyword argument {!r}".format(
+                unknown[0]))
+    if setters is None:
+        construct = _generic_constructor(cls, columns)
+
+        def construct_all(sources, reject):
+            for position, source in enumerate(sources):
+                try:
+                    instance = construct(source)
+                except (TypeError, ValueError) as ex:
+                    reject(position, source, ex)
+                    continue
+                yield instance
+        return construct_all
+
+    def set_extra(instance, kwargs):
+        for name, value in kwargs.items():
+            if name not in setters:
+                if not additional_props:
+                    raise TypeError("got an unexpected keyword argument {!r}".format(name))
+                setattr(instance, name, value)
+
+    # the values of fields with a plain setter are validated, and stored in the __dict__
+    direct = cls.__setattr__ is Structure.__setattr__
+    namespace = {
+        '_typedpy_cls': cls,
+        '_typedpy_new': cls.__new__,
+        '_typedpy_missing': _MISSING,
+        '_typedpy_set_extra': set_extra,
+    }
+    lines = ['def construct_all(_typedpy_sources, _typedpy_reject):',
+             '    for _typedpy_position, _typedpy_source in enumerate(_typedpy_sources):',
+             '        try:']
+    if columns is None:
+        names = list(setters)
+        absent = '_typedpy_missing'
+        lines.append('            try:')
+        lines.append('                _typedpy_get = _typedpy_source.get')
+        lines.append('            except AttributeError:')
+        lines.append('                raise TypeError("Expected a dict") from None')
+        for i, name in enumerate(names):
+            lines.append('            _typedpy_v{} = _typedpy_get({!r}, _typedpy_missing)'.format(
+                i, name))
+    else:
+        names = columns
+        absent = 'None'
+        lines.append('            if len(_typedpy_source) != {}:'.format(len(names)))
+        lines.append('                raise TypeError("Expected {} values, got {{}}".format('
+                     'len(_typedpy_source)))'.format(len(names)))
+        if names:
+            lines.append('            {}, = _typedpy_source'.format(
+                ', '.join('_typedpy_v{}'.format(i) for i in range(len(names)))))
+    for i, name in enumerate(names):
+        if name in required:
+            lines.append('            if _typedpy_v{} is {}:'.format(i, absent))
+            lines.append('                raise TypeError("missing a required argument: {!r}")'.
+                         format(name))
+    lines.append('            _typedpy_self = _typedpy_new(_typedpy_cls)')
+    if direct:
+        lines.append('            _typedpy_dict = _typedpy_self.__dict__')
+    if columns is None:
+        optional = ['_typedpy_v{}'.format(i) for i, name in enumerate(names)
+                    if name not in required]
+        lines.append('            if len(_typedpy_source) != {}{}:'.format(
+            len(required), ''.join(' + ({} is not _typedpy_missing)'.format(var)
+                                   for var in optional)))
+        lines.append('                _typedpy_set_extra(_typedpy_self, _typedpy_source)')
+    for i, name in enumerate(names):
+        indent = '            '
+        if name not in required:
+            lines.append(indent + 'if _typedpy_v{} is not {}:'.format(i, absent))
+            indent += '    '
+        field = setters[name].__self__ if name in setters else None
+        if direct and field is not None and type(field).__set__ is Field.__set__:
+            # the instance is new, so storing the validated value is all that the setter does
+            namespace['_typedpy_validate_{}'.format(i)] = field._get_compiled()
+            lines.append(indent + '_typedpy_dict[{0!r}] = _typedpy_validate_{1}('
+                                  '_typedpy_v{1}, {0!r})'.format(name, i))
+            continue
+        namespace['_typedpy_set_{}'.format(i)] = setters.get(name) or _attribute_setter(name)
+        lines.append(indent + '_typedpy_set_{0}(_typedpy_self, _typedpy_v{0})'.format(i))
+    lines.append('        except (TypeError, ValueError) as _typedpy_ex:')
+    lines.append('            _typedpy_reject(_typedpy_position, _typedpy_source, _typedpy_ex)')
+    lines.append('            continue')
+    lines.append('        yield _typedpy_self')
+
+    exec('\n'.join(lines), namespace)  # pylint: disable=W0122
+    return namespace['construct_all']
+
+
+def _batch_constructor(cls, columns):
+    """
+    :return: the function that _make_batch_constructor generates for the class and the
+        columns. It is cached in the class, until the caches of a field are dropped.
+    """
+    constructors = cls.__dict__.get('_batch_constructors')
+    if constructors is None or constructors['generation'] != _field_generation:
+        constructors = {'generation': _field_generation}
+        type.__setattr__(cls, '_batch_constructors', constructors)
+    key = None if columns is None else tuple(columns)
+    construct_all = constructors.get(key)
+    if construct_all is None:
+        construct_all = constructors[key] = _make_batch_constructor(cls, columns)
+    return construct_all
+
+
+def _construct_all(cls, columns, sources, lazy, errors, rejected):
+    def reject(position, source, error):
+        if errors == 'raise':
+            raise _rejection_error('row', position, error) from error
+        if errors == 'collect':
+            rejected.append(RejectedItem(position, source, error))
+
+    instances = _batch_constructor(cls, columns)(sources, reject)
+    return instances if lazy else list(instances)
 
 
 class ImmutableStructure(Structure):
@@ -255,10 +1327,22 @@ class ImmutableStructure(Structure):
         b.z[1] += 1
         b.m['c'] = 4
 
+    Since they cannot change, instances of an ImmutableStructure are hashable, so they can be
+    used as keys of a dict, or as members of a set.
+
     """
     _immutable = True
 
+    def __hash__(self):
+        # not cached: fields that are not set, and extra properties, can still be added
+        return hash((self.__class__, _fields_key(self)))
+
 
+def _validate_chain(cls):
+    """
+    :return: the classes in the MRO that participate in the validation of a field of this class
+    """
+    return tuple(klass for klass in cls.__mro__ if '_validate' in klass.__dict__)
 
 
 class TypedField(Field):
@@ -268,10 +1352,32 @@ class TypedField(Field):
     """
     _ty = object
 
-    def __set__(self, instance, value):
+    def _validate(self, value, name):
         if not isinstance(value, self._ty):
-            raise TypeError("%s: Expected %s" % (self._name, self._ty))
-        super().__set__(instance, value)
+            raise TypeError("%s: Expected %s" % (name, self._ty))
+        return super()._validate(value, name)
+
+    def _compile_validator(self):
+        if _validate_chain(self.__class__) != (TypedField, Field):
+            return super()._compile_validator()
+        the_type = self._ty
+
+        def validate(value, name):
+            if not isinstance(value, the_type):
+                raise TypeError("%s: Expected %s" % (name, the_type))
+            return value
+        return validate
+
+    def _compile_checker(self):
+        if _validate_chain(self.__class__) != (TypedField, Field):
+            return super()._compile_checker()
+        the_type = self._ty
+
+        def check(value, name):
+            if not isinstance(value, the_type):
+                return ValidationFailure(TypeError, "{}: Expected {}", name, the_type)
+            return None
+        return check
 
 
 class ClassReference(TypedField):